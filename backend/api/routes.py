@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Request, BackgroundTasks, Query
+from fastapi import APIRouter, Request, Response, BackgroundTasks, Query
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
 from backend.db.database import get_db
@@ -12,33 +12,89 @@ from backend.core.cleanup import run_manual_cleanup
 from backend.core.directory_service import directory_service
 from backend.core.ignore_service import ignore_service 
 from pydantic import BaseModel
+from datetime import datetime, timezone
+import uuid
 
 class CleanupRequest(BaseModel):
     origin_dir: str
     malayalam_dest: str
     english_dest: str
     dry_run: bool = True
+    workers: int = None
 
 router = APIRouter()
 templates = Jinja2Templates(directory="frontend/templates")
 
+MAX_PAGE_SIZE = 500
+
+def keyset_page(query, model, response: Response, limit: int, cursor: int = None, since=None, until=None, path_prefix: str = None):
+    """
+    Newest-first page of a log table using keyset pagination on id, so page
+    500 costs the same as page 1. The cursor for the next (older) page is
+    returned in the X-Next-Cursor header to keep the list response shape.
+    """
+    if cursor is not None:
+        query = query.filter(model.id < cursor)
+    # Timestamps are stored as naive UTC
+    since, until = (
+        d.astimezone(timezone.utc).replace(tzinfo=None) if d is not None and d.tzinfo else d
+        for d in (since, until)
+    )
+    if since is not None:
+        query = query.filter(model.timestamp >= since)
+    if until is not None:
+        query = query.filter(model.timestamp < until)
+    if path_prefix:
+        # Range instead of LIKE so the file_path index can be used
+        query = query.filter(model.file_path >= path_prefix, model.file_path < path_prefix + "\uffff")
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    rows = query.order_by(model.id.desc()).limit(limit).all()
+    if len(rows) == limit:
+        response.headers["X-Next-Cursor"] = str(rows[-1].id)
+    return rows
+
+# Rendered dashboard, reused until one of its tables is written or the watched path changes.
+# Write versions restart at 0 with the process, so the ETag also carries a per-process id.
+_dashboard_cache = {"etag": None, "body": None, "boot_id": uuid.uuid4().hex}
+
 @router.get("/", response_class=HTMLResponse)
-async def dashboard(request: Request, db: Session = Depends(get_db)):
-    recent_files = db.query(ProcessedFile).order_by(ProcessedFile.created_at.desc()).limit(50).all()
-    rejected_files = db.query(RejectedFile).order_by(RejectedFile.created_at.desc()).limit(20).all()
-    error_logs = db.query(ErrorLog).order_by(ErrorLog.timestamp.desc()).limit(20).all()
-    cleanup_logs = db.query(CleanupLog).order_by(CleanupLog.timestamp.desc()).limit(30).all()
+async def dashboard(request: Request):
     from backend.core.watcher import watcher_manager
+    from backend.core.log_sink import log_sink
+    from backend.db.database import SessionLocal
+    import hashlib
+
     watch_path = watcher_manager.watched_path or "Not Active"
-    
-    return templates.TemplateResponse("dashboard.html", {
-        "request": request,
-        "recent_files": recent_files,
-        "rejected_files": rejected_files,
-        "error_logs": error_logs,
-        "cleanup_logs": cleanup_logs,
-        "watch_path": watch_path
-    })
+    # Read the version before querying so a write during rendering forces a re-render next time
+    version = log_sink.version(ProcessedFile, RejectedFile, ErrorLog, CleanupLog)
+    etag = '"' + hashlib.sha1(f"{_dashboard_cache['boot_id']}|{version}|{watch_path}".encode()).hexdigest()[:16] + '"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    if _dashboard_cache["etag"] == etag:
+        return HTMLResponse(_dashboard_cache["body"], headers=headers)
+
+    db = SessionLocal()
+    try:
+        recent_files = db.query(ProcessedFile).order_by(ProcessedFile.created_at.desc()).limit(50).all()
+        rejected_files = db.query(RejectedFile).order_by(RejectedFile.created_at.desc()).limit(20).all()
+        error_logs = db.query(ErrorLog).order_by(ErrorLog.timestamp.desc()).limit(20).all()
+        cleanup_logs = db.query(CleanupLog).order_by(CleanupLog.timestamp.desc()).limit(30).all()
+
+        body = templates.get_template("dashboard.html").render({
+            "request": request,
+            "recent_files": recent_files,
+            "rejected_files": rejected_files,
+            "error_logs": error_logs,
+            "cleanup_logs": cleanup_logs,
+            "watch_path": watch_path
+        })
+    finally:
+        db.close()
+
+    _dashboard_cache["etag"], _dashboard_cache["body"] = etag, body
+    return HTMLResponse(body, headers=headers)
 
 @router.get("/cleanup", response_class=HTMLResponse)
 async def cleanup_page(request: Request):
@@ -63,7 +119,8 @@ async def start_cleanup(
     origin: str = Query(None),
     malayalam_dest: str = Query(None),
     english_dest: str = Query(None),
-    dry_run: bool = Query(True)
+    dry_run: bool = Query(True),
+    workers: int = Query(None)
 ):
     from backend.core.cleanup import run_manual_cleanup, cleanup_manager
     
@@ -90,7 +147,14 @@ async def start_cleanup(
     if final_dry is None: final_dry = dry_run
     if isinstance(final_dry, str): final_dry = final_dry.lower() == "true"
 
-    logger.info(f"Consolidated cleanup parameters: origin={final_origin}, mal={final_mal}, eng={final_eng}, dry={final_dry}")
+    # Parallel workers (None -> CLEANUP_WORKERS setting)
+    final_workers = body_data.get("workers", workers)
+    try:
+        final_workers = max(1, int(final_workers)) if final_workers not in (None, "") else None
+    except (TypeError, ValueError):
+        final_workers = None
+
+    logger.info(f"Consolidated cleanup parameters: origin={final_origin}, mal={final_mal}, eng={final_eng}, dry={final_dry}, workers={final_workers}")
 
     if not all([final_origin, final_mal, final_eng]):
         logger.error(f"Missing cleanup parameters: {final_origin}, {final_mal}, {final_eng}")
@@ -114,7 +178,8 @@ async def start_cleanup(
         final_origin,
         final_mal,
         final_eng,
-        final_dry
+        final_dry,
+        final_workers
     )
     
     return {
@@ -131,19 +196,77 @@ async def stop_cleanup():
 
 @router.get("/api/cleanup/status")
 async def get_cleanup_status():
-    from backend.core.cleanup import cleanup_manager
+    from backend.core.cleanup import get_cleanup_status as cleanup_status
+    return cleanup_status()
+
+@router.get("/api/cleanup/runs")
+async def list_cleanup_runs(limit: int = 20):
+    """
+    Recent cleanup runs with their final summaries.
+    """
+    from backend.core.cleanup import get_cleanup_runs
+    return get_cleanup_runs(limit)
+
+@router.get("/api/cleanup/runs/{run_id}")
+async def get_cleanup_run(run_id: int, files: bool = False, status: str = None, limit: int = 500):
+    """
+    One cleanup run; with files=true also its per-file outcomes (newest first).
+    """
+    from backend.core.cleanup import get_cleanup_run as load_run, get_cleanup_run_files
+    run = load_run(run_id)
+    if not run:
+        return JSONResponse(
+            status_code=404,
+            content={"error": f"Cleanup run {run_id} not found"}
+        )
+    if files:
+        run["files"] = get_cleanup_run_files(run_id, status=status, limit=limit)
+    return run
+
+@router.post("/api/cleanup/runs/{run_id}/resume")
+async def resume_cleanup(run_id: int, background_tasks: BackgroundTasks):
+    """
+    Continues a cancelled, failed or interrupted run; files it already finished are skipped.
+    """
+    from backend.core.cleanup import get_cleanup_run as load_run, resume_cleanup_run, cleanup_manager
+    run = load_run(run_id)
+    if not run:
+        return JSONResponse(
+            status_code=404,
+            content={"error": f"Cleanup run {run_id} not found"}
+        )
+    if cleanup_manager.is_running:
+        return {"status": "error", "message": "Cleanup already in progress"}
+    if not run["resumable"]:
+        return {"status": "error", "message": f"Run {run_id} is {run['status']} and cannot be resumed"}
+
+    background_tasks.add_task(resume_cleanup_run, run_id)
     return {
-        "is_running": cleanup_manager.is_running,
-        "should_stop": cleanup_manager.should_stop,
-        "current_file": cleanup_manager.current_file
+        "status": "success",
+        "message": f"Resuming cleanup run {run_id} ({run['cursor']} files already done)",
+        "mode": "dry_run" if run["dry_run"] else "live"
     }
 
 @router.get("/api/logs/errors")
-async def get_error_logs(limit: int = 50, db: Session = Depends(get_db)):
+async def get_error_logs(
+    response: Response,
+    limit: int = 50,
+    cursor: int = None,
+    level: str = None,
+    source: str = None,
+    since: datetime = None,
+    until: datetime = None,
+    db: Session = Depends(get_db)
+):
     """
-    Retrieve recent error logs.
+    Retrieve error logs, newest first. Pass X-Next-Cursor back as `cursor` for older entries.
     """
-    error_logs = db.query(ErrorLog).order_by(ErrorLog.timestamp.desc()).limit(limit).all()
+    query = db.query(ErrorLog)
+    if level:
+        query = query.filter(ErrorLog.level == level.upper())
+    if source:
+        query = query.filter(ErrorLog.source == source)
+    error_logs = keyset_page(query, ErrorLog, response, limit, cursor, since, until)
     
     return [{
         "id": log.id,
@@ -155,11 +278,26 @@ async def get_error_logs(limit: int = 50, db: Session = Depends(get_db)):
     } for log in error_logs]
 
 @router.get("/api/logs/cleanup")
-async def get_cleanup_logs(limit: int = 100, db: Session = Depends(get_db)):
+async def get_cleanup_logs(
+    response: Response,
+    limit: int = 100,
+    cursor: int = None,
+    status: str = None,
+    operation_type: str = None,
+    path_prefix: str = None,
+    since: datetime = None,
+    until: datetime = None,
+    db: Session = Depends(get_db)
+):
     """
-    Retrieve recent cleanup operation logs.
+    Retrieve cleanup operation logs, newest first. Pass X-Next-Cursor back as `cursor` for older entries.
     """
-    cleanup_logs = db.query(CleanupLog).order_by(CleanupLog.timestamp.desc()).limit(limit).all()
+    query = db.query(CleanupLog)
+    if status:
+        query = query.filter(CleanupLog.status == status)
+    if operation_type:
+        query = query.filter(CleanupLog.operation_type == operation_type)
+    cleanup_logs = keyset_page(query, CleanupLog, response, limit, cursor, since, until, path_prefix)
     
     return [{
         "id": log.id,
@@ -179,29 +317,19 @@ async def monitoring_page(request: Request):
 @router.get("/api/monitoring/stats")
 async def get_monitoring_stats(db: Session = Depends(get_db)):
     """Get system statistics for monitoring"""
-    from datetime import datetime, timedelta
-    from sqlalchemy import func
     from backend.core.watcher import watcher_manager
+    from backend.core.media_probe import probe_stats
+    from backend.core.probe_cache import probe_cache
+    from backend.core.log_sink import log_sink
+    from backend.core.event_bus import event_bus
+    from backend.core.daily_stats import daily_stats
+    from backend.db.database import db_stats
     
-    today = datetime.utcnow().date()
-    
-    # Count files processed today
-    processed_today = db.query(func.count(WatcherLog.id)).filter(
-        WatcherLog.action == "processed",
-        func.date(WatcherLog.timestamp) == today
-    ).scalar() or 0
-    
-    # Count errors today
-    errors_today = db.query(func.count(WatcherLog.id)).filter(
-        WatcherLog.action == "failed",
-        func.date(WatcherLog.timestamp) == today
-    ).scalar() or 0
-    
-    # Count ignored today
-    ignored_today = db.query(func.count(WatcherLog.id)).filter(
-        WatcherLog.action == "ignored",
-        func.date(WatcherLog.timestamp) == today
-    ).scalar() or 0
+    # Today's counters come from the daily rollup instead of COUNT(*) over watcher_logs
+    today = daily_stats.get_day(source="watcher")
+    processed_today = today.get(("watcher", "processed"), 0)
+    errors_today = today.get(("watcher", "failed"), 0)
+    ignored_today = today.get(("watcher", "ignored"), 0)
     
     # Get last activity
     last_activity = db.query(WatcherLog).order_by(WatcherLog.timestamp.desc()).first()
@@ -215,9 +343,121 @@ async def get_monitoring_stats(db: Session = Depends(get_db)):
         "ignored_today": ignored_today,
         "last_activity": last_activity_time,
         "watcher_status": "running" if status["is_running"] else "stopped",
-        "watched_path": status["watched_path"]
+        "watched_path": status["watched_path"],
+        "ingest": status["ingest"],
+        "stability": status["stability"],
+        "coalescer": status["coalescer"],
+        "scan": status["scan"],
+        "probe": probe_stats.snapshot(),
+        "probe_cache": probe_cache.get_counters(),
+        "log_sink": log_sink.get_status(),
+        "events": event_bus.get_status(),
+        "database": db_stats.snapshot(),
+        "browse_cache": directory_service.get_status()
+    }
+
+@router.get("/api/monitoring/history")
+async def get_monitoring_history(days: int = Query(30, ge=1, le=366), source: str = None, action: str = None):
+    """Per-day event counts ({source: {action: count}}) for the last N days, from the daily rollup"""
+    from backend.core.daily_stats import daily_stats
+    return daily_stats.get_history(days=days, source=source, action=action)
+
+@router.get("/api/events/stream")
+async def stream_events(request: Request):
+    """
+    Server-sent events for live pages:
+    - activity: one watcher log entry, as in /api/monitoring/activity (clients bump their counters from its action)
+    - status: watcher/ingest/stability/coalescer state, sent when it changes
+    - cleanup: same payload as /api/cleanup/status, sent when it changes
+    """
+    import asyncio
+    import json
+    from fastapi.responses import StreamingResponse
+    from backend.core.event_bus import event_bus
+
+    queue = event_bus.subscribe()
+
+    async def generate():
+        try:
+            for event_type in ("status", "cleanup"):
+                latest = event_bus.latest(event_type)
+                if latest is not None:
+                    yield f"event: {event_type}\ndata: {json.dumps(latest, default=str)}\n\n"
+            while True:
+                try:
+                    event_type, data = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    # Keep-alive comment so proxies don't close an idle stream
+                    yield ": ping\n\n"
+                    continue
+                yield f"event: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
+        finally:
+            event_bus.unsubscribe(queue)
+
+    return StreamingResponse(generate(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"
+    })
+
+@router.get("/api/cache/probe")
+async def get_probe_cache_stats():
+    """Probe cache size and hit/miss counters"""
+    from backend.core.probe_cache import probe_cache
+    return probe_cache.get_stats()
+
+@router.post("/api/cache/probe/evict")
+async def evict_probe_cache():
+    """Remove probe cache entries for files that no longer exist or have changed"""
+    from backend.core.probe_cache import probe_cache
+    from starlette.concurrency import run_in_threadpool
+    removed = await run_in_threadpool(probe_cache.evict_missing)
+    return {"status": "success", "removed": removed}
+
+@router.delete("/api/cache/probe")
+async def clear_probe_cache():
+    """Drop all cached probe results"""
+    from backend.core.probe_cache import probe_cache
+    removed = probe_cache.clear()
+    return {"status": "success", "removed": removed}
+
+@router.get("/api/cache/tmdb")
+async def get_tmdb_cache(status: str = None, limit: int = 100):
+    """Inspect the TMDB lookup cache"""
+    from backend.core.tmdb_cache import tmdb_cache
+    return {
+        "stats": tmdb_cache.get_stats(),
+        "entries": tmdb_cache.list_entries(status=status, limit=limit)
     }
 
+@router.delete("/api/cache/tmdb")
+async def purge_tmdb_cache(key: str = None, status: str = None, expired_only: bool = False):
+    """Purge TMDB cache entries (all, by key, by status, or only expired ones)"""
+    from backend.core.tmdb_cache import tmdb_cache
+    removed = tmdb_cache.purge(key=key, status=status, expired_only=expired_only)
+    return {"status": "success", "removed": removed}
+
+@router.get("/api/maintenance/retention")
+async def get_retention_status():
+    """Retention policies and the report of the last run"""
+    from backend.core.retention import retention_service
+    return retention_service.get_status()
+
+@router.post("/api/maintenance/retention/run")
+async def run_retention():
+    """Archive and prune old log rows now, then vacuum; returns rows/bytes removed"""
+    from backend.core.retention import retention_service
+    from starlette.concurrency import run_in_threadpool
+    return await run_in_threadpool(retention_service.run)
+
+@router.post("/api/maintenance/vacuum/convert")
+async def convert_auto_vacuum():
+    """One-time full VACUUM that enables incremental auto-vacuum; blocks all writes while it runs"""
+    from backend.core.retention import retention_service
+    from starlette.concurrency import run_in_threadpool
+    return await run_in_threadpool(retention_service.convert_auto_vacuum)
+
 @router.post("/api/monitoring/watcher/stop")
 async def stop_watcher():
     from backend.core.watcher import watcher_manager
@@ -237,9 +477,24 @@ async def restart_watcher():
     return {"status": "success", "message": "Watcher restarted"}
 
 @router.get("/api/monitoring/activity")
-async def get_monitoring_activity(limit: int = 50, db: Session = Depends(get_db)):
-    """Get recent watcher activity"""
-    activity = db.query(WatcherLog).order_by(WatcherLog.timestamp.desc()).limit(limit).all()
+async def get_monitoring_activity(
+    response: Response,
+    limit: int = 50,
+    cursor: int = None,
+    action: str = None,
+    event_type: str = None,
+    path_prefix: str = None,
+    since: datetime = None,
+    until: datetime = None,
+    db: Session = Depends(get_db)
+):
+    """Get watcher activity, newest first (X-Next-Cursor -> `cursor` for older entries)"""
+    query = db.query(WatcherLog)
+    if action:
+        query = query.filter(WatcherLog.action == action)
+    if event_type:
+        query = query.filter(WatcherLog.event_type == event_type)
+    activity = keyset_page(query, WatcherLog, response, limit, cursor, since, until, path_prefix)
     
     return [{
         "id": log.id,
@@ -322,36 +577,50 @@ async def remove_ignored_file(file_path: str):
             content={"error": "Failed to remove file from ignore list"}
         )
 @router.get("/api/debug/logs")
-async def get_system_logs():
-    """Diagnostic endpoint to read the log file"""
-    import os
-    log_path = "/data/filearr.log"
-    if not os.path.exists(log_path):
-        return {"error": "Log file not found"}
-    with open(log_path, "r") as f:
-        # Get last 100 lines
-        lines = f.readlines()
-        return {"logs": lines[-100:]}
+async def get_system_logs(
+    request: Request,
+    lines: int = Query(100, ge=0),
+    since_offset: int = Query(None, ge=0),
+    follow: bool = Query(False)
+):
+    """
+    Diagnostic endpoint to read the log file. Pass the returned `offset` back
+    as since_offset to get only newer lines; follow=true streams appended
+    text as it is written (starting at since_offset, or at the end).
+    """
+    from backend.core import log_tail
+    if follow:
+        from fastapi.responses import StreamingResponse
+        return StreamingResponse(
+            log_tail.follow(since_offset, is_disconnected=request.is_disconnected),
+            media_type="text/plain; charset=utf-8",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    return log_tail.tail(lines, since_offset)
 
 @router.get("/api/debug/ls")
-async def debug_list_files(path: str = "/media"):
-    """Diagnostic endpoint to see what the container sees"""
+async def debug_list_files(
+    path: str = "/media",
+    cursor: str = Query(None),
+    limit: int = Query(500, ge=1, le=5000),
+    q: str = Query(None),
+    stats: bool = Query(True),
+    order: str = Query("name", pattern="^(name|disk)$")
+):
+    """
+    Diagnostic endpoint to see what the container sees (one directory, paginated via next_cursor).
+    order=disk returns entries unsorted but reads only as far as the page needs.
+    """
     import os
     if not os.path.exists(path):
         return {"error": f"Path {path} not found"}
-    
-    structure = []
-    try:
-        for root, dirs, files in os.walk(path):
-            # Limit depth for safety or just show everything if it's a small path
-            rel_path = os.path.relpath(root, path)
-            structure.append({
-                "path": rel_path,
-                "dirs": dirs,
-                "files": files
-            })
-            if len(structure) > 100: # Safety break
-                break
-        return {"structure": structure}
-    except Exception as e:
-        return {"error": str(e)}
+
+    data = directory_service.list_directories(path, cursor=cursor, limit=limit, name_filter=q, stats=stats, order=order)
+    if "error" in data:
+        return data
+    return {
+        "structure": [{"path": ".", "dirs": data["directories"], "files": data["files"]}],
+        "entries": data.get("entries"),
+        "next_cursor": data["next_cursor"],
+        "total": data["total"]
+    }
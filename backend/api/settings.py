@@ -3,6 +3,7 @@ from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
 from backend.core.config_service import config_service
 from backend.core.directory_service import directory_service
+from backend.core.file_ops import PLACEMENT_MODES
 import logging
 import os
 
@@ -10,13 +11,12 @@ router = APIRouter()
 templates = Jinja2Templates(directory="frontend/templates")
 logger = logging.getLogger(__name__)
 
-from backend.core.watcher import watcher_manager
 from backend.core.tmdb import test_tmdb_api
 
 @router.get("/settings", response_class=HTMLResponse)
 async def settings_page(request: Request):
     config = config_service.get_all_settings()
-    return templates.TemplateResponse("settings.html", {"request": request, "config": config})
+    return templates.TemplateResponse("settings.html", {"request": request, "config": config, "placement_modes": PLACEMENT_MODES})
 
 @router.get("/api/settings/test-tmdb")
 async def verify_tmdb_key(api_key: str = Query(...)):
@@ -35,28 +35,31 @@ async def save_settings(
     keys = [
         "TMDB_API_KEY", 
         "INPUT_DIR", "OUTPUT_DIR", 
-        "MOVIES_DIR", "MALAYALAM_DIR", "REJECTED_DIR"
+        "MOVIES_DIR", "MALAYALAM_DIR", "REJECTED_DIR",
+        "PLACEMENT_MODE"
     ]
     
-    old_input_dir = config_service.get_setting("INPUT_DIR")
-    
+    # Subscribers (watcher restart on INPUT_DIR, TMDB cache on key change)
+    # are notified by config_service as each value changes
     for key in keys:
         if key in form:
             config_service.set_setting(key, form[key])
             
-    # If input dir changed, restart watcher
-    new_input_dir = config_service.get_setting("INPUT_DIR")
-    if old_input_dir != new_input_dir:
-        logger.info(f"Input directory changed from {old_input_dir} to {new_input_dir}. Restarting watcher.")
-        watcher_manager.restart()
-            
     # Redirect back to settings with success message (simplified)
     return RedirectResponse(url="/settings?saved=true", status_code=303)
 
 @router.get("/api/browse")
-async def browse_filesystem(path: str = Query(default="/media")):
+async def browse_filesystem(
+    path: str = Query(default="/media"),
+    cursor: str = Query(None),
+    limit: int = Query(500, ge=1, le=5000),
+    q: str = Query(None),
+    kind: str = Query("all"),
+    stats: bool = Query(False),
+    order: str = Query("name", pattern="^(name|disk)$")
+):
     try:
-        data = directory_service.list_directories(path)
+        data = directory_service.list_directories(path, cursor=cursor, limit=limit, name_filter=q, kind=kind, stats=stats, order=order)
         if "error" in data:
             return JSONResponse(status_code=400, content=data)
         return JSONResponse(content=data)
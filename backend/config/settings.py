@@ -14,14 +14,65 @@ class Settings(BaseSettings):
     # TMDB Settings
     TMDB_API_KEY: str = os.getenv("TMDB_API_KEY", "")
     
+    # TMDB lookup cache lifetimes
+    TMDB_CACHE_TTL_HOURS: int = int(os.getenv("TMDB_CACHE_TTL_HOURS", "168"))
+    TMDB_CACHE_MISS_TTL_HOURS: int = int(os.getenv("TMDB_CACHE_MISS_TTL_HOURS", "24"))
+    TMDB_CACHE_ERROR_TTL_MINUTES: int = int(os.getenv("TMDB_CACHE_ERROR_TTL_MINUTES", "15"))
+    
     # Database
     DATABASE_URL: str = f"sqlite:///{DATA_DIR}/filearr.db"
     
+    # SQLite connection tuning (applied to every pooled connection)
+    DB_BUSY_TIMEOUT_MS: int = int(os.getenv("DB_BUSY_TIMEOUT_MS", "10000"))
+    DB_SYNCHRONOUS: str = os.getenv("DB_SYNCHRONOUS", "NORMAL")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "8"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "8"))
+    
+    # Log retention: rows older than N days or beyond the newest M rows are archived
+    # to DATA_DIR/archive as gzipped JSONL and deleted (0 disables a limit)
+    RETENTION_WATCHER_DAYS: int = int(os.getenv("RETENTION_WATCHER_DAYS", "90"))
+    RETENTION_WATCHER_MAX_ROWS: int = int(os.getenv("RETENTION_WATCHER_MAX_ROWS", "200000"))
+    RETENTION_CLEANUP_DAYS: int = int(os.getenv("RETENTION_CLEANUP_DAYS", "180"))
+    RETENTION_CLEANUP_MAX_ROWS: int = int(os.getenv("RETENTION_CLEANUP_MAX_ROWS", "200000"))
+    RETENTION_ERROR_DAYS: int = int(os.getenv("RETENTION_ERROR_DAYS", "90"))
+    RETENTION_ERROR_MAX_ROWS: int = int(os.getenv("RETENTION_ERROR_MAX_ROWS", "50000"))
+    # Finished cleanup runs are archived together with their per-file rows
+    RETENTION_RUNS_DAYS: int = int(os.getenv("RETENTION_RUNS_DAYS", "180"))
+    RETENTION_RUNS_MAX_ROWS: int = int(os.getenv("RETENTION_RUNS_MAX_ROWS", "200"))
+    RETENTION_INTERVAL_HOURS: float = float(os.getenv("RETENTION_INTERVAL_HOURS", "24"))
+    
+    # Buffered log writer (LOG_SINK_SYNC=true writes every row immediately, for tests)
+    LOG_BATCH_SIZE: int = int(os.getenv("LOG_BATCH_SIZE", "200"))
+    LOG_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("LOG_FLUSH_INTERVAL_SECONDS", "1.0"))
+    LOG_SINK_SYNC: bool = os.getenv("LOG_SINK_SYNC", "false").lower() == "true"
+    
     # Clean up settings (Defaults, can be overridden by env or DB)
     REJECTED_DIR: str = os.getenv("REJECTED_DIR", f"{OUTPUT_DIR}/rejected")
     MOVIES_DIR: str = os.getenv("MOVIES_DIR", OUTPUT_DIR)
     MALAYALAM_DIR: str = os.getenv("MALAYALAM_DIR", f"{OUTPUT_DIR}/malayalam-movies")
     
+    # Watcher ingestion worker pool
+    INGEST_WORKERS: int = int(os.getenv("INGEST_WORKERS", "4"))
+    INGEST_PROBE_CONCURRENCY: int = int(os.getenv("INGEST_PROBE_CONCURRENCY", "2"))
+    INGEST_TMDB_CONCURRENCY: int = int(os.getenv("INGEST_TMDB_CONCURRENCY", "2"))
+    INGEST_MOVE_CONCURRENCY: int = int(os.getenv("INGEST_MOVE_CONCURRENCY", "1"))
+    
+    # File stability: release a new file once size/mtime stop changing for this long
+    STABILITY_QUIET_SECONDS: float = float(os.getenv("STABILITY_QUIET_SECONDS", "5"))
+    STABILITY_MAX_INTERVAL_SECONDS: float = float(os.getenv("STABILITY_MAX_INTERVAL_SECONDS", "30"))
+    
+    # Periodic rescan re-lists only directories whose mtime changed; every Nth pass lists everything
+    SCAN_FULL_EVERY: int = int(os.getenv("SCAN_FULL_EVERY", "12"))
+    
+    # Duplicate events for a path finished less than this long ago are dropped
+    COALESCE_WINDOW_SECONDS: float = float(os.getenv("COALESCE_WINDOW_SECONDS", "30"))
+    
+    # Manual cleanup: number of files identified/moved in parallel
+    CLEANUP_WORKERS: int = int(os.getenv("CLEANUP_WORKERS", "1"))
+    
+    # How identified files are placed in the library: move, hardlink, reflink or copy
+    PLACEMENT_MODE: str = os.getenv("PLACEMENT_MODE", "move")
+    
     # Ignore patterns (comma-separated glob patterns)
     IGNORE_PATTERNS: str = os.getenv("IGNORE_PATTERNS", "*.sample,*.txt,*.nfo,*-RARBG*,*trailer*")
     
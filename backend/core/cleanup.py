@@ -1,88 +1,548 @@
 import os
 from backend.core.processor import process_file
-from backend.core.language import detect_language
 from backend.config.settings import settings
+from backend.core.log_sink import log_sink
+from backend.core.event_bus import event_bus
 from backend.db.database import SessionLocal
-from backend.db.models import CleanupLog, ErrorLog
+from backend.db.models import CleanupLog, ErrorLog, CleanupRun, CleanupRunFile
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
 from loguru import logger
 import traceback
+import threading
+import json
+import time
 
 def log_cleanup(operation_type: str, file_path: str, destination: str = None, status: str = "success", details: str = None):
-    """Log cleanup operation to database"""
+    """Log cleanup operation to database (buffered, written in bulk by the log sink)"""
+    log_sink.write(
+        CleanupLog,
+        timestamp=datetime.utcnow(),
+        operation_type=operation_type,
+        file_path=file_path,
+        destination=destination,
+        status=status,
+        details=details
+    )
+
+def log_error(source: str, message: str, level: str = "ERROR", tb: str = None):
+    """Log error to database (buffered, written in bulk by the log sink)"""
+    log_sink.write(
+        ErrorLog,
+        timestamp=datetime.utcnow(),
+        level=level,
+        source=source,
+        message=message,
+        traceback=tb
+    )
+
+MEDIA_EXTENSIONS = ('.mkv', '.mp4', '.avi', '.mov')
+STAGES = ("tmdb", "probe", "decide", "move")
+# Outcomes that are not retried when a run is resumed (failed files are)
+FINISHED_STATUSES = ("moved", "dry_run", "skipped", "unidentified")
+CHECKPOINT_EVERY = 25
+
+class CleanupProgress:
+    """Counters, throughput and per-stage timings for one cleanup run."""
+    def __init__(self, run_id: int = None):
+        self._lock = threading.Lock()
+        self.run_id = run_id
+        self.started_at = datetime.utcnow()
+        self.finished_at = None
+        self._t0 = time.monotonic()
+        self._elapsed = None
+        self.total = None  # From the pre-count; None until it finishes
+        self.discovered = 0
+        self.completed = 0
+        self.processed = 0
+        self.moved = 0
+        self.skipped = 0
+        self.failed = 0
+        self.unidentified = 0
+        self.already_done = 0  # Finished by an earlier session of a resumed run
+        self.bytes_moved = 0
+        self.stage_seconds = {stage: 0.0 for stage in STAGES}
+
+    def file_discovered(self):
+        with self._lock:
+            self.discovered += 1
+
+    def record_outcome(self, outcome: dict):
+        status = outcome["status"]
+        with self._lock:
+            self.completed += 1
+            if status in ("dry_run", "moved"):
+                self.processed += 1
+            if status == "moved":
+                self.moved += 1
+                self.bytes_moved += outcome.get("bytes", 0)
+            elif status == "skipped":
+                self.skipped += 1
+            elif status == "failed":
+                self.failed += 1
+            elif status == "unidentified":
+                self.unidentified += 1
+            for stage, seconds in outcome.get("timings", {}).items():
+                self.stage_seconds[stage] += seconds
+
+    def finish(self):
+        with self._lock:
+            self.finished_at = datetime.utcnow()
+            self._elapsed = time.monotonic() - self._t0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            elapsed = self._elapsed if self._elapsed is not None else time.monotonic() - self._t0
+            files_per_sec = self.completed / elapsed if elapsed > 0 else 0.0
+            eta = None
+            percent = None
+            if self.total:
+                done = self.completed + self.already_done
+                remaining = max(self.total - done, 0)
+                percent = round(min(done / self.total, 1.0) * 100, 1)
+                if files_per_sec > 0 and self.finished_at is None:
+                    eta = round(remaining / files_per_sec, 1)
+            return {
+                "run_id": self.run_id,
+                "started_at": self.started_at.isoformat(),
+                "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+                "elapsed_seconds": round(elapsed, 1),
+                "total": self.total,
+                "discovered": self.discovered,
+                "completed": self.completed,
+                "processed": self.processed,
+                "moved": self.moved,
+                "skipped": self.skipped,
+                "failed": self.failed,
+                "unidentified": self.unidentified,
+                "already_done": self.already_done,
+                "bytes_moved": self.bytes_moved,
+                "files_per_sec": round(files_per_sec, 3),
+                "mb_per_sec": round(self.bytes_moved / elapsed / (1024 * 1024), 3) if elapsed > 0 else 0.0,
+                "percent": percent,
+                "eta_seconds": eta,
+                "stage_seconds": {stage: round(v, 3) for stage, v in self.stage_seconds.items()}
+            }
+
+def walk_media_files(origin_dir: str):
+    """
+    Yields (root, files) with media files only, in a deterministic order
+    (sorted directories and names) so a resumed run sees the same sequence.
+    """
+    for root, dirs, files in os.walk(origin_dir):
+        dirs.sort()
+        yield root, sorted(f for f in files if f.lower().endswith(MEDIA_EXTENSIONS))
+
+def count_media_files(origin_dir: str) -> int:
+    """Quick pre-count of media files (names only, no stat calls) for progress/ETA."""
+    total = 0
+    for root, files in walk_media_files(origin_dir):
+        if cleanup_manager.should_stop:
+            break
+        total += len(files)
+    return total
+
+class CleanupManager:
+    def __init__(self):
+        self.is_running = False
+        self.should_stop = False
+        self.current_file = ""
+        self.progress = None
+
+    def start(self, run_id: int = None):
+        self.is_running = True
+        self.should_stop = False
+        self.progress = CleanupProgress(run_id)
+
+    def stop(self):
+        if self.is_running:
+            self.should_stop = True
+
+    def finish(self):
+        # The last progress snapshot stays available after the run
+        if self.progress:
+            self.progress.finish()
+        self.is_running = False
+        self.should_stop = False
+        self.current_file = ""
+
+def _create_run(origin_dir: str, malayalam_dest: str, english_dest: str, dry_run: bool, workers: int):
     db = SessionLocal()
     try:
-        log_entry = CleanupLog(
-            timestamp=datetime.utcnow(),
-            operation_type=operation_type,
-            file_path=file_path,
-            destination=destination,
-            status=status,
-            details=details
+        run = CleanupRun(
+            origin_dir=origin_dir,
+            malayalam_dest=malayalam_dest,
+            english_dest=english_dest,
+            dry_run=dry_run,
+            workers=workers,
+            status="running"
         )
-        db.add(log_entry)
+        db.add(run)
         db.commit()
+        return run.id
     except Exception as e:
-        logger.error(f"Failed to log cleanup operation: {e}")
+        logger.error(f"Failed to record cleanup run: {e}")
         db.rollback()
+        return None
     finally:
         db.close()
 
-def log_error(source: str, message: str, level: str = "ERROR", tb: str = None):
-    """Log error to database"""
+def _reopen_run(run_id: int):
+    """
+    Marks an existing run as running again. Returns ({file_path: (status, destination)}
+    of finished files, the first file_index not used by earlier sessions, the
+    summary saved by the previous session or None).
+    """
     db = SessionLocal()
     try:
-        error_entry = ErrorLog(
-            timestamp=datetime.utcnow(),
-            level=level,
-            source=source,
-            message=message,
-            traceback=tb
+        run = db.query(CleanupRun).filter(CleanupRun.id == run_id).first()
+        run.status = "running"
+        run.finished_at = None
+        run.resumed_count = (run.resumed_count or 0) + 1
+        previous = json.loads(run.summary) if run.summary else None
+        db.commit()
+
+        finished = {}
+        next_index = 0
+        rows = db.query(CleanupRunFile.file_index, CleanupRunFile.file_path, CleanupRunFile.status, CleanupRunFile.destination).filter(
+            CleanupRunFile.run_id == run_id
+        ).order_by(CleanupRunFile.id)
+        for file_index, file_path, status, destination in rows:
+            if file_index is not None:
+                next_index = max(next_index, file_index + 1)
+            # Later rows win: a file that failed and then succeeded on resume is finished
+            if status in FINISHED_STATUSES:
+                finished[file_path] = (status, destination)
+            else:
+                finished.pop(file_path, None)
+        return finished, next_index, previous
+    finally:
+        db.close()
+
+def _checkpoint_run(run_id: int, cursor: int, last_file: str):
+    if run_id is None:
+        return
+    db = SessionLocal()
+    try:
+        db.query(CleanupRun).filter(CleanupRun.id == run_id).update(
+            {"cursor": cursor, "last_file": last_file}, synchronize_session=False
         )
-        db.add(error_entry)
         db.commit()
     except Exception as e:
-        logger.error(f"Failed to log error: {e}")
+        logger.error(f"Failed to checkpoint cleanup run {run_id}: {e}")
         db.rollback()
     finally:
         db.close()
 
-class CleanupManager:
-    def __init__(self):
-        self.is_running = False
-        self.should_stop = False
-        self.current_file = ""
+def _cumulative_summary(db, run_id: int, session: dict, previous: dict, prior_missing: int) -> dict:
+    """
+    Summary of a resumed run across all of its sessions. Counts come from
+    the latest outcome of every file in cleanup_run_files (a file that failed
+    and was retried counts once); session holds this session's own snapshot.
+    """
+    latest = {}
+    rows = db.query(CleanupRunFile.file_path, CleanupRunFile.status).filter(
+        CleanupRunFile.run_id == run_id
+    ).order_by(CleanupRunFile.id)
+    for file_path, status in rows:
+        latest[file_path] = status
+    counts = {}
+    for status in latest.values():
+        counts[status] = counts.get(status, 0) + 1
 
-    def start(self):
-        self.is_running = True
-        self.should_stop = False
+    summary = dict(session)
+    summary.update({
+        "completed": len(latest),
+        "processed": counts.get("moved", 0) + counts.get("dry_run", 0),
+        "moved": counts.get("moved", 0),
+        "skipped": counts.get("skipped", 0),
+        "failed": counts.get("failed", 0),
+        "unidentified": counts.get("unidentified", 0),
+        "bytes_moved": session["bytes_moved"] + (previous or {}).get("bytes_moved", 0),
+        "sessions": (previous or {}).get("sessions", 1) + 1,
+        "last_session": session
+    })
+    if session["total"] is not None:
+        # Files finished earlier that this walk no longer sees (moved away in live mode)
+        total = session["total"] + prior_missing
+        summary["total"] = total
+        summary["percent"] = round(min(len(latest) / total, 1.0) * 100, 1) if total else None
+    return summary
 
-    def stop(self):
-        if self.is_running:
-            self.should_stop = True
+def _finish_run(run_id: int, status: str, summary: dict, cursor: int = None, last_file: str = None,
+                resumed: bool = False, previous: dict = None, prior_missing: int = 0):
+    if run_id is None:
+        return
+    # Per-file outcomes go through the log sink; make sure they land before the run is closed
+    log_sink.flush()
+    db = SessionLocal()
+    try:
+        run = db.query(CleanupRun).filter(CleanupRun.id == run_id).first()
+        if run:
+            if resumed:
+                summary = _cumulative_summary(db, run_id, summary, previous, prior_missing)
+            run.status = status
+            run.finished_at = datetime.utcnow()
+            run.summary = json.dumps(summary)
+            if cursor is not None:
+                run.cursor = cursor
+                run.last_file = last_file
+            db.commit()
+    except Exception as e:
+        logger.error(f"Failed to finalize cleanup run {run_id}: {e}")
+        db.rollback()
+    finally:
+        db.close()
 
-    def finish(self):
-        self.is_running = False
-        self.should_stop = False
-        self.current_file = ""
+def _run_to_dict(r: CleanupRun) -> dict:
+    return {
+        "id": r.id,
+        "started_at": r.started_at.isoformat() if r.started_at else None,
+        "finished_at": r.finished_at.isoformat() if r.finished_at else None,
+        "origin_dir": r.origin_dir,
+        "malayalam_dest": r.malayalam_dest,
+        "english_dest": r.english_dest,
+        "dry_run": r.dry_run,
+        "workers": r.workers,
+        "status": r.status,
+        "cursor": r.cursor or 0,
+        "last_file": r.last_file,
+        "resumed_count": r.resumed_count or 0,
+        "resumable": r.status in ("cancelled", "failed", "interrupted"),
+        "summary": json.loads(r.summary) if r.summary else None
+    }
+
+def get_cleanup_runs(limit: int = 20) -> list:
+    db = SessionLocal()
+    try:
+        runs = db.query(CleanupRun).order_by(CleanupRun.id.desc()).limit(limit).all()
+        return [_run_to_dict(r) for r in runs]
+    except Exception as e:
+        logger.error(f"Failed to list cleanup runs: {e}")
+        return []
+    finally:
+        db.close()
+
+def get_cleanup_run(run_id: int):
+    db = SessionLocal()
+    try:
+        run = db.query(CleanupRun).filter(CleanupRun.id == run_id).first()
+        return _run_to_dict(run) if run else None
+    except Exception as e:
+        logger.error(f"Failed to load cleanup run {run_id}: {e}")
+        return None
+    finally:
+        db.close()
+
+def get_cleanup_run_files(run_id: int, status: str = None, limit: int = 500) -> list:
+    db = SessionLocal()
+    try:
+        query = db.query(CleanupRunFile).filter(CleanupRunFile.run_id == run_id)
+        if status:
+            query = query.filter(CleanupRunFile.status == status)
+        rows = query.order_by(CleanupRunFile.id.desc()).limit(limit).all()
+        return [{
+            "file_index": r.file_index,
+            "file_path": r.file_path,
+            "status": r.status,
+            "destination": r.destination,
+            "timestamp": r.timestamp.isoformat() if r.timestamp else None
+        } for r in rows]
+    except Exception as e:
+        logger.error(f"Failed to list files of cleanup run {run_id}: {e}")
+        return []
+    finally:
+        db.close()
+
+def mark_interrupted_runs() -> int:
+    """Runs still 'running' at startup were cut off by a restart; flag them as resumable."""
+    db = SessionLocal()
+    try:
+        count = db.query(CleanupRun).filter(CleanupRun.status == "running").update(
+            {"status": "interrupted"}, synchronize_session=False
+        )
+        db.commit()
+        if count:
+            logger.info(f"Marked {count} cleanup run(s) as interrupted")
+        return count
+    except Exception as e:
+        logger.error(f"Failed to mark interrupted cleanup runs: {e}")
+        db.rollback()
+        return 0
+    finally:
+        db.close()
 
 cleanup_manager = CleanupManager()
 
-def run_manual_cleanup(origin_dir: str, malayalam_dest: str, english_dest: str, dry_run: bool = True):
+def get_cleanup_status() -> dict:
+    progress = cleanup_manager.progress.snapshot() if cleanup_manager.progress else None
+    return {
+        "is_running": cleanup_manager.is_running,
+        "should_stop": cleanup_manager.should_stop,
+        "current_file": cleanup_manager.current_file,
+        "run_id": progress["run_id"] if progress else None,
+        "progress": progress
+    }
+
+event_bus.register_poller("cleanup", get_cleanup_status)
+
+class DestinationClaims:
     """
-    Scans origin_dir and processes files, routing them based on detected language.
-    If dry_run is True, it simulates the actions.
+    Makes sure two source files that resolve to the same destination don't
+    clobber each other within one run, and serializes moves into the same
+    destination folder. Claims are granted in discovery order, so the first
+    file found always wins regardless of which worker finishes first.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._turn = threading.Condition(self._lock)
+        self._next_index = 0
+        self._ended = set()  # Turns ended out of order, waiting for earlier ones
+        self._claims = {}
+        self._folder_locks = {}
+
+    def seed(self, dest_path: str, source: str):
+        """Pre-claims a destination taken by an earlier session of a resumed run."""
+        with self._lock:
+            self._claims.setdefault(dest_path, source)
+
+    def claim(self, index: int, dest_path: str, source: str):
+        """Returns None if claimed, otherwise the source that already owns dest_path."""
+        with self._turn:
+            self._turn.wait_for(lambda: self._next_index >= index)
+            owner = self._claims.setdefault(dest_path, source)
+            return None if owner == source else owner
+
+    def end_turn(self, index: int):
+        """
+        Must be called for every index (claimed, failed or cancelled) to let
+        the next file claim; calling it again for the same index is harmless.
+        """
+        with self._turn:
+            if index < self._next_index:
+                return
+            self._ended.add(index)
+            while self._next_index in self._ended:
+                self._ended.discard(self._next_index)
+                self._next_index += 1
+            self._turn.notify_all()
+
+    def folder_lock(self, dest_path: str) -> threading.Lock:
+        folder = os.path.dirname(dest_path)
+        with self._lock:
+            return self._folder_locks.setdefault(folder, threading.Lock())
+
+def _cleanup_file(index: int, file: str, file_path: str, malayalam_dest: str, english_dest: str, dry_run: bool, claims: DestinationClaims) -> dict:
+    """
+    Identifies, routes and (unless dry_run) moves one file.
+    Returns an outcome dict; DB logging is left to the caller so it stays in discovery order.
     """
     from backend.core.tmdb import get_movie_metadata
     from backend.core.decision import decide
     from backend.core.quality import get_quality_score
     from backend.core.file_ops import move_file
+    from backend.core.media_probe import probe_media
+    from backend.core.language import get_refined_language
+
+    logger.info(f"Checking file: {file}")
+    timings = {}
+    started = time.monotonic()
+
+    def lap(stage):
+        nonlocal started
+        now = time.monotonic()
+        timings[stage] = timings.get(stage, 0.0) + now - started
+        started = now
+
+    try:
+        # 1. Get Metadata (Renaming starts here)
+        metadata = get_movie_metadata(file)
+        lap("tmdb")
+        if not metadata:
+            logger.warning(f"Could not identify movie for {file}")
+            return {"status": "unidentified", "timings": timings}
+
+        # 2. Detect Language & Quality (single ffprobe pass shared by both)
+        media_info = probe_media(file_path)
+        lang_code = get_refined_language(file_path, metadata, media_info)
+        quality = get_quality_score(file_path, media_info)
+        lap("probe")
+
+        # 3. Make Decision (Using overrides for manual destinations)
+        decision = decide(
+            file_path=file_path,
+            language=lang_code,
+            quality_score=quality,
+            is_cam=False, # Manual cleanup assumes filtered files
+            tmdb_info=metadata,
+            movies_dir_override=english_dest,
+            mal_dir_override=malayalam_dest
+        )
+        
+        dest_path = decision.destination
+        details = f"Language Code: {lang_code}"
+
+        owner = claims.claim(index, dest_path, file_path)
+        claims.end_turn(index)
+        lap("decide")
+        if owner:
+            logger.warning(f"Skipping {file_path}: {dest_path} is already taken by {owner} in this run")
+            return {"status": "skipped", "destination": dest_path, "details": f"Destination already claimed by {owner}", "timings": timings}
+        
+        if dry_run:
+            logger.info(f"[DRY RUN] Would move {file_path} to {dest_path} (Lang Code: {lang_code})")
+            return {"status": "dry_run", "destination": dest_path, "details": details, "timings": timings}
+
+        # 4. Execute Move/Rename
+        # Shared move_file handles directory creation and logging
+        with claims.folder_lock(dest_path):
+            moved = move_file(file_path, dest_path, decision.placement)
+        lap("move")
+        if not moved:
+            raise Exception(f"Move failed for {file_path}: {moved.error}")
+        return {"status": "moved", "destination": dest_path, "details": f"{details} [{moved.placement}]", "bytes": moved.bytes, "timings": timings}
+                
+    except Exception as e:
+        return {"status": "failed", "error": str(e), "traceback": traceback.format_exc(), "timings": timings}
+    finally:
+        claims.end_turn(index)
+
+def run_manual_cleanup(origin_dir: str, malayalam_dest: str, english_dest: str, dry_run: bool = True, workers: int = None, run_id: int = None):
+    """
+    Scans origin_dir and processes files, routing them based on detected language.
+    If dry_run is True, it simulates the actions.
+    With workers > 1 files are processed in parallel; outcomes are still logged in discovery order.
+    Passing the run_id of an earlier run resumes it: files it already finished are skipped.
+    """
+    from backend.core.config_service import config_service
+
+    if workers is None:
+        workers = config_service.get_setting("CLEANUP_WORKERS", 1)
+    try:
+        workers = max(1, int(workers))
+    except (TypeError, ValueError):
+        workers = 1
     
-    cleanup_manager.start()
-    logger.info(f"Starting manual cleanup: Origin={origin_dir}, Malayalam={malayalam_dest}, English={english_dest}, DryRun={dry_run}")
+    finished = {}
+    index_base = 0  # file_index keeps counting across sessions of a resumed run
+    previous = None
+    resumed = run_id is not None
+    if run_id is None:
+        run_id = _create_run(origin_dir, malayalam_dest, english_dest, dry_run, workers)
+    else:
+        finished, index_base, previous = _reopen_run(run_id)
+    cleanup_manager.start(run_id)
+    progress = cleanup_manager.progress
+    status = "failed"
+    position = index_base  # Media files seen so far in walk order, offset past earlier sessions
+    # Cumulative: files finished by earlier sessions plus files completed in this one
+    cursor = {"position": len(finished), "file": None, "since_checkpoint": 0}
+    logger.info(f"Starting manual cleanup: Run={run_id}, Origin={origin_dir}, Malayalam={malayalam_dest}, English={english_dest}, DryRun={dry_run}, Workers={workers}, AlreadyDone={len(finished)}")
     
-    log_cleanup("scan", origin_dir, None, "success", f"Started cleanup (dry_run={dry_run})")
+    log_cleanup("scan", origin_dir, None, "success", f"{'Resumed' if finished else 'Started'} cleanup run {run_id} (dry_run={dry_run}, workers={workers})")
     
+    executor = None
     try:
         if not os.path.exists(origin_dir):
             error_msg = f"Origin directory {origin_dir} does not exist."
@@ -90,80 +550,112 @@ def run_manual_cleanup(origin_dir: str, malayalam_dest: str, english_dest: str,
             log_error("cleanup", error_msg, "ERROR")
             raise FileNotFoundError(error_msg)
 
-        processed_count = 0
-        moved_count = 0
-        failed_count = 0
+        # Quick pre-count so progress can report percent done and an ETA
+        progress.total = count_media_files(origin_dir)
+        logger.info(f"Cleanup pre-count: {progress.total} media files under {origin_dir}")
+
+        claims = DestinationClaims()
+        for file_path, (done_status, destination) in finished.items():
+            if destination and done_status in ("moved", "dry_run"):
+                claims.seed(destination, file_path)
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="CleanupWorker")
+        # Futures in discovery order; bounded so a huge tree isn't queued up front
+        in_flight = deque()
+        discovered = 0
+
+        def record(file_index, file_path, outcome):
+            outcome_status = outcome["status"]
+            if outcome_status == "dry_run":
+                log_cleanup("dry_run", file_path, outcome["destination"], "success", outcome["details"])
+            elif outcome_status == "moved":
+                log_cleanup("move", file_path, outcome["destination"], "success", outcome["details"])
+            elif outcome_status == "skipped":
+                log_cleanup("dry_run" if dry_run else "move", file_path, outcome["destination"], "skipped", outcome["details"])
+            elif outcome_status == "failed":
+                error_msg = f"Error processing {file_path}: {outcome['error']}"
+                logger.error(error_msg)
+                log_error("cleanup", error_msg, "ERROR", outcome["traceback"])
+                log_cleanup("move", file_path, None, "failed", outcome["error"])
+            progress.record_outcome(outcome)
+
+            log_sink.write(
+                CleanupRunFile,
+                run_id=run_id,
+                file_index=file_index,
+                file_path=file_path,
+                status=outcome_status,
+                destination=outcome.get("destination"),
+                timestamp=datetime.utcnow()
+            )
+            cursor["position"] += 1
+            cursor["file"] = file_path
+            cursor["since_checkpoint"] += 1
+            if cursor["since_checkpoint"] >= CHECKPOINT_EVERY:
+                cursor["since_checkpoint"] = 0
+                log_sink.flush()
+                _checkpoint_run(run_id, cursor["position"], cursor["file"])
+
+        def drain(limit):
+            while len(in_flight) > limit:
+                file_index, _, file_path, future = in_flight.popleft()
+                if future.cancelled():
+                    continue
+                record(file_index, file_path, future.result())
         
-        for root, dirs, files in os.walk(origin_dir):
+        for root, files in walk_media_files(origin_dir):
             if cleanup_manager.should_stop:
                 logger.info("Cleanup operation cancelled by user.")
                 break
 
-            logger.info(f"Scanning directory: {root} (Found {len(files)} files)")
-            if not files:
-                continue
-                
+            logger.info(f"Scanning directory: {root} (Found {len(files)} media files)")
             for file in files:
                 if cleanup_manager.should_stop:
                     break
 
                 file_path = os.path.join(root, file)
-                cleanup_manager.current_file = file
-                
-                # Skip non-media files
-                if not file.lower().endswith(('.mkv', '.mp4', '.avi', '.mov')):
+                file_index = position
+                position += 1
+                if file_path in finished:
+                    # Finished by an earlier session of this run: no probe or TMDB call
+                    progress.already_done += 1
                     continue
 
-                logger.info(f"Checking file: {file}")
-                try:
-                    # 1. Get Metadata (Renaming starts here)
-                    metadata = get_movie_metadata(file)
-                    if not metadata:
-                        logger.warning(f"Could not identify movie for {file}")
-                        continue
-
-                    # 2. Detect Language & Quality
-                    from backend.core.language import get_refined_language
-                    lang_code = get_refined_language(file_path, metadata)
-                    quality = get_quality_score(file_path)
-
-                    # 3. Make Decision (Using overrides for manual destinations)
-                    decision = decide(
-                        file_path=file_path,
-                        language=lang_code,
-                        quality_score=quality,
-                        is_cam=False, # Manual cleanup assumes filtered files
-                        tmdb_info=metadata,
-                        movies_dir_override=english_dest,
-                        mal_dir_override=malayalam_dest
-                    )
-                    
-                    dest_path = decision.destination
-                    
-                    if dry_run:
-                        logger.info(f"[DRY RUN] Would move {file_path} to {dest_path} (Lang Code: {lang_code})")
-                        log_cleanup("dry_run", file_path, dest_path, "success", f"Language Code: {lang_code}")
-                    else:
-                        # 4. Execute Move/Rename
-                        # Shared move_file handles directory creation and logging
-                        if move_file(file_path, dest_path):
-                            log_cleanup("move", file_path, dest_path, "success", f"Language Code: {lang_code}")
-                            moved_count += 1
-                        else:
-                            raise Exception(f"Move failed for {file_path}")
-                    
-                    processed_count += 1
-                            
-                except Exception as e:
-                    error_msg = f"Error processing {file_path}: {str(e)}"
-                    logger.error(error_msg)
-                    log_error("cleanup", error_msg, "ERROR", traceback.format_exc())
-                    log_cleanup("move", file_path, None, "failed", str(e))
-                    failed_count += 1
+                cleanup_manager.current_file = file
+                progress.file_discovered()
+                future = executor.submit(_cleanup_file, discovered, file, file_path, malayalam_dest, english_dest, dry_run, claims)
+                in_flight.append((file_index, discovered, file_path, future))
+                discovered += 1
+                drain(workers * 2)
+
+        if cleanup_manager.should_stop:
+            # Files not started yet are dropped; the ones already running finish.
+            # A dropped file gives up its claim turn or the files after it would wait forever
+            for _, claim_index, _, future in in_flight:
+                if future.cancel():
+                    claims.end_turn(claim_index)
+        drain(0)
                         
         status = "cancelled" if cleanup_manager.should_stop else "success"
-        summary = f"Summary: Processed {processed_count} files, Moved {moved_count}, Failed {failed_count} ({status})"
+        summary = f"Summary: Processed {progress.processed} files, Moved {progress.moved}, Skipped {progress.skipped}, Failed {progress.failed}, Already done {progress.already_done} ({status})"
         logger.info(summary)
         log_cleanup("scan", origin_dir, None, status, summary)
     finally:
+        if executor:
+            executor.shutdown(wait=True, cancel_futures=True)
         cleanup_manager.finish()
+        _finish_run(run_id, status, progress.snapshot(), cursor["position"], cursor["file"],
+                    resumed=resumed, previous=previous, prior_missing=len(finished) - progress.already_done)
+
+def resume_cleanup_run(run_id: int):
+    """Continues a cancelled, failed or interrupted run with its original parameters."""
+    run = get_cleanup_run(run_id)
+    if not run:
+        raise ValueError(f"Cleanup run {run_id} not found")
+    run_manual_cleanup(
+        run["origin_dir"],
+        run["malayalam_dest"],
+        run["english_dest"],
+        run["dry_run"],
+        run["workers"],
+        run_id=run_id
+    )
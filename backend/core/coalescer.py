@@ -0,0 +1,70 @@
+"""
+Event Coalescer - Merges duplicate watcher events per path before they reach the pipeline
+"""
+from backend.core.config_service import config_service
+import threading
+import time
+from loguru import logger
+
+def _window_seconds() -> float:
+    try:
+        return max(0.0, float(config_service.get_setting("COALESCE_WINDOW_SECONDS", 30)))
+    except (TypeError, ValueError):
+        return 30.0
+
+class EventCoalescer:
+    """
+    A path is "active" from its first accepted event until the pipeline is
+    done with it (settling, queued or in flight). Further events for an
+    active path, or for a path finished less than COALESCE_WINDOW_SECONDS
+    ago, are merged into the existing one instead of re-running the pipeline.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._active = {}
+        self._recent = {}
+        self.accepted = 0
+        self.coalesced = 0
+
+    def offer(self, path: str, event_type: str) -> bool:
+        """Returns True if the event should enter the pipeline, False if it was merged."""
+        now = time.monotonic()
+        with self._lock:
+            finished_at = self._recent.get(path)
+            if finished_at is not None and now - finished_at >= _window_seconds():
+                del self._recent[path]
+                finished_at = None
+
+            if path in self._active or finished_at is not None:
+                self.coalesced += 1
+                logger.debug(f"Coalesced {event_type} event for {path}")
+                return False
+
+            self._active[path] = event_type
+            self.accepted += 1
+            return True
+
+    def discard(self, path: str):
+        """Forgets an active path without starting its window (e.g. renamed away)."""
+        with self._lock:
+            self._active.pop(path, None)
+
+    def done(self, path: str):
+        """Marks the pipeline as finished with path and starts its coalescing window."""
+        now = time.monotonic()
+        with self._lock:
+            self._active.pop(path, None)
+            self._recent[path] = now
+            if len(self._recent) > 1000:
+                window = _window_seconds()
+                self._recent = {p: t for p, t in self._recent.items() if now - t < window}
+
+    def get_status(self) -> dict:
+        with self._lock:
+            return {
+                "active": len(self._active),
+                "accepted": self.accepted,
+                "coalesced": self.coalesced
+            }
+
+event_coalescer = EventCoalescer()
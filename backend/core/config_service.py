@@ -2,86 +2,146 @@ from sqlalchemy.orm import Session
 from backend.db.models import SystemSetting
 from backend.config.settings import settings as env_settings
 from backend.db.database import SessionLocal
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
+import threading
 import logging
 
 logger = logging.getLogger(__name__)
 
-class ConfigService:
-    @staticmethod
-    def get_setting(key: str, default: str = None) -> str:
-        """
-        Retrieves a setting. Priority:
-        1. Database
-        2. Environment Variable (via settings.py)
-        3. Default value
-        """
-        db = SessionLocal()
-        try:
-            db_setting = db.query(SystemSetting).filter(SystemSetting.key == key).first()
-            if db_setting and db_setting.value:
-                return db_setting.value
-        except Exception as e:
-            logger.error(f"Error retrieving setting {key}: {e}")
-        finally:
-            db.close()
-            
-        # Fallback to env settings
-        if hasattr(env_settings, key):
-            return getattr(env_settings, key)
-            
-        return default
+class ConfigSnapshot(NamedTuple):
+    """Immutable view of the configuration at one point in time."""
+    version: int
+    stored: Mapping  # Raw values from the system_settings table
+    merged: Mapping  # Env defaults overlaid with non-empty DB values
 
-    @staticmethod
-    def set_setting(key: str, value: str):
-        db = SessionLocal()
-        try:
-            setting = db.query(SystemSetting).filter(SystemSetting.key == key).first()
-            if not setting:
-                setting = SystemSetting(key=key, value=value)
-                db.add(setting)
-            else:
-                old_value = setting.value
-                setting.value = value
-                logger.info(f"Updated setting {key}: {old_value} -> {value}")
-            db.commit()
-            return True
-        except Exception as e:
-            logger.error(f"Error saving setting {key}: {e}")
-            db.rollback()
-            return False
-        finally:
-            db.close()
+class ConfigService:
+    """
+    Settings are read from an in-process snapshot that is loaded once and
+    swapped atomically whenever set_setting writes, so readers never touch
+    the database. Subscribers are told which keys changed.
+    """
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._snapshot = None
+        self._subscribers = []
 
-    @staticmethod
-    def get_all_settings():
-        """
-        Returns a dict of all settings (merged Env and DB).
-        """
+    def _build_snapshot(self, version: int, stored: dict) -> ConfigSnapshot:
         # Start with env settings
-        config = {
+        merged = {
             "TMDB_API_KEY": env_settings.TMDB_API_KEY,
             "INPUT_DIR": env_settings.INPUT_DIR,
             "OUTPUT_DIR": env_settings.OUTPUT_DIR,
             "MOVIES_DIR": env_settings.MOVIES_DIR,
             "MALAYALAM_DIR": env_settings.MALAYALAM_DIR,
             "REJECTED_DIR": env_settings.REJECTED_DIR,
+            "CLEANUP_WORKERS": env_settings.CLEANUP_WORKERS,
+            "PLACEMENT_MODE": env_settings.PLACEMENT_MODE,
         }
-        
         # Overlay DB settings
+        for key, value in stored.items():
+            if value:
+                merged[key] = value
+        return ConfigSnapshot(version, MappingProxyType(dict(stored)), MappingProxyType(merged))
+
+    def _load_stored(self) -> dict:
+        db = SessionLocal()
         try:
+            return {s.key: s.value for s in db.query(SystemSetting).all()}
+        finally:
+            db.close()
+
+    def snapshot(self) -> ConfigSnapshot:
+        snap = self._snapshot
+        if snap is None:
+            snap = self.reload()
+        return snap
+
+    def reload(self) -> ConfigSnapshot:
+        """Re-reads the system_settings table and publishes a new snapshot."""
+        with self._lock:
+            old = self._snapshot
+            version = old.version + 1 if old else 1
+            try:
+                stored = self._load_stored()
+            except Exception as e:
+                # Don't cache a snapshot built without the DB (e.g. before init_db)
+                logger.error(f"Error loading settings from DB: {e}")
+                return self._build_snapshot(0, {})
+
+            snap = self._build_snapshot(version, stored)
+            self._snapshot = snap
+        if old:
+            changed = {k for k in set(old.stored) | set(snap.stored) if old.stored.get(k) != snap.stored.get(k)}
+            self._notify(snap, changed)
+        return snap
+
+    def subscribe(self, callback):
+        """Registers callback(snapshot, changed_keys) to run after every change."""
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def _notify(self, snap: ConfigSnapshot, changed: set):
+        if not changed:
+            return
+        for callback in list(self._subscribers):
+            try:
+                callback(snap, changed)
+            except Exception as e:
+                logger.error(f"Config subscriber {getattr(callback, '__name__', callback)} failed: {e}")
+
+    def get_setting(self, key: str, default: str = None) -> str:
+        """
+        Retrieves a setting. Priority:
+        1. Database
+        2. Environment Variable (via settings.py)
+        3. Default value
+        """
+        value = self.snapshot().stored.get(key)
+        if value:
+            return value
+
+        # Fallback to env settings
+        if hasattr(env_settings, key):
+            return getattr(env_settings, key)
+
+        return default
+
+    def set_setting(self, key: str, value: str):
+        with self._lock:
+            old = self.snapshot()
             db = SessionLocal()
             try:
-                db_settings = db.query(SystemSetting).all()
-                for s in db_settings:
-                    if s.value:
-                        config[s.key] = s.value
+                setting = db.query(SystemSetting).filter(SystemSetting.key == key).first()
+                if not setting:
+                    setting = SystemSetting(key=key, value=value)
+                    db.add(setting)
+                else:
+                    old_value = setting.value
+                    setting.value = value
+                    logger.info(f"Updated setting {key}: {old_value} -> {value}")
+                db.commit()
             except Exception as e:
-                logger.error(f"Error querying DB settings: {e}")
+                logger.error(f"Error saving setting {key}: {e}")
+                db.rollback()
+                return False
             finally:
                 db.close()
-        except Exception as e:
-            logger.error(f"Error creating DB session in get_all_settings: {e}")
-            
-        return config
+
+            if key in old.stored and old.stored[key] == value:
+                return True
+            stored = dict(old.stored)
+            stored[key] = value
+            snap = self._build_snapshot(old.version + 1, stored)
+            self._snapshot = snap
+        self._notify(snap, {key})
+        return True
+
+    def get_all_settings(self):
+        """
+        Returns a dict of all settings (merged Env and DB).
+        """
+        return dict(self.snapshot().merged)
 
 config_service = ConfigService()
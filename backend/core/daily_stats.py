@@ -0,0 +1,119 @@
+"""
+Daily Stats - Per-day event counters keyed by (day, source, action), rolled up as log rows are flushed
+"""
+from backend.db.database import SessionLocal
+from backend.db.models import DailyStat, WatcherLog, CleanupLog, ErrorLog
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert
+from datetime import datetime, timedelta
+from collections import Counter
+import logging
+
+logger = logging.getLogger(__name__)
+
+# How a log row maps to its counter: model -> values -> (source, action)
+ROLLUPS = {
+    WatcherLog: lambda v: ("watcher", v.get("action")),
+    CleanupLog: lambda v: ("cleanup", f"{v.get('operation_type')}:{v.get('status')}"),
+    ErrorLog: lambda v: (v.get("source") or "unknown", (v.get("level") or "ERROR").lower()),
+}
+
+def _day(timestamp) -> str:
+    return (timestamp or datetime.utcnow()).strftime("%Y-%m-%d")
+
+class DailyStats:
+    def apply(self, db, batch: list):
+        """
+        Log sink flush hook: adds the batch's counts inside the same
+        transaction as the log rows, so counters and logs commit together.
+        The sink runs it in a savepoint; if it fails only the counts are lost.
+        """
+        counts = Counter()
+        for model, values in batch:
+            rollup = ROLLUPS.get(model)
+            if rollup:
+                source, action = rollup(values)
+                counts[(_day(values.get("timestamp")), source, action)] += 1
+        self._add(db, counts)
+
+    def _add(self, db, counts: Counter):
+        if not counts:
+            return
+        stmt = insert(DailyStat)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DailyStat.day, DailyStat.source, DailyStat.action],
+            set_={"count": DailyStat.count + stmt.excluded.count}
+        )
+        db.execute(stmt, [
+            {"day": day, "source": source, "action": action, "count": count}
+            for (day, source, action), count in counts.items()
+        ])
+
+    def backfill(self) -> int:
+        """One-time rollup of the existing log tables when daily_stats is empty."""
+        db = SessionLocal()
+        try:
+            if db.query(DailyStat.id).first() is not None:
+                return 0
+            counts = Counter()
+            day = func.date(WatcherLog.timestamp)
+            for d, action, n in db.query(day, WatcherLog.action, func.count(WatcherLog.id)).group_by(day, WatcherLog.action):
+                counts[(d, "watcher", action)] += n
+            day = func.date(CleanupLog.timestamp)
+            for d, op, status, n in db.query(day, CleanupLog.operation_type, CleanupLog.status, func.count(CleanupLog.id)).group_by(day, CleanupLog.operation_type, CleanupLog.status):
+                counts[(d, "cleanup", f"{op}:{status}")] += n
+            day = func.date(ErrorLog.timestamp)
+            for d, source, level, n in db.query(day, ErrorLog.source, ErrorLog.level, func.count(ErrorLog.id)).group_by(day, ErrorLog.source, ErrorLog.level):
+                counts[(d, source or "unknown", (level or "ERROR").lower())] += n
+            counts = Counter({key: n for key, n in counts.items() if key[0]})
+            self._add(db, counts)
+            db.commit()
+            if counts:
+                logger.info(f"Daily stats backfilled from {sum(counts.values())} log rows")
+            return sum(counts.values())
+        except Exception as e:
+            logger.error(f"Daily stats backfill failed: {e}")
+            db.rollback()
+            return 0
+        finally:
+            db.close()
+
+    def get_day(self, day: str = None, source: str = None) -> dict:
+        """{(source, action): count} for one UTC day (today by default)."""
+        db = SessionLocal()
+        try:
+            query = db.query(DailyStat.source, DailyStat.action, DailyStat.count).filter(
+                DailyStat.day == (day or _day(None))
+            )
+            if source:
+                query = query.filter(DailyStat.source == source)
+            return {(s, a): n for s, a, n in query}
+        finally:
+            db.close()
+
+    def get_history(self, days: int = 30, source: str = None, action: str = None) -> list:
+        """Per-day counts for the last `days` UTC days, oldest first, including empty days."""
+        today = datetime.utcnow().date()
+        start = today - timedelta(days=max(days, 1) - 1)
+        db = SessionLocal()
+        try:
+            query = db.query(DailyStat.day, DailyStat.source, DailyStat.action, DailyStat.count).filter(
+                DailyStat.day >= start.isoformat()
+            )
+            if source:
+                query = query.filter(DailyStat.source == source)
+            if action:
+                query = query.filter(DailyStat.action == action)
+            by_day = {}
+            for d, s, a, n in query:
+                by_day.setdefault(d, {}).setdefault(s, {})[a] = n
+        finally:
+            db.close()
+
+        history = []
+        for i in range((today - start).days + 1):
+            d = (start + timedelta(days=i)).isoformat()
+            history.append({"day": d, "counts": by_day.get(d, {})})
+        return history
+
+daily_stats = DailyStats()
@@ -1,11 +1,13 @@
 from pydantic import BaseModel
 import os
 from backend.core.config_service import config_service
+from backend.core.file_ops import normalize_placement
 
 class Decision(BaseModel):
     action: str  # 'move', 'replace', 'reject', 'ignore'
     destination: str
     reason: str
+    placement: str = "move"  # How a 'move' is carried out: 'move', 'hardlink', 'reflink', 'copy'
 
 import re
 
@@ -45,5 +47,6 @@ def decide(file_path, language, quality_score, is_cam, tmdb_info, existing_file=
     return Decision(
         action="move",
         destination=final_path,
-        reason=f"Processed (Language: {language})"
+        reason=f"Processed (Language: {language})",
+        placement=normalize_placement(config_service.get_setting("PLACEMENT_MODE", "move"))
     )
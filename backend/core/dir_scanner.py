@@ -0,0 +1,131 @@
+"""
+Directory Scanner - Incremental os.scandir walk that reuses listings of directories whose mtime hasn't changed
+"""
+from typing import NamedTuple
+import threading
+import time
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Directories modified this recently may still change within the same mtime tick
+# (coarse timestamps on SMB/NFS shares), so their listings are never reused
+RACY_NS = 2 * 1_000_000_000
+
+class DirState(NamedTuple):
+    mtime_ns: int
+    nlink: int
+    child_count: int  # Subdirectories in the listing; nlink is 2 + this on most POSIX filesystems
+    files: tuple  # (path, size, mtime_ns) of matching files directly in this directory
+    subdirs: tuple
+
+class DirectoryScanner:
+    """
+    A directory's mtime only changes when entries are added, removed or
+    renamed directly inside it, so an unchanged directory is not re-listed:
+    its cached files are returned as-is and only its subdirectories are
+    stat'ed. A cached listing is also re-read when its child count no
+    longer matches the directory's link count, which catches a subdirectory
+    added or removed within the same coarse mtime tick. In-place rewrites
+    of an existing file don't bump the directory mtime; those are left to
+    the watcher and to the periodic full pass.
+    """
+    def __init__(self, extensions: tuple):
+        self.extensions = extensions
+        self._lock = threading.Lock()
+        self._root = None
+        self._cache = {}
+        self.last_scan = {}
+        self.scans = 0
+
+    def scan(self, root: str, full: bool = False) -> list:
+        """Returns (path, size, mtime_ns) for every matching file under root."""
+        started = time.monotonic()
+        now_ns = time.time_ns()
+        with self._lock:
+            if root != self._root:
+                self._root, self._cache = root, {}
+            cache = self._cache
+
+        results = []
+        new_cache = {}
+        visited = skipped = 0
+        stack = [root]
+        while stack:
+            path = stack.pop()
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+
+            cached = cache.get(path)
+            if not full and cached and self._unchanged(cached, st):
+                skipped += 1
+                state = cached
+            else:
+                visited += 1
+                state = self._list(path, st)
+                if state is None:
+                    continue
+
+            if now_ns - st.st_mtime_ns >= RACY_NS:
+                new_cache[path] = state
+            results.extend(state.files)
+            # Reversed so directories are visited in sorted order
+            stack.extend(reversed(state.subdirs))
+
+        with self._lock:
+            if root == self._root:
+                # Directories that disappeared drop out of the cache here
+                self._cache = new_cache
+            self.scans += 1
+            self.last_scan = {
+                "root": root,
+                "full": full or not cache,
+                "dirs_visited": visited,
+                "dirs_skipped": skipped,
+                "files": len(results),
+                "duration_seconds": round(time.monotonic() - started, 3),
+                "finished_at": time.time()
+            }
+        return results
+
+    @staticmethod
+    def _unchanged(cached: DirState, st) -> bool:
+        if (cached.mtime_ns, cached.nlink) != (st.st_mtime_ns, st.st_nlink):
+            return False
+        # Filesystems that don't count subdirectories in nlink (btrfs, some
+        # FUSE/SMB mounts) report 1; only mtime can be compared there
+        return st.st_nlink < 2 or cached.child_count == st.st_nlink - 2
+
+    def _list(self, path: str, st) -> DirState:
+        files = []
+        subdirs = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.name.lower().endswith(self.extensions) and entry.is_file():
+                            est = entry.stat()
+                            files.append((entry.path, est.st_size, est.st_mtime_ns))
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.warning(f"Could not list {path}: {e}")
+            return None
+        files.sort()
+        subdirs.sort()
+        return DirState(st.st_mtime_ns, st.st_nlink, len(subdirs), tuple(files), tuple(subdirs))
+
+    def get_status(self) -> dict:
+        with self._lock:
+            return {
+                "cached_dirs": len(self._cache),
+                "scans": self.scans,
+                "last_scan": dict(self.last_scan)
+            }
+
+dir_scanner = DirectoryScanner(('.mkv', '.mp4', '.avi', '.m4v', '.ts'))
@@ -1,47 +1,235 @@
 import os
 from typing import List, Dict
+from collections import OrderedDict
+from bisect import bisect_right
+import threading
 import platform
+import time
+
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5000
+LISTING_TTL_SECONDS = 10
+MAX_CACHED_LISTINGS = 32
+# Directories modified this recently may still change within the same mtime tick
+RACY_NS = 2 * 1_000_000_000
+
+class Listing:
+    """One scandir pass: (is_file, name) tuples sorted directories first, then by name."""
+    def __init__(self, mtime_ns: int, entries: list):
+        self.mtime_ns = mtime_ns
+        self.built_at = time.monotonic()
+        self.entries = entries
+
+def _encode_cursor(is_file: bool, name: str) -> str:
+    return f"{int(is_file)}:{name}"
+
+def _decode_cursor(cursor: str):
+    kind, sep, name = (cursor or "").partition(":")
+    if not sep or kind not in ("0", "1"):
+        return None
+    return (kind == "1", name)
+
+def _encode_stream_cursor(mtime_ns: int, offset: int) -> str:
+    return f"s:{mtime_ns}:{offset}"
+
+def _decode_stream_cursor(cursor: str):
+    """Returns (mtime_ns, offset) or None."""
+    parts = (cursor or "").split(":")
+    if len(parts) != 3 or parts[0] != "s" or not parts[1].isdigit() or not parts[2].isdigit():
+        return None
+    return int(parts[1]), int(parts[2])
+
+def _is_dir(entry) -> bool:
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+def _stat_dict(st) -> Dict:
+    return {"size": st.st_size, "mtime": st.st_mtime}
+
+def _entry_stats(path: str, name: str) -> Dict:
+    # Only rows on the page are stat'ed
+    try:
+        return _stat_dict(os.lstat(os.path.join(path, name)))
+    except OSError:
+        return {"size": None, "mtime": None}
 
 class DirectoryService:
-    @staticmethod
-    def list_directories(path: str) -> Dict:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._listings = OrderedDict()  # path -> Listing
+        self.hits = 0
+        self.misses = 0
+
+    def _listing(self, path: str) -> Listing:
         """
-        Lists directories and files in a given path.
-        Returns a dictionary with 'current_path', 'parent_path', 'directories', and 'files'.
+        Returns the cached listing for path while the directory mtime is
+        unchanged and the listing is younger than LISTING_TTL_SECONDS.
+        """
+        st = os.stat(path)
+        with self._lock:
+            cached = self._listings.get(path)
+            if (cached and cached.mtime_ns == st.st_mtime_ns
+                    and time.monotonic() - cached.built_at < LISTING_TTL_SECONDS):
+                self._listings.move_to_end(path)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        with os.scandir(path) as it:
+            entries = [(not _is_dir(entry), entry.name) for entry in it]
+        entries.sort()
+        listing = Listing(st.st_mtime_ns, entries)
+
+        if time.time_ns() - st.st_mtime_ns >= RACY_NS:
+            with self._lock:
+                self._listings[path] = listing
+                self._listings.move_to_end(path)
+                while len(self._listings) > MAX_CACHED_LISTINGS:
+                    self._listings.popitem(last=False)
+        return listing
+
+    def list_directories(self, path: str, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE,
+                         name_filter: str = None, kind: str = "all", stats: bool = False,
+                         order: str = "name") -> Dict:
+        """
+        Lists directories and files in a given path, one page at a time.
+        Returns a dictionary with 'current_path', 'parent_path', 'directories',
+        'files' and 'next_cursor' (None on the last page); with stats=True
+        'entries' also carries size/mtime per name.
+        kind is "all", "dirs" or "files"; name_filter is a case-insensitive substring.
+        order="name" sorts (directories first), which needs the whole directory
+        read once (then cached); order="disk" streams entries in readdir order
+        and stops as soon as the page is full, but has no total.
         """
         if not path or not os.path.exists(path):
             # Default to root or home if path is invalid
             path = "/" if platform.system() != "Windows" else "C:\\"
-        
+
         # Normalize path
         path = os.path.abspath(path)
-        
-        directories = []
-        files = []
-        
+        limit = max(1, min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
+
+        needle = name_filter.lower() if name_filter else None
+
+        def matches(is_file: bool, name: str) -> bool:
+            if (kind == "dirs" and is_file) or (kind == "files" and not is_file):
+                return False
+            return not needle or needle in name.lower()
+
+        if order == "disk":
+            try:
+                return self._stream_page(path, cursor, limit, matches, stats)
+            except PermissionError:
+                return {"error": "Permission denied"}
+            except Exception as e:
+                return {"error": str(e)}
+
         try:
-            with os.scandir(path) as it:
-                for entry in it:
-                    if entry.is_dir():
-                        directories.append(entry.name)
-                    else:
-                        files.append(entry.name)
+            listing = self._listing(path)
         except PermissionError:
             return {"error": "Permission denied"}
         except Exception as e:
             return {"error": str(e)}
-            
-        # Sort for better UX
-        directories.sort()
-        files.sort()
-        
+
+        start = 0
+        after = _decode_cursor(cursor)
+        if after is not None:
+            start = bisect_right(listing.entries, after)
+
+        directories = []
+        files = []
+        entries = []
+        next_cursor = None
+        taken = 0
+        for is_file, name in listing.entries[start:]:
+            if kind == "dirs" and is_file:
+                # Directories sort first, nothing further can match
+                break
+            if not matches(is_file, name):
+                continue
+            if taken == limit:
+                next_cursor = _encode_cursor(*last)
+                break
+            (files if is_file else directories).append(name)
+            if stats:
+                entries.append({"name": name, "is_dir": not is_file, **_entry_stats(path, name)})
+            last = (is_file, name)
+            taken += 1
+
         parent_path = os.path.dirname(path)
-        
-        return {
+        if needle or kind in ("dirs", "files"):
+            # Matches across the whole listing (names are in memory, no stat calls)
+            total = sum(1 for is_file, name in listing.entries if matches(is_file, name))
+        else:
+            total = len(listing.entries)
+
+        result = {
             "current_path": path,
             "parent_path": parent_path,
             "directories": directories,
-            "files": files 
+            "files": files,
+            "next_cursor": next_cursor,
+            "total": total
         }
+        if stats:
+            result["entries"] = entries
+        return result
+
+    def _stream_page(self, path: str, cursor: str, limit: int, matches, stats: bool) -> Dict:
+        """
+        One page in readdir order. Entries before the cursor offset are
+        skipped by name only (no stat), and reading stops at the first match
+        after the page is full, so page 1 of a huge directory costs one page.
+        """
+        st = os.stat(path)
+        offset = 0
+        if cursor:
+            decoded = _decode_stream_cursor(cursor)
+            if decoded is None:
+                return {"error": "Invalid cursor"}
+            mtime_ns, offset = decoded
+            if mtime_ns != st.st_mtime_ns:
+                # readdir order is only stable while the directory is unchanged
+                return {"error": "Directory changed since this listing started, reload it"}
+
+        directories = []
+        files = []
+        entries = []
+        next_cursor = None
+        with os.scandir(path) as it:
+            for position, entry in enumerate(it):
+                if position < offset:
+                    continue
+                is_file = not _is_dir(entry)
+                if not matches(is_file, entry.name):
+                    continue
+                if len(directories) + len(files) == limit:
+                    next_cursor = _encode_stream_cursor(st.st_mtime_ns, position)
+                    break
+                (files if is_file else directories).append(entry.name)
+                if stats:
+                    try:
+                        entry_stats = _stat_dict(entry.stat(follow_symlinks=False))
+                    except OSError:
+                        entry_stats = {"size": None, "mtime": None}
+                    entries.append({"name": entry.name, "is_dir": not is_file, **entry_stats})
+
+        result = {
+            "current_path": path,
+            "parent_path": os.path.dirname(path),
+            "directories": directories,
+            "files": files,
+            "next_cursor": next_cursor,
+            "total": None
+        }
+        if stats:
+            result["entries"] = entries
+        return result
+
+    def get_status(self) -> Dict:
+        with self._lock:
+            return {"cached_listings": len(self._listings), "hits": self.hits, "misses": self.misses}
 
 directory_service = DirectoryService()
@@ -0,0 +1,131 @@
+"""
+Event Bus - Fans out live watcher, cleanup and status events to connected SSE clients
+"""
+import asyncio
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+QUEUE_SIZE = 500
+
+def _without(data: dict, paths: tuple) -> dict:
+    """Copy of data minus the dotted key paths (e.g. "ingest.average_utilization")."""
+    if not paths or not isinstance(data, dict):
+        return data
+    data = dict(data)
+    for path in paths:
+        head, _, rest = path.partition(".")
+        if head not in data:
+            continue
+        if rest:
+            data[head] = _without(data[head], (rest,))
+        else:
+            del data[head]
+    return data
+
+class EventBus:
+    """
+    Publishers call publish() from any thread; each subscriber gets its own
+    bounded asyncio.Queue fed through its event loop. With no subscribers a
+    publish is a no-op, and pollers only run while someone is listening.
+    """
+    def __init__(self, poll_interval: float = 2.0):
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._subscribers = {}  # queue -> loop
+        self._pollers = {}  # event_type -> (fn returning a JSON-able dict, key paths ignored for change detection)
+        self._last_polled = {}
+        self._last_compared = {}
+        self._poll_thread = None
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self) -> asyncio.Queue:
+        """Registers a client on the running event loop and returns its queue."""
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._subscribers[queue] = loop
+            if self._poll_thread is None or not self._poll_thread.is_alive():
+                self._last_polled = {}
+                self._last_compared = {}
+                self._poll_thread = threading.Thread(target=self._poll_loop, daemon=True, name="EventBusPoller")
+                self._poll_thread.start()
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        with self._lock:
+            self._subscribers.pop(queue, None)
+
+    def register_poller(self, event_type: str, fn, volatile: tuple = ()):
+        """
+        fn() is called every poll_interval while clients are connected; an
+        event is published only when its result differs from the last one.
+        Fields listed in volatile (dotted paths) drift with time alone and are
+        left out of that comparison, but still sent when something else changes.
+        """
+        with self._lock:
+            self._pollers[event_type] = (fn, tuple(volatile))
+
+    def latest(self, event_type: str):
+        """Last value a poller published (sent to new clients on connect)."""
+        return self._last_polled.get(event_type)
+
+    def publish(self, event_type: str, data: dict):
+        if not self._subscribers:
+            return
+        with self._lock:
+            targets = list(self._subscribers.items())
+        event = (event_type, data)
+        for queue, loop in targets:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, event)
+            except RuntimeError:
+                # Loop already closed; the client is gone
+                self.unsubscribe(queue)
+        self.published += 1
+
+    def _deliver(self, queue: asyncio.Queue, event):
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Slow client: drop its oldest event rather than block publishers
+            self.dropped += 1
+            try:
+                queue.get_nowait()
+                queue.put_nowait(event)
+            except (asyncio.QueueEmpty, asyncio.QueueFull):
+                pass
+
+    def _poll_loop(self):
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    self._poll_thread = None
+                    return
+                pollers = list(self._pollers.items())
+            for event_type, (fn, volatile) in pollers:
+                try:
+                    data = fn()
+                except Exception as e:
+                    logger.error(f"Event poller {event_type} failed: {e}")
+                    continue
+                compared = _without(data, volatile)
+                if event_type not in self._last_compared or compared != self._last_compared[event_type]:
+                    self._last_compared[event_type] = compared
+                    self._last_polled[event_type] = data
+                    self.publish(event_type, data)
+            time.sleep(self.poll_interval)
+
+    def get_status(self) -> dict:
+        with self._lock:
+            clients = len(self._subscribers)
+        return {
+            "clients": clients,
+            "published": self.published,
+            "dropped": self.dropped
+        }
+
+event_bus = EventBus()
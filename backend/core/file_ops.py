@@ -1,28 +1,212 @@
 import shutil
 import os
+import time
+import errno
 import logging
+from pydantic import BaseModel
+from typing import Optional
 from backend.core.config_service import config_service
 
 logger = logging.getLogger(__name__)
 
-def move_file(src, dest):
+COPY_CHUNK = 64 * 1024 * 1024
+PARTIAL_SUFFIX = ".filearr-partial"
+FICLONE = 0x40049409  # linux/fs.h: _IOW(0x94, 9, int)
+
+PLACEMENT_MODES = ("move", "hardlink", "reflink", "copy")
+# Errors meaning "this filesystem can't link/clone here", as opposed to real I/O failures
+LINK_UNSUPPORTED = (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL, errno.ENOSYS)
+
+class MoveResult(BaseModel):
+    """Outcome of move_file; truthy on success so callers can keep using `if move_file(...)`."""
+    success: bool
+    src: str
+    dest: str
+    mode: str = "move"  # Requested placement mode
+    method: Optional[str] = None  # What actually happened: rename, hardlink, reflink, copy_file_range, sendfile or copy
+    bytes: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+    def __bool__(self):
+        return self.success
+
+    @property
+    def mb_per_sec(self) -> float:
+        return self.bytes / self.seconds / (1024 * 1024) if self.seconds > 0 else 0.0
+
+    @property
+    def placement(self) -> str:
+        """Mode and method for logs, e.g. 'hardlink' or 'hardlink->sendfile' after a fallback."""
+        if self.method in (None, self.mode) or (self.mode == "move" and self.method == "rename"):
+            return self.mode
+        return f"{self.mode}->{self.method}"
+
+def normalize_placement(mode) -> str:
+    mode = str(mode or "move").strip().lower()
+    if mode not in PLACEMENT_MODES:
+        logger.warning(f"Unknown placement mode '{mode}', falling back to move")
+        return "move"
+    return mode
+
+def _copy_data(fsrc, fdst, size: int) -> str:
+    """Copies size bytes between open files in the kernel where possible. Returns the method used."""
+    src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+    copied = 0
+    method = "copy_file_range" if hasattr(os, "copy_file_range") else "sendfile"
+    while copied < size:
+        count = min(COPY_CHUNK, size - copied)
+        try:
+            if method == "copy_file_range":
+                n = os.copy_file_range(src_fd, dst_fd, count)
+            else:
+                n = os.sendfile(dst_fd, src_fd, copied, count)
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF):
+                raise
+            n = None
+        if n == 0 and os.fstat(src_fd).st_size > copied:
+            # Some FUSE/CIFS/overlay mounts report 0 instead of an error when they can't do it
+            n = None
+        if n is None:
+            # Not supported for this pair of filesystems; try the next method from the current offset
+            method = "sendfile" if method == "copy_file_range" and hasattr(os, "sendfile") else "copy"
+            if method == "copy":
+                fsrc.seek(copied)
+                fdst.seek(copied)
+                shutil.copyfileobj(fsrc, fdst, COPY_CHUNK)
+                fdst.flush()
+                return method
+            continue
+        if n == 0:
+            break  # Source shrank while copying; caught by the size check
+        copied += n
+    return method
+
+def _reflink(fsrc, fdst) -> bool:
+    """Shares the source's extents with dest (btrfs/XFS/bcachefs). False if unsupported here."""
+    try:
+        import fcntl
+        fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        return True
+    except (ImportError, OSError) as e:
+        if isinstance(e, OSError) and e.errno not in LINK_UNSUPPORTED:
+            raise
+        return False
+
+def _fsync_dir(path: str):
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def _temp_path(dest: str) -> str:
+    return os.path.join(os.path.dirname(dest) or ".", f".{os.path.basename(dest)}.{os.getpid()}{PARTIAL_SUFFIX}")
+
+def _copy_file(src: str, dest: str, size: int, reflink: bool = False) -> str:
+    """
+    Copies (or clones) into a temp file next to dest, fsyncs and size-checks
+    it, then renames it into place so dest never exists half-written.
+    """
+    tmp = _temp_path(dest)
+    try:
+        with open(src, "rb") as fsrc, open(tmp, "wb") as fdst:
+            if reflink and _reflink(fsrc, fdst):
+                method = "reflink"
+            else:
+                method = _copy_data(fsrc, fdst, size)
+            os.fsync(fdst.fileno())
+        written = os.path.getsize(tmp)
+        if written != size:
+            raise IOError(f"Size mismatch after copy: expected {size} bytes, wrote {written}")
+        shutil.copystat(src, tmp)
+        os.replace(tmp, dest)
+        _fsync_dir(os.path.dirname(dest) or ".")
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return method
+
+def _hardlink(src: str, dest: str) -> bool:
+    """Links src at dest (replacing an existing dest atomically). False if links aren't possible here."""
+    if os.path.exists(dest) and os.path.samefile(src, dest):
+        return True
+    tmp = _temp_path(dest)
+    try:
+        os.link(src, tmp)
+    except OSError as e:
+        if e.errno not in LINK_UNSUPPORTED:
+            raise
+        return False
+    try:
+        os.replace(tmp, dest)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return True
+
+def move_file(src, dest, mode: str = "move") -> MoveResult:
     """
-    Safely moves a file from src to dest, creating parent directories if needed.
+    Safely places src at dest, creating parent directories if needed.
+    - move: atomic rename on the same filesystem; otherwise a kernel-assisted
+      copy to a temp file, fsync, size check, atomic rename, then the source is removed.
+    - hardlink / reflink: the source is kept (e.g. for seeding); falls back to
+      a verified copy across devices or on filesystems without support.
+    - copy: verified copy, source kept.
     """
+    mode = normalize_placement(mode)
+    start = time.monotonic()
     try:
         if not os.path.exists(src):
             logger.error(f"Source file {src} does not exist.")
-            return False
+            return MoveResult(success=False, src=src, dest=dest, mode=mode, error="Source does not exist")
             
         dest_dir = os.path.dirname(dest)
         os.makedirs(dest_dir, exist_ok=True)
         
-        shutil.move(src, dest)
-        logger.info(f"Moved {src} -> {dest}")
-        return True
+        st = os.stat(src)
+        same_device = st.st_dev == os.stat(dest_dir).st_dev
+        if mode == "move":
+            method = None
+            if same_device:
+                try:
+                    os.replace(src, dest)
+                    method = "rename"
+                except OSError as e:
+                    # Two bind mounts of one filesystem share st_dev but can't rename across each other
+                    if e.errno not in (errno.EXDEV, errno.EPERM):
+                        raise
+            if method is None:
+                method = _copy_file(src, dest, st.st_size)
+                os.unlink(src)
+        elif mode == "hardlink" and same_device and _hardlink(src, dest):
+            method = "hardlink"
+        else:
+            method = _copy_file(src, dest, st.st_size, reflink=mode == "reflink" and same_device)
+
+        if method == "rename":
+            # Same inode, size and mtime: keep its probe result reachable at the new path
+            from backend.core.probe_cache import probe_cache
+            probe_cache.relocate(src, dest)
+
+        result = MoveResult(success=True, src=src, dest=dest, mode=mode, method=method, bytes=st.st_size, seconds=time.monotonic() - start)
+        if method in ("rename", "hardlink", "reflink"):
+            logger.info(f"Placed {src} -> {dest} ({result.placement})")
+        else:
+            logger.info(f"Placed {src} -> {dest} ({result.placement}, {st.st_size} bytes in {result.seconds:.1f}s, {result.mb_per_sec:.1f} MB/s)")
+        return result
     except Exception as e:
-        logger.error(f"Failed to move {src} to {dest}: {e}")
-        return False
+        logger.error(f"Failed to {mode} {src} to {dest}: {e}")
+        return MoveResult(success=False, src=src, dest=dest, mode=mode, error=str(e), seconds=time.monotonic() - start)
 
 def rejection_move(src, reason):
     """
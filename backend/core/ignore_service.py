@@ -2,109 +2,135 @@
 Ignore Service - Manages file ignore patterns for Filearr
 """
 from backend.db.database import SessionLocal
-from backend.db.models import SystemSetting
+from backend.core.config_service import config_service
+import threading
 import fnmatch
+import re
+import os
 import logging
 
 logger = logging.getLogger(__name__)
 
+class IgnoreMatcher:
+    """All ignore patterns compiled into a single regex; reports which pattern matched."""
+    def __init__(self, patterns: list[str]):
+        self.patterns = list(patterns)
+        self._regex = None
+        if self.patterns:
+            parts = [
+                f"(?P<p{i}>{fnmatch.translate(os.path.normcase(p))})"
+                for i, p in enumerate(self.patterns)
+            ]
+            self._regex = re.compile("|".join(parts))
+
+    def match(self, filename: str):
+        """Returns the first matching pattern (in list order) or None."""
+        if not self._regex:
+            return None
+        m = self._regex.match(os.path.normcase(filename))
+        if not m:
+            return None
+        for i, pattern in enumerate(self.patterns):
+            if m.group(f"p{i}") is not None:
+                return pattern
+        return None
+
 class IgnoreService:
-    
+    """
+    should_ignore() runs against a compiled matcher and an in-memory map of
+    manually ignored paths. Both are built once and only rebuilt when the
+    patterns or the ignored-file list change.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._matcher = None
+        self._ignored_paths = None  # file_path -> reason
+
     @staticmethod
-    def get_ignore_patterns() -> list[str]:
+    def _parse_patterns(value: str) -> list[str]:
+        # Split by comma and strip whitespace
+        return [p.strip() for p in (value or "").split(",") if p.strip()]
+
+    def get_ignore_patterns(self) -> list[str]:
         """Get all ignore patterns from database"""
-        db = SessionLocal()
-        try:
-            setting = db.query(SystemSetting).filter(SystemSetting.key == "IGNORE_PATTERNS").first()
-            if setting and setting.value:
-                # Split by comma and strip whitespace
-                patterns = [p.strip() for p in setting.value.split(",") if p.strip()]
-                return patterns
-            return []
-        except Exception as e:
-            logger.error(f"Error retrieving ignore patterns: {e}")
-            return []
-        finally:
-            db.close()
+        return self._parse_patterns(config_service.snapshot().stored.get("IGNORE_PATTERNS"))
+
+    def _get_matcher(self) -> IgnoreMatcher:
+        matcher = self._matcher
+        if matcher is None:
+            matcher = IgnoreMatcher(self.get_ignore_patterns())
+            self._matcher = matcher
+        return matcher
+
+    def on_config_change(self, snapshot, changed_keys):
+        """Config subscriber: recompile the matcher when IGNORE_PATTERNS changes."""
+        if "IGNORE_PATTERNS" in changed_keys:
+            self._matcher = IgnoreMatcher(self._parse_patterns(snapshot.stored.get("IGNORE_PATTERNS")))
+            logger.info(f"Ignore matcher rebuilt with {len(self._matcher.patterns)} patterns")
+
+    def _get_ignored_paths(self) -> dict:
+        from backend.db.models import IgnoredFile
+
+        with self._lock:
+            if self._ignored_paths is None:
+                db = SessionLocal()
+                try:
+                    rows = db.query(IgnoredFile.file_path, IgnoredFile.reason).all()
+                    self._ignored_paths = {row.file_path: row.reason for row in rows}
+                except Exception as e:
+                    logger.error(f"Error loading ignored files: {e}")
+                    return {}
+                finally:
+                    db.close()
+            return self._ignored_paths
     
-    @staticmethod
-    def set_ignore_patterns(patterns: list[str]):
+    def set_ignore_patterns(self, patterns: list[str]):
         """Set ignore patterns in database"""
-        db = SessionLocal()
-        try:
-            # Join patterns with comma
-            pattern_str = ",".join(patterns)
-            
-            setting = db.query(SystemSetting).filter(SystemSetting.key == "IGNORE_PATTERNS").first()
-            if not setting:
-                setting = SystemSetting(key="IGNORE_PATTERNS", value=pattern_str)
-                db.add(setting)
-            else:
-                setting.value = pattern_str
-            
-            db.commit()
-            return True
-        except Exception as e:
-            logger.error(f"Error saving ignore patterns: {e}")
-            db.rollback()
+        # Join patterns with comma
+        pattern_str = ",".join(patterns)
+        if not config_service.set_setting("IGNORE_PATTERNS", pattern_str):
+            logger.error("Error saving ignore patterns")
             return False
-        finally:
-            db.close()
+        return True
     
-    @staticmethod
-    def add_pattern(pattern: str) -> bool:
+    def add_pattern(self, pattern: str) -> bool:
         """Add a new ignore pattern"""
-        patterns = IgnoreService.get_ignore_patterns()
+        patterns = self.get_ignore_patterns()
         if pattern not in patterns:
             patterns.append(pattern)
-            return IgnoreService.set_ignore_patterns(patterns)
+            return self.set_ignore_patterns(patterns)
         return True
     
-    @staticmethod
-    def remove_pattern(pattern: str) -> bool:
+    def remove_pattern(self, pattern: str) -> bool:
         """Remove an ignore pattern"""
-        patterns = IgnoreService.get_ignore_patterns()
+        patterns = self.get_ignore_patterns()
         if pattern in patterns:
             patterns.remove(pattern)
-            return IgnoreService.set_ignore_patterns(patterns)
+            return self.set_ignore_patterns(patterns)
         return True
     
-    @staticmethod
-    def should_ignore(file_path: str) -> tuple[bool, str]:
+    def should_ignore(self, file_path: str) -> tuple[bool, str]:
         """
         Check if file should be ignored based on patterns OR specific file list.
         Returns (should_ignore, reason)
         """
-        import os
-        from backend.db.models import IgnoredFile
-        
-        filename = os.path.basename(file_path)
-        
         # Check specific ignored files first
-        db = SessionLocal()
-        try:
-            ignored_file = db.query(IgnoredFile).filter(IgnoredFile.file_path == file_path).first()
-            if ignored_file:
-                return True, f"File manually ignored: {ignored_file.reason or 'No reason provided'}"
-        except Exception as e:
-            logger.error(f"Error checking ignored files: {e}")
-        finally:
-            db.close()
+        ignored_paths = self._get_ignored_paths()
+        if file_path in ignored_paths:
+            return True, f"File manually ignored: {ignored_paths[file_path] or 'No reason provided'}"
         
         # Check patterns
-        patterns = IgnoreService.get_ignore_patterns()
-        for pattern in patterns:
-            if fnmatch.fnmatch(filename, pattern):
-                return True, f"Matched pattern: {pattern}"
+        pattern = self._get_matcher().match(os.path.basename(file_path))
+        if pattern is not None:
+            return True, f"Matched pattern: {pattern}"
         
         return False, ""
     
-    @staticmethod
-    def add_ignored_file(file_path: str, reason: str = None) -> bool:
+    def add_ignored_file(self, file_path: str, reason: str = None) -> bool:
         """Add a specific file to the ignore list"""
-        import os
         from backend.db.models import IgnoredFile
         
+        ignored_paths = self._get_ignored_paths()
         db = SessionLocal()
         try:
             # Check if already ignored
@@ -119,6 +145,8 @@ class IgnoreService:
             )
             db.add(ignored_file)
             db.commit()
+            with self._lock:
+                ignored_paths[file_path] = reason
             return True
         except Exception as e:
             logger.error(f"Error adding ignored file: {e}")
@@ -127,17 +155,19 @@ class IgnoreService:
         finally:
             db.close()
     
-    @staticmethod
-    def remove_ignored_file(file_path: str) -> bool:
+    def remove_ignored_file(self, file_path: str) -> bool:
         """Remove a specific file from the ignore list"""
         from backend.db.models import IgnoredFile
         
+        ignored_paths = self._get_ignored_paths()
         db = SessionLocal()
         try:
             ignored_file = db.query(IgnoredFile).filter(IgnoredFile.file_path == file_path).first()
             if ignored_file:
                 db.delete(ignored_file)
                 db.commit()
+            with self._lock:
+                ignored_paths.pop(file_path, None)
             return True
         except Exception as e:
             logger.error(f"Error removing ignored file: {e}")
@@ -172,3 +202,4 @@ class IgnoreService:
         return fnmatch.fnmatch(filename, pattern)
 
 ignore_service = IgnoreService()
+config_service.subscribe(ignore_service.on_config_change)
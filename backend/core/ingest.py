@@ -0,0 +1,158 @@
+"""
+Ingest Engine - Bounded worker pool that processes watcher events off the observer thread
+"""
+from backend.core.config_service import config_service
+from contextlib import contextmanager
+import threading
+import queue
+import time
+from loguru import logger
+
+STAGES = ("probe", "tmdb", "move")
+
+def _int_setting(key: str, default: int) -> int:
+    try:
+        return max(1, int(config_service.get_setting(key, default)))
+    except (TypeError, ValueError):
+        return default
+
+class StageLimits:
+    """Per-stage concurrency limits shared by all ingest workers."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._limits = {}
+        self._in_use = {stage: 0 for stage in STAGES}
+        self._wait_seconds = {stage: 0.0 for stage in STAGES}
+        self.configure({stage: 1 for stage in STAGES})
+
+    def configure(self, limits: dict):
+        with self._lock:
+            for stage, limit in limits.items():
+                self._limits[stage] = limit
+                self._semaphores[stage] = threading.BoundedSemaphore(limit)
+
+    @contextmanager
+    def limit(self, stage: str):
+        semaphore = self._semaphores[stage]
+        started = time.monotonic()
+        semaphore.acquire()
+        with self._lock:
+            self._in_use[stage] += 1
+            self._wait_seconds[stage] += time.monotonic() - started
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_use[stage] -= 1
+            semaphore.release()
+
+    def get_status(self) -> dict:
+        with self._lock:
+            return {
+                stage: {
+                    "limit": self._limits[stage],
+                    "in_use": self._in_use[stage],
+                    "wait_seconds": round(self._wait_seconds[stage], 3)
+                } for stage in STAGES
+            }
+
+stage_limits = StageLimits()
+
+class IngestEngine:
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.workers = []
+        self.handler = None
+        self.is_running = False
+        self._lock = threading.Lock()
+        self.busy = 0
+        self.processed = 0
+        self.failed = 0
+        self._busy_seconds = 0.0
+        self._started_at = None
+
+    def start(self, handler):
+        """
+        Starts the worker pool. handler(path, event_type) runs for every
+        queued file on a worker thread.
+        """
+        self.handler = handler
+        if self.is_running:
+            return
+
+        worker_count = _int_setting("INGEST_WORKERS", 4)
+        stage_limits.configure({
+            "probe": _int_setting("INGEST_PROBE_CONCURRENCY", 2),
+            "tmdb": _int_setting("INGEST_TMDB_CONCURRENCY", 2),
+            "move": _int_setting("INGEST_MOVE_CONCURRENCY", 1),
+        })
+
+        self.is_running = True
+        self._started_at = time.monotonic()
+        self.workers = []
+        for i in range(worker_count):
+            worker = threading.Thread(target=self._worker_loop, daemon=True, name=f"IngestWorker-{i + 1}")
+            worker.start()
+            self.workers.append(worker)
+        logger.info(f"Ingest engine started with {worker_count} workers")
+
+    def stop(self, timeout: float = None):
+        """Stops the workers once the items already queued have been handled."""
+        if not self.is_running:
+            return
+        self.is_running = False
+        for _ in self.workers:
+            self.queue.put(None)
+        for worker in self.workers:
+            worker.join(timeout)
+        self.workers = []
+        logger.info("Ingest engine stopped")
+
+    def submit(self, path: str, event_type: str):
+        """Queues a file for processing."""
+        self.queue.put((path, event_type))
+
+    def _worker_loop(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                self.queue.task_done()
+                break
+
+            path, event_type = item
+            with self._lock:
+                self.busy += 1
+            started = time.monotonic()
+            try:
+                self.handler(path, event_type)
+                with self._lock:
+                    self.processed += 1
+            except Exception as e:
+                logger.error(f"Ingest worker failed on {path}: {e}")
+                with self._lock:
+                    self.failed += 1
+            finally:
+                with self._lock:
+                    self.busy -= 1
+                    self._busy_seconds += time.monotonic() - started
+                self.queue.task_done()
+
+    def get_status(self) -> dict:
+        with self._lock:
+            workers = len(self.workers)
+            uptime = time.monotonic() - self._started_at if self._started_at else 0.0
+            capacity = uptime * workers
+            return {
+                "is_running": self.is_running,
+                "queue_depth": self.queue.qsize(),
+                "workers": workers,
+                "busy_workers": self.busy,
+                "utilization": round(self.busy / workers, 3) if workers else 0.0,
+                "average_utilization": round(self._busy_seconds / capacity, 3) if capacity else 0.0,
+                "processed": self.processed,
+                "failed": self.failed,
+                "stages": stage_limits.get_status()
+            }
+
+ingest_engine = IngestEngine()
@@ -1,36 +1,27 @@
-import subprocess
-import json
+from backend.core.media_probe import MediaInfo, probe_media
 import logging
 import os
 
 logger = logging.getLogger(__name__)
 
-def detect_language(path):
+def detect_language(path, media_info: MediaInfo = None):
     """
     Detects the primary audio language of the file using ffprobe.
     Returns ISO 639-2 language code (e.g., 'mal', 'eng', 'hin', 'tam') or 'und' if undetermined.
+    Pass a MediaInfo from probe_media() to reuse an existing probe.
     """
     try:
-        cmd = [
-            "ffprobe", "-v", "error",
-            "-select_streams", "a",
-            "-show_entries", "stream_tags=language",
-            "-of", "json",
-            path
-        ]
-        # In a real deployed environment, ensure ffprobe is in PATH
-        output = subprocess.check_output(cmd, stderr=subprocess.STDOUT).decode()
-        data = json.loads(output)
-        
-        streams = data.get('streams', [])
-        if not streams:
+        if media_info is None:
+            media_info = probe_media(path)
+        if media_info.error:
+            raise RuntimeError(media_info.error)
+
+        languages = media_info.audio_languages
+        if not languages:
             return 'und'
             
         # Check all audio streams
-        for stream in streams:
-            tags = stream.get('tags', {})
-            lang = tags.get('language', '').lower()
-            
+        for lang in languages:
             if not lang:
                 continue
                 
@@ -59,8 +50,7 @@ def detect_language(path):
             return 'tel'
 
         # If still no known language found, return the first one that wasn't empty or 'und'
-        for stream in streams:
-            lang = stream.get('tags', {}).get('language', '').lower()
+        for lang in languages:
             if lang and lang != 'und':
                 return lang
                 
@@ -69,13 +59,13 @@ def detect_language(path):
         logger.error(f"Language detection failed for {path}: {e}")
         return 'und'
 
-def get_refined_language(path, metadata=None):
+def get_refined_language(path, metadata=None, media_info: MediaInfo = None):
     """
     Combines technical detection, filename keywords, and TMDB metadata
     to find the most accurate language for routing.
     """
     # 1. Technical & Filename detection
-    lang = detect_language(path)
+    lang = detect_language(path, media_info)
     
     # 2. TMDB Fallback if undetermined or English (to verify regional content)
     if (lang == 'und' or lang == 'eng') and metadata:
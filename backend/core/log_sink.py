@@ -0,0 +1,192 @@
+"""
+Log Sink - Buffers watcher/cleanup/error log rows and writes them in bulk transactions
+"""
+from backend.config.settings import settings
+from backend.db.database import SessionLocal
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Rows kept in memory while the database refuses writes; beyond this the oldest are dropped
+MAX_PENDING_ROWS = 20000
+RETRY_BASE_SECONDS = 0.5
+RETRY_MAX_SECONDS = 30.0
+
+def _is_retryable(error: Exception) -> bool:
+    """Lock contention clears up on its own; anything else (bad row, schema) won't."""
+    message = str(error).lower()
+    return isinstance(error, OperationalError) and ("locked" in message or "busy" in message)
+
+class LogSink:
+    """
+    Rows are queued in memory and flushed by a background thread once
+    `batch_size` rows are pending or `flush_interval` seconds have passed,
+    one transaction per flush. A flush that fails because the database is
+    locked is put back at the front of the buffer and retried with backoff.
+    In synchronous mode every write is flushed immediately on the caller's
+    thread (used by tests).
+    """
+    def __init__(self, batch_size: int = 200, flush_interval: float = 1.0, synchronous: bool = False):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.synchronous = synchronous
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._buffer = []
+        self._thread = None
+        self._closed = False
+        self._hooks = []
+        self._versions = {}  # table name -> write version, bumped on every committed change
+        self.rows_written = 0
+        self.rows_dropped = 0
+        self.flushes = 0
+        self.retries = 0
+        self._failures = 0  # Consecutive retryable flush failures
+
+    def add_flush_hook(self, hook):
+        """
+        Registers hook(session, batch) to run inside every flush transaction
+        (e.g. counter rollups). Each hook runs in its own savepoint, so a
+        failing hook is rolled back and logged without costing the log rows.
+        """
+        if hook not in self._hooks:
+            self._hooks.append(hook)
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._closed = False
+            self._thread = threading.Thread(target=self._run, daemon=True, name="LogSinkWriter")
+            self._thread.start()
+
+    def write(self, model, **values):
+        """Queues one row for `model` (a declarative model class)."""
+        if self.synchronous:
+            with self._cond:
+                self._buffer.append((model, values))
+            self.flush()
+            return
+
+        with self._cond:
+            self._buffer.append((model, values))
+            self._ensure_thread()
+            # While backing off, a full batch doesn't cut the wait short
+            if len(self._buffer) >= self.batch_size and not self._failures:
+                self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._failures and not self._closed:
+                    self._cond.wait(min(RETRY_BASE_SECONDS * 2 ** (self._failures - 1), RETRY_MAX_SECONDS))
+                elif not self._buffer and not self._closed:
+                    self._cond.wait(self.flush_interval)
+                elif len(self._buffer) < self.batch_size and not self._closed:
+                    # Give the batch a chance to fill before committing
+                    self._cond.wait(self.flush_interval)
+                closed = self._closed
+            self.flush()
+            if closed:
+                break
+
+    def flush(self) -> int:
+        """Writes everything buffered so far in a single transaction. Returns rows written."""
+        with self._flush_lock:
+            with self._cond:
+                batch, self._buffer = self._buffer, []
+            if not batch:
+                return 0
+
+            # Group by model, preserving order within each table
+            grouped = {}
+            for model, values in batch:
+                grouped.setdefault(model, []).append(values)
+
+            db = SessionLocal()
+            try:
+                for model, rows in grouped.items():
+                    db.execute(insert(model), rows)
+                for hook in self._hooks:
+                    try:
+                        with db.begin_nested():
+                            hook(db, batch)
+                    except Exception as e:
+                        if _is_retryable(e):
+                            raise
+                        logger.error(f"Log flush hook {getattr(hook, '__qualname__', hook)} failed: {e}")
+                db.commit()
+                self.bump_version(*grouped)
+                self.rows_written += len(batch)
+                self.flushes += 1
+                self._failures = 0
+                return len(batch)
+            except Exception as e:
+                db.rollback()
+                if not _is_retryable(e):
+                    logger.error(f"Failed to write {len(batch)} log rows: {e}")
+                    self.rows_dropped += len(batch)
+                    return 0
+                self._requeue(batch)
+                self._failures += 1
+                self.retries += 1
+                logger.warning(f"Database busy, will retry {len(batch)} log rows (attempt {self._failures}): {getattr(e, 'orig', e)}")
+                return 0
+            finally:
+                db.close()
+
+    def _requeue(self, batch: list):
+        """Puts a failed batch back ahead of rows written since, keeping at most MAX_PENDING_ROWS."""
+        with self._cond:
+            pending = batch + self._buffer
+            overflow = len(pending) - MAX_PENDING_ROWS
+            if overflow > 0:
+                logger.error(f"Log buffer full, dropping {overflow} oldest rows")
+                self.rows_dropped += overflow
+                pending = pending[overflow:]
+            self._buffer = pending
+
+    def bump_version(self, *models):
+        """Marks tables as changed (also called by code that deletes log rows directly)."""
+        with self._cond:
+            for model in models:
+                name = model.__tablename__
+                self._versions[name] = self._versions.get(name, 0) + 1
+
+    def version(self, *models) -> tuple:
+        """Write versions of the given tables; equal tuples mean no committed change in between."""
+        with self._cond:
+            return tuple(self._versions.get(model.__tablename__, 0) for model in models)
+
+    def close(self, timeout: float = 10.0):
+        """Flushes pending rows and stops the writer thread (app shutdown)."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+        if thread and thread.is_alive():
+            thread.join(timeout)
+        self.flush()
+
+    def get_status(self) -> dict:
+        with self._cond:
+            pending = len(self._buffer)
+        return {
+            "pending": pending,
+            "rows_written": self.rows_written,
+            "rows_dropped": self.rows_dropped,
+            "flushes": self.flushes,
+            "retries": self.retries,
+            "synchronous": self.synchronous
+        }
+
+log_sink = LogSink(
+    batch_size=settings.LOG_BATCH_SIZE,
+    flush_interval=settings.LOG_FLUSH_INTERVAL_SECONDS,
+    synchronous=settings.LOG_SINK_SYNC
+)
+
+# Counter rollups are written in the same transaction as the log rows
+from backend.core.daily_stats import daily_stats
+log_sink.add_flush_hook(daily_stats.apply)
@@ -0,0 +1,141 @@
+"""
+Log Tail - Reads the end of the application log by seeking backwards in blocks, across loguru-rotated files
+"""
+import asyncio
+import glob
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+LOG_FILE = "/data/filearr.log"
+BLOCK_SIZE = 64 * 1024
+MAX_LINES = 5000
+FOLLOW_POLL_SECONDS = 0.5
+FOLLOW_CHUNK = 256 * 1024
+# since_offset further back than this is served as a plain tail instead
+MAX_SINCE_BYTES = 1024 * 1024
+
+def rotated_files(path: str = LOG_FILE) -> list:
+    """Files loguru rotated away from path (filearr.<timestamp>.log), newest first."""
+    stem, ext = os.path.splitext(path)
+    candidates = [p for p in glob.glob(f"{glob.escape(stem)}.*{ext}") if p != path]
+    candidates.sort(key=lambda p: os.path.getmtime(p) if os.path.exists(p) else 0, reverse=True)
+    return candidates
+
+def _tail_file(path: str, lines: int, stop: int = None) -> tuple:
+    """
+    Returns (lines, reached_start) for the last `lines` lines before byte
+    `stop` (end of file by default), reading backwards BLOCK_SIZE at a time.
+    """
+    with open(path, "rb") as f:
+        end = f.seek(0, os.SEEK_END) if stop is None else stop
+        pos = end
+        data = b""
+        # One extra newline: the block may start mid-line
+        while pos > 0 and data.count(b"\n") <= lines:
+            step = min(BLOCK_SIZE, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    chunks = data.splitlines(keepends=True)
+    if pos > 0:
+        chunks = chunks[1:]
+    found = chunks[-lines:] if lines else []
+    return [c.decode("utf-8", errors="replace") for c in found], pos == 0
+
+def _lines_since(path: str, offset: int, stop: int, lines: int) -> tuple:
+    """
+    Returns (lines, new_offset, skipped) for the complete lines between offset
+    and stop. A half-written last line is left for the next call.
+    """
+    if stop - offset > MAX_SINCE_BYTES:
+        found, _ = _tail_file(path, lines, stop)
+        return found, stop, True
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read(stop - offset)
+    if not data.endswith(b"\n"):
+        data = data[:data.rfind(b"\n") + 1]
+    found = data.decode("utf-8", errors="replace").splitlines(keepends=True)
+    return found, offset + len(data), False
+
+def tail(lines: int = 100, since_offset: int = None, path: str = LOG_FILE) -> dict:
+    """
+    Last `lines` lines of the log. With since_offset (the `offset` returned
+    by a previous call) only lines appended after it are returned, so a
+    poller never re-reads what it has already seen. If the log has rotated
+    since (it is now shorter than since_offset), the remainder of the
+    rotated file is returned first.
+    """
+    lines = max(0, min(lines, MAX_LINES))
+    if not os.path.exists(path):
+        return {"error": "Log file not found"}
+    size = os.path.getsize(path)
+
+    if since_offset is not None:
+        since_offset = max(since_offset, 0)
+        out = []
+        skipped = False
+        rotated = since_offset > size
+        if rotated:
+            previous = rotated_files(path)
+            if previous:
+                prev_size = os.path.getsize(previous[0])
+                if prev_size > since_offset:
+                    out, _, skipped = _lines_since(previous[0], since_offset, prev_size, lines)
+            since_offset = 0
+        found, offset, skipped_now = _lines_since(path, since_offset, size, lines)
+        out.extend(found)
+        # Keep the newest lines when more than `lines` were appended
+        return {"logs": out[-lines:] if lines else [], "offset": offset, "size": size,
+                "rotated": rotated, "truncated": skipped or skipped_now or len(out) > lines}
+
+    out, reached_start = _tail_file(path, lines, size)
+    for previous in rotated_files(path):
+        if len(out) >= lines or not reached_start:
+            break
+        older, reached_start = _tail_file(previous, lines - len(out))
+        out = older + out
+    return {"logs": out, "offset": size, "size": size, "rotated": False, "truncated": False}
+
+async def follow(offset: int = None, path: str = LOG_FILE, is_disconnected=None):
+    """
+    Yields text appended to the log after offset (end of file by default),
+    polling the file size. On rotation (new inode) or truncation the rest of
+    the old file is drained before continuing from the start of the new one.
+    """
+    handle = None
+    try:
+        while handle is None:
+            try:
+                handle = open(path, "rb")
+            except FileNotFoundError:
+                if is_disconnected and await is_disconnected():
+                    return
+                await asyncio.sleep(FOLLOW_POLL_SECONDS)
+        inode = os.fstat(handle.fileno()).st_ino
+        size = os.fstat(handle.fileno()).st_size
+        handle.seek(size if offset is None or offset > size else max(offset, 0))
+
+        while True:
+            data = handle.read(FOLLOW_CHUNK)
+            if data:
+                yield data.decode("utf-8", errors="replace")
+                continue
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                st = None
+            if st is not None and (st.st_ino != inode or st.st_size < handle.tell()):
+                # Rotated or truncated: old handle is fully drained above
+                handle.close()
+                handle = open(path, "rb")
+                inode = os.fstat(handle.fileno()).st_ino
+                continue
+            if is_disconnected and await is_disconnected():
+                return
+            await asyncio.sleep(FOLLOW_POLL_SECONDS)
+    finally:
+        if handle:
+            handle.close()
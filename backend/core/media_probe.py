@@ -0,0 +1,136 @@
+"""
+Media Probe - Single ffprobe pass per file shared by language detection and quality scoring
+"""
+from pydantic import BaseModel
+from typing import List, Optional
+import ffmpeg
+import threading
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+class MediaInfo(BaseModel):
+    path: str
+    streams: List[dict] = []
+    format: dict = {}
+    audio_languages: List[str] = []
+    width: int = 0
+    height: int = 0
+    video_codec: str = ""
+    audio_codec: str = ""
+    audio_channels: int = 0
+    bitrate: int = 0
+    duration: float = 0.0
+    probe_count: int = 0  # ffprobe subprocesses spent on this file
+    error: Optional[str] = None
+
+    @property
+    def video_stream(self) -> Optional[dict]:
+        return next((s for s in self.streams if s.get('codec_type') == 'video'), None)
+
+    @property
+    def audio_stream(self) -> Optional[dict]:
+        return next((s for s in self.streams if s.get('codec_type') == 'audio'), None)
+
+    @property
+    def audio_streams(self) -> List[dict]:
+        return [s for s in self.streams if s.get('codec_type') == 'audio']
+
+class ProbeStats:
+    """Thread-safe counters for probe subprocesses."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.files_probed = 0
+        self.subprocess_calls = 0
+        self.failures = 0
+
+    def record(self, calls: int, failed: bool = False):
+        with self._lock:
+            self.files_probed += 1
+            self.subprocess_calls += calls
+            if failed:
+                self.failures += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            per_file = self.subprocess_calls / self.files_probed if self.files_probed else 0.0
+            return {
+                "files_probed": self.files_probed,
+                "subprocess_calls": self.subprocess_calls,
+                "subprocess_calls_per_file": round(per_file, 3),
+                "failures": self.failures
+            }
+
+probe_stats = ProbeStats()
+
+def _to_int(value) -> int:
+    try:
+        return int(float(value or 0))
+    except (TypeError, ValueError):
+        return 0
+
+def _to_float(value) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+def build_media_info(path: str, data: dict, probe_count: int = 0) -> MediaInfo:
+    """Builds a MediaInfo from raw ffprobe JSON output."""
+    streams = data.get('streams', []) or []
+    fmt = data.get('format', {}) or {}
+    info = MediaInfo(path=path, streams=streams, format=fmt, probe_count=probe_count)
+
+    info.audio_languages = [
+        s.get('tags', {}).get('language', '').lower()
+        for s in info.audio_streams
+    ]
+
+    video = info.video_stream
+    if video:
+        info.width = _to_int(video.get('width'))
+        info.height = _to_int(video.get('height'))
+        info.video_codec = video.get('codec_name', '').lower()
+        info.bitrate = _to_int(video.get('bit_rate')) or _to_int(fmt.get('bit_rate'))
+
+    audio = info.audio_stream
+    if audio:
+        info.audio_codec = audio.get('codec_name', '').lower()
+        info.audio_channels = _to_int(audio.get('channels'))
+
+    info.duration = _to_float(fmt.get('duration'))
+    return info
+
+def probe_media(path: str, use_cache: bool = True) -> MediaInfo:
+    """
+    Runs a single ffprobe pass (streams + format) for the file.
+    Results are cached by file identity, so an unchanged file costs one stat().
+    Never raises: failures are reported through MediaInfo.error.
+    """
+    from backend.core.probe_cache import probe_cache, file_identity
+
+    identity = None
+    if use_cache:
+        try:
+            identity = file_identity(os.stat(path))
+        except OSError:
+            identity = None
+
+    if identity:
+        cached = probe_cache.get(identity, path)
+        if cached is not None:
+            return build_media_info(path, cached, probe_count=0)
+
+    try:
+        # In a real deployed environment, ensure ffprobe is in PATH
+        data = ffmpeg.probe(path)
+        probe_stats.record(1)
+    except Exception as e:
+        logger.error(f"ffprobe failed for {path}: {e}")
+        probe_stats.record(1, failed=True)
+        return MediaInfo(path=path, probe_count=1, error=str(e))
+
+    if identity:
+        probe_cache.put(identity, path, data)
+    return build_media_info(path, data, probe_count=1)
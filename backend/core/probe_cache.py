@@ -0,0 +1,180 @@
+"""
+Probe Cache - Persists ffprobe results keyed by file identity (device, inode, size, mtime)
+"""
+from backend.db.database import SessionLocal
+from backend.db.models import ProbeCacheEntry
+from sqlalchemy.dialects.sqlite import insert
+from datetime import datetime
+import threading
+import json
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+def file_identity(st: os.stat_result) -> tuple:
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+class ProbeCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, identity: tuple, file_path: str = None):
+        """
+        Returns the cached raw ffprobe dict for a file identity, or None.
+        A hit under a new path (renamed or moved in place) records that path,
+        so eviction keeps following the file.
+        """
+        device, inode, size, mtime_ns = identity
+        db = SessionLocal()
+        try:
+            entry = db.query(ProbeCacheEntry).filter(
+                ProbeCacheEntry.device == device,
+                ProbeCacheEntry.inode == inode,
+                ProbeCacheEntry.size == size,
+                ProbeCacheEntry.mtime_ns == mtime_ns
+            ).first()
+            self._count(entry is not None)
+            if not entry:
+                return None
+            if file_path and entry.file_path != file_path:
+                entry.file_path = file_path
+                db.commit()
+            return json.loads(entry.data)
+        except Exception as e:
+            logger.error(f"Error reading probe cache: {e}")
+            self._count(False)
+            return None
+        finally:
+            db.close()
+
+    def put(self, identity: tuple, file_path: str, data: dict) -> bool:
+        device, inode, size, mtime_ns = identity
+        db = SessionLocal()
+        try:
+            # Upsert: the same file may be probed by two workers at once
+            stmt = insert(ProbeCacheEntry).values(
+                device=device, inode=inode, size=size, mtime_ns=mtime_ns,
+                file_path=file_path, data=json.dumps(data), created_at=datetime.utcnow()
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["device", "inode", "size", "mtime_ns"],
+                set_={"file_path": stmt.excluded.file_path, "data": stmt.excluded.data}
+            )
+            db.execute(stmt)
+            db.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Error writing probe cache for {file_path}: {e}")
+            db.rollback()
+            return False
+        finally:
+            db.close()
+
+    def relocate(self, src: str, dest: str) -> int:
+        """Points entries stored under src at dest after a rename that kept the file's identity."""
+        db = SessionLocal()
+        try:
+            moved = db.query(ProbeCacheEntry).filter(ProbeCacheEntry.file_path == src).update(
+                {"file_path": dest}, synchronize_session=False
+            )
+            db.commit()
+            return moved
+        except Exception as e:
+            logger.error(f"Error relocating probe cache entry {src} -> {dest}: {e}")
+            db.rollback()
+            return 0
+        finally:
+            db.close()
+
+    def evict_missing(self, batch_size: int = 500) -> int:
+        """
+        Removes entries whose file no longer exists at its last known path
+        or whose identity no longer matches. Returns the number removed.
+        """
+        removed = 0
+        last_id = 0
+        db = SessionLocal()
+        try:
+            while True:
+                rows = db.query(
+                    ProbeCacheEntry.id, ProbeCacheEntry.file_path,
+                    ProbeCacheEntry.device, ProbeCacheEntry.inode,
+                    ProbeCacheEntry.size, ProbeCacheEntry.mtime_ns
+                ).filter(ProbeCacheEntry.id > last_id).order_by(ProbeCacheEntry.id).limit(batch_size).all()
+                if not rows:
+                    break
+                last_id = rows[-1].id
+
+                stale = []
+                for row in rows:
+                    try:
+                        st = os.stat(row.file_path)
+                    except OSError:
+                        stale.append(row.id)
+                        continue
+                    if file_identity(st) != (row.device, row.inode, row.size, row.mtime_ns):
+                        stale.append(row.id)
+
+                if stale:
+                    db.query(ProbeCacheEntry).filter(ProbeCacheEntry.id.in_(stale)).delete(synchronize_session=False)
+                    db.commit()
+                    removed += len(stale)
+        except Exception as e:
+            logger.error(f"Error evicting probe cache: {e}")
+            db.rollback()
+        finally:
+            db.close()
+
+        with self._lock:
+            self.evicted += removed
+        if removed:
+            logger.info(f"Probe cache: evicted {removed} stale entries")
+        return removed
+
+    def clear(self) -> int:
+        db = SessionLocal()
+        try:
+            removed = db.query(ProbeCacheEntry).delete(synchronize_session=False)
+            db.commit()
+            return removed
+        except Exception as e:
+            logger.error(f"Error clearing probe cache: {e}")
+            db.rollback()
+            return 0
+        finally:
+            db.close()
+
+    def get_counters(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evicted": self.evicted
+            }
+
+    def get_stats(self) -> dict:
+        """Counters plus the number of stored entries."""
+        db = SessionLocal()
+        try:
+            entries = db.query(ProbeCacheEntry).count()
+        except Exception as e:
+            logger.error(f"Error counting probe cache entries: {e}")
+            entries = None
+        finally:
+            db.close()
+        return {"entries": entries, **self.get_counters()}
+
+probe_cache = ProbeCache()
@@ -1,9 +1,10 @@
 from backend.core.cam_detector import is_cam
-from backend.core.language import detect_language
 from backend.core.quality import get_quality_score
 from backend.core.decision import decide
 from backend.core.file_ops import move_file, rejection_move
 from backend.core.tmdb import get_movie_metadata
+from backend.core.media_probe import probe_media
+from backend.core.ingest import stage_limits
 from loguru import logger
 import os
 
@@ -13,32 +14,40 @@ def process_file(path):
 
     # 1. Check if CAM/TS
     if is_cam(filename):
-        rejection_move(path, "CAM/TS detected")
+        with stage_limits.limit("move"):
+            rejection_move(path, "CAM/TS detected")
         return {"status": "rejected", "reason": "CAM/TS detected"}
 
     # 2. Get Metadata
-    metadata = get_movie_metadata(filename)
+    with stage_limits.limit("tmdb"):
+        metadata = get_movie_metadata(filename)
     if not metadata:
         logger.warning(f"Could not identify movie for {filename}")
         # Optionally move to manual review folder or skip
         return {"status": "skipped", "reason": "Movie metadata not found"}
 
-    # 3. Detect Language & Quality
+    # 3. Detect Language & Quality (single ffprobe pass shared by both)
     from backend.core.language import get_refined_language
-    language = get_refined_language(path, metadata)
-    quality = get_quality_score(path)
+    with stage_limits.limit("probe"):
+        media_info = probe_media(path)
+    language = get_refined_language(path, metadata, media_info)
+    quality = get_quality_score(path, media_info)
 
-    logger.info(f"Analyzed {filename}: Movie={metadata['title']} ({metadata['year']}), Lang={language}, Quality={quality}")
+    logger.info(f"Analyzed {filename}: Movie={metadata['title']} ({metadata['year']}), Lang={language}, Quality={quality}, Probes={media_info.probe_count}")
 
     # 4. Make Decision
     decision = decide(path, language, quality, False, metadata)
 
     # 5. Execute Decision
     if decision.action == "move":
-        move_file(path, decision.destination)
-        return {"status": "processed", "reason": f"Moved to {os.path.basename(os.path.dirname(decision.destination))}"}
+        with stage_limits.limit("move"):
+            result = move_file(path, decision.destination, decision.placement)
+        if not result:
+            return {"status": "failed", "reason": f"Placement failed ({result.placement}): {result.error}"}
+        return {"status": "processed", "reason": f"Moved to {os.path.basename(os.path.dirname(decision.destination))} ({result.placement})"}
     elif decision.action == "reject":
-        rejection_move(path, decision.reason)
+        with stage_limits.limit("move"):
+            rejection_move(path, decision.reason)
         return {"status": "rejected", "reason": decision.reason}
     else:
         logger.info(f"Decision for {filename}: {decision.action} - {decision.reason}")
@@ -1,20 +1,24 @@
-import ffmpeg
+from backend.core.media_probe import MediaInfo, probe_media
 import re
 
-def get_quality_score(path):
+def get_quality_score(path, media_info: MediaInfo = None):
     score = 0
     try:
-        probe = ffmpeg.probe(path)
-        video_stream = next((stream for stream in probe['streams'] if stream['codec_type'] == 'video'), None)
-        audio_stream = next((stream for stream in probe['streams'] if stream['codec_type'] == 'audio'), None)
+        if media_info is None:
+            media_info = probe_media(path)
+        if media_info.error:
+            raise RuntimeError(media_info.error)
+
+        video_stream = media_info.video_stream
+        audio_stream = media_info.audio_stream
 
         if not video_stream:
             return 0
             
-        width = int(video_stream.get('width', 0))
-        height = int(video_stream.get('height', 0))
-        codec = video_stream.get('codec_name', '').lower()
-        bitrate = int(video_stream.get('bit_rate', 0) or probe['format'].get('bit_rate', 0))
+        width = media_info.width
+        height = media_info.height
+        codec = media_info.video_codec
+        bitrate = media_info.bitrate
 
         # Resolution Scoring (35%)
         if width >= 3840 or height >= 2160: # 4K
@@ -36,8 +40,8 @@ def get_quality_score(path):
 
         # Audio Scoring (20%)
         if audio_stream:
-            audio_codec = audio_stream.get('codec_name', '').lower()
-            channels = int(audio_stream.get('channels', 0))
+            audio_codec = media_info.audio_codec
+            channels = media_info.audio_channels
             
             if 'dts' in audio_codec or 'truehd' in audio_codec or 'eac3' in audio_codec:
                  score += 20
@@ -0,0 +1,310 @@
+"""
+Log Retention - Archives old log rows and cleanup runs to gzipped JSONL, deletes them and reclaims space
+"""
+from backend.config.settings import settings
+from backend.db.database import SessionLocal, engine
+from backend.db.models import WatcherLog, CleanupLog, ErrorLog, CleanupRun, CleanupRunFile
+from backend.core.log_sink import log_sink
+from sqlalchemy import select, delete, and_, or_, false
+from datetime import datetime, timedelta
+from typing import NamedTuple
+import threading
+import gzip
+import json
+import time
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 5000
+FIRST_RUN_DELAY_SECONDS = 300
+
+class RetentionPolicy(NamedTuple):
+    model: type
+    days: int  # 0 disables the age limit
+    max_rows: int  # 0 disables the row limit
+    time_column: str = "timestamp"
+    keep_statuses: tuple = ()  # Rows in these states are never pruned
+    children: tuple = ()  # (model, foreign key column): rows archived and deleted with their parent
+
+def _policies() -> list:
+    return [
+        RetentionPolicy(WatcherLog, settings.RETENTION_WATCHER_DAYS, settings.RETENTION_WATCHER_MAX_ROWS),
+        RetentionPolicy(CleanupLog, settings.RETENTION_CLEANUP_DAYS, settings.RETENTION_CLEANUP_MAX_ROWS),
+        RetentionPolicy(ErrorLog, settings.RETENTION_ERROR_DAYS, settings.RETENTION_ERROR_MAX_ROWS),
+        RetentionPolicy(
+            CleanupRun, settings.RETENTION_RUNS_DAYS, settings.RETENTION_RUNS_MAX_ROWS,
+            time_column="started_at",
+            # A run in progress is still writing its file rows; resumable runs age out like finished ones
+            keep_statuses=("running",),
+            children=((CleanupRunFile, "run_id"),)
+        ),
+    ]
+
+def _db_file() -> str:
+    url = settings.DATABASE_URL
+    if not url.startswith("sqlite:///") or ":memory:" in url:
+        return None
+    return url[len("sqlite:///"):]
+
+AUTO_VACUUM_MODES = {0: "none", 1: "full", 2: "incremental"}
+
+def _db_bytes() -> int:
+    """Size of the main database (page_count * page_size); the WAL is reported separately."""
+    with engine.connect() as conn:
+        page_count = conn.exec_driver_sql("PRAGMA page_count").scalar()
+        page_size = conn.exec_driver_sql("PRAGMA page_size").scalar()
+    return page_count * page_size
+
+def _wal_bytes(path: str) -> int:
+    try:
+        return os.path.getsize(path + "-wal") if path else 0
+    except OSError:
+        return 0
+
+def _jsonable(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+class RetentionService:
+    def __init__(self):
+        self._run_lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self.last_report = None
+        self._conversion_warned = False
+
+    @property
+    def archive_dir(self) -> str:
+        return os.path.join(settings.DATA_DIR, "archive")
+
+    def _archive(self, table: str, rows: list, time_column: str = "timestamp") -> int:
+        """Appends rows to <archive>/<table>/<day>.jsonl.gz (one gzip member per batch). Returns bytes written."""
+        by_day = {}
+        for row in rows:
+            stamp = row.get(time_column)
+            day = stamp.strftime("%Y-%m-%d") if stamp else "undated"
+            by_day.setdefault(day, []).append(row)
+
+        table_dir = os.path.join(self.archive_dir, table)
+        os.makedirs(table_dir, exist_ok=True)
+        written = 0
+        for day, day_rows in by_day.items():
+            path = os.path.join(table_dir, f"{day}.jsonl.gz")
+            before = os.path.getsize(path) if os.path.exists(path) else 0
+            with gzip.open(path, "at", encoding="utf-8") as f:
+                for row in day_rows:
+                    f.write(json.dumps({k: _jsonable(v) for k, v in row.items()}) + "\n")
+            written += os.path.getsize(path) - before
+        return written
+
+    def _prune_table(self, policy: RetentionPolicy) -> dict:
+        table = policy.model.__table__
+        conditions = []
+        db = SessionLocal()
+        try:
+            if policy.days > 0:
+                conditions.append(table.c[policy.time_column] < datetime.utcnow() - timedelta(days=policy.days))
+            if policy.max_rows > 0:
+                # Newest id that falls outside the newest max_rows rows
+                cap_id = db.execute(
+                    select(table.c.id).order_by(table.c.id.desc()).offset(policy.max_rows).limit(1)
+                ).scalar()
+                if cap_id is not None:
+                    conditions.append(table.c.id <= cap_id)
+            condition = or_(*conditions) if conditions else false()
+            if policy.keep_statuses:
+                condition = and_(condition, table.c.status.notin_(policy.keep_statuses))
+
+            removed = 0
+            archived_bytes = 0
+            children = {child.__tablename__: 0 for child, _ in policy.children}
+            while not self._stop.is_set():
+                rows = db.execute(
+                    select(table).where(condition).order_by(table.c.id).limit(BATCH_SIZE)
+                ).mappings().all()
+                if not rows:
+                    break
+                ids = [r["id"] for r in rows]
+                # Children first, so a crash never leaves rows pointing at a deleted parent
+                for child, foreign_key in policy.children:
+                    child_removed, child_bytes = self._prune_children(db, child, foreign_key, ids)
+                    children[child.__tablename__] += child_removed
+                    archived_bytes += child_bytes
+                # Archive first: a crash in between leaves a duplicate in the archive, never a lost row
+                archived_bytes += self._archive(table.name, [dict(r) for r in rows], policy.time_column)
+                db.execute(delete(table).where(table.c.id.in_(ids)))
+                db.commit()
+                log_sink.bump_version(policy.model)
+                removed += len(rows)
+            result = {"rows_removed": removed + sum(children.values()), "archived_bytes": archived_bytes}
+            if children:
+                result["child_rows_removed"] = children
+            return result
+        except Exception as e:
+            logger.error(f"Retention failed for {table.name}: {e}")
+            db.rollback()
+            return {"rows_removed": 0, "archived_bytes": 0, "error": str(e)}
+        finally:
+            db.close()
+
+    def _prune_children(self, db, model, foreign_key: str, parent_ids: list) -> tuple:
+        """Archives and deletes every row of model that belongs to parent_ids. Returns (rows, bytes)."""
+        table = model.__table__
+        removed = 0
+        archived_bytes = 0
+        while True:
+            rows = db.execute(
+                select(table).where(table.c[foreign_key].in_(parent_ids)).order_by(table.c.id).limit(BATCH_SIZE)
+            ).mappings().all()
+            if not rows:
+                return removed, archived_bytes
+            archived_bytes += self._archive(table.name, [dict(r) for r in rows])
+            db.execute(delete(table).where(table.c.id.in_([r["id"] for r in rows])))
+            db.commit()
+            removed += len(rows)
+
+    def _vacuum(self) -> dict:
+        """
+        Returns free pages to the filesystem. Databases created before
+        incremental auto-vacuum was enabled are left alone until an admin runs
+        convert_auto_vacuum(): the full VACUUM it needs holds the write lock
+        for as long as it takes to rewrite the file.
+        """
+        result = {"auto_vacuum": None, "pages_freed": 0}
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            mode = conn.exec_driver_sql("PRAGMA auto_vacuum").scalar()
+            result["auto_vacuum"] = AUTO_VACUUM_MODES.get(mode, str(mode))
+            if mode != 2:
+                if not self._conversion_warned:
+                    logger.warning("Database is not in incremental auto-vacuum mode; freed pages stay in the file "
+                                   "until POST /api/maintenance/vacuum/convert is run")
+                    self._conversion_warned = True
+                result["conversion_required"] = True
+                conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+                return result
+            free_pages = conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+            # cursor.execute() steps the pragma once and frees a single page;
+            # executescript() runs it to completion
+            conn.connection.dbapi_connection.executescript("PRAGMA incremental_vacuum;")
+            result["pages_freed"] = free_pages - conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+            conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+        return result
+
+    def run(self) -> dict:
+        """Applies every policy, vacuums, and returns (and keeps) a report."""
+        if not self._run_lock.acquire(blocking=False):
+            return {"status": "busy", "message": "Retention is already running"}
+        try:
+            started = time.monotonic()
+            db_file = _db_file()
+            bytes_before = _db_bytes() if db_file else 0
+            tables = {p.model.__tablename__: self._prune_table(p) for p in _policies()}
+
+            vacuum = {}
+            wal_before = _wal_bytes(db_file)
+            if db_file:
+                try:
+                    vacuum = self._vacuum()
+                except Exception as e:
+                    logger.error(f"Incremental vacuum failed: {e}")
+                    vacuum = {"error": str(e)}
+
+            bytes_after = _db_bytes() if db_file else 0
+            report = {
+                "status": "success",
+                "finished_at": datetime.utcnow().isoformat(),
+                "duration_seconds": round(time.monotonic() - started, 2),
+                "tables": tables,
+                "rows_removed": sum(t["rows_removed"] for t in tables.values()),
+                "archived_bytes": sum(t["archived_bytes"] for t in tables.values()),
+                "db_bytes_before": bytes_before,
+                "db_bytes_after": bytes_after,
+                "bytes_reclaimed": max(bytes_before - bytes_after, 0),
+                "wal_bytes_truncated": max(wal_before - _wal_bytes(db_file), 0),
+                "vacuum": vacuum
+            }
+            self.last_report = report
+            logger.info(f"Retention removed {report['rows_removed']} rows, archived {report['archived_bytes']} bytes, "
+                        f"reclaimed {report['bytes_reclaimed']} bytes in {report['duration_seconds']}s")
+            return report
+        finally:
+            self._run_lock.release()
+
+    def convert_auto_vacuum(self) -> dict:
+        """
+        One-time switch to incremental auto-vacuum. Rewrites the whole file
+        with a full VACUUM, blocking every writer until it finishes, so it
+        only runs when an admin asks for it.
+        """
+        db_file = _db_file()
+        if not db_file:
+            return {"status": "error", "message": "Only file-backed SQLite databases can be converted"}
+        if not self._run_lock.acquire(blocking=False):
+            return {"status": "busy", "message": "Retention is already running"}
+        try:
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                if conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() == 2:
+                    return {"status": "success", "message": "Incremental auto-vacuum is already enabled", "converted": False}
+                started = time.monotonic()
+                bytes_before = _db_bytes()
+                logger.warning(f"Converting {db_file} ({bytes_before} bytes) to incremental auto-vacuum; "
+                               f"writes are blocked until the full VACUUM finishes")
+                # Buffered log rows would otherwise wait out the VACUUM and hit the busy timeout
+                log_sink.flush()
+                conn.exec_driver_sql("PRAGMA auto_vacuum=INCREMENTAL")
+                conn.exec_driver_sql("VACUUM")
+                conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+            result = {
+                "status": "success",
+                "converted": True,
+                "duration_seconds": round(time.monotonic() - started, 2),
+                "db_bytes_before": bytes_before,
+                "db_bytes_after": _db_bytes()
+            }
+            logger.info(f"Incremental auto-vacuum enabled in {result['duration_seconds']}s")
+            return result
+        finally:
+            self._run_lock.release()
+
+    def start(self):
+        """Runs retention in the background every RETENTION_INTERVAL_HOURS."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="LogRetention")
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Stops the schedule; a prune in progress ends after its current batch."""
+        self._stop.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def _loop(self):
+        delay = FIRST_RUN_DELAY_SECONDS
+        while not self._stop.wait(delay):
+            try:
+                self.run()
+            except Exception as e:
+                logger.error(f"Scheduled retention failed: {e}")
+            delay = max(settings.RETENTION_INTERVAL_HOURS, 0.1) * 3600
+
+    def get_status(self) -> dict:
+        auto_vacuum = None
+        if _db_file():
+            with engine.connect() as conn:
+                mode = conn.exec_driver_sql("PRAGMA auto_vacuum").scalar()
+            auto_vacuum = AUTO_VACUUM_MODES.get(mode, str(mode))
+        return {
+            "policies": {
+                p.model.__tablename__: {"days": p.days, "max_rows": p.max_rows} for p in _policies()
+            },
+            "interval_hours": settings.RETENTION_INTERVAL_HOURS,
+            "archive_dir": self.archive_dir,
+            "auto_vacuum": auto_vacuum,
+            "running": self._run_lock.locked(),
+            "last_report": self.last_report
+        }
+
+retention_service = RetentionService()
@@ -0,0 +1,117 @@
+"""
+Scan Index - Per-path size/mtime/status used by the periodic scan to find new or changed files
+"""
+from backend.db.database import SessionLocal
+from backend.db.models import ScanState, WatcherLog
+from sqlalchemy.dialects.sqlite import insert
+from datetime import datetime
+from typing import NamedTuple, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+STATUS_QUEUED = "queued"
+# Matched an ignore rule; the scan re-checks the rule before skipping these
+STATUS_IGNORED = "ignored"
+BATCH_SIZE = 500
+
+class FileState(NamedTuple):
+    size: Optional[int]
+    mtime_ns: Optional[int]
+    status: str
+
+class ScanIndex:
+    def load(self) -> dict:
+        """Bulk-loads the whole index as {file_path: FileState}."""
+        db = SessionLocal()
+        try:
+            if db.query(ScanState.file_path).first() is None:
+                self._seed_from_watcher_logs(db)
+            return {
+                row.file_path: FileState(row.size, row.mtime_ns, row.status)
+                for row in db.query(ScanState.file_path, ScanState.size, ScanState.mtime_ns, ScanState.status)
+            }
+        except Exception as e:
+            logger.error(f"Error loading scan index: {e}")
+            return {}
+        finally:
+            db.close()
+
+    def _seed_from_watcher_logs(self, db):
+        """
+        One-time migration: paths the old scan would have skipped (anything in
+        watcher_logs) start out as known with unknown size/mtime.
+        """
+        paths = [row[0] for row in db.query(WatcherLog.file_path).distinct() if row[0]]
+        if not paths:
+            return
+        now = datetime.utcnow()
+        for i in range(0, len(paths), BATCH_SIZE):
+            db.execute(insert(ScanState).prefix_with("OR IGNORE"), [
+                {"file_path": p, "size": None, "mtime_ns": None, "status": "seeded", "updated_at": now}
+                for p in paths[i:i + BATCH_SIZE]
+            ])
+        db.commit()
+        logger.info(f"Scan index seeded with {len(paths)} paths from watcher logs")
+
+    @staticmethod
+    def needs_processing(state: Optional[FileState], size: int, mtime_ns: int) -> bool:
+        if state is None or state.status == STATUS_QUEUED:
+            return True
+        if state.size is None:
+            # Seeded entry: known file, just record its identity
+            return False
+        return (state.size, state.mtime_ns) != (size, mtime_ns)
+
+    def bulk_record(self, rows: list) -> int:
+        """Upserts (file_path, size, mtime_ns, status) tuples in one transaction."""
+        if not rows:
+            return 0
+        now = datetime.utcnow()
+        db = SessionLocal()
+        try:
+            for i in range(0, len(rows), BATCH_SIZE):
+                stmt = insert(ScanState)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[ScanState.file_path],
+                    set_={
+                        "size": stmt.excluded.size,
+                        "mtime_ns": stmt.excluded.mtime_ns,
+                        "status": stmt.excluded.status,
+                        "updated_at": stmt.excluded.updated_at
+                    }
+                )
+                db.execute(stmt, [
+                    {"file_path": p, "size": size, "mtime_ns": mtime_ns, "status": status, "updated_at": now}
+                    for p, size, mtime_ns, status in rows[i:i + BATCH_SIZE]
+                ])
+            db.commit()
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Error writing scan index: {e}")
+            db.rollback()
+            return 0
+        finally:
+            db.close()
+
+    def record(self, file_path: str, size: Optional[int], mtime_ns: Optional[int], status: str) -> bool:
+        return self.bulk_record([(file_path, size, mtime_ns, status)]) == 1
+
+    def prune(self, paths: list) -> int:
+        """Deletes index entries for files that are no longer present."""
+        if not paths:
+            return 0
+        db = SessionLocal()
+        try:
+            for i in range(0, len(paths), BATCH_SIZE):
+                db.query(ScanState).filter(ScanState.file_path.in_(paths[i:i + BATCH_SIZE])).delete(synchronize_session=False)
+            db.commit()
+            return len(paths)
+        except Exception as e:
+            logger.error(f"Error pruning scan index: {e}")
+            db.rollback()
+            return 0
+        finally:
+            db.close()
+
+scan_index = ScanIndex()
@@ -0,0 +1,170 @@
+"""
+Stability Tracker - Holds new files back until they stop changing, then releases them to the ingest engine
+"""
+from backend.core.config_service import config_service
+from dataclasses import dataclass
+import threading
+import heapq
+import time
+import os
+from loguru import logger
+
+# After a close-write event the file only has to stay unchanged this long
+CLOSE_WRITE_GRACE_SECONDS = 1.0
+INITIAL_POLL_SECONDS = 1.0
+
+def _float_setting(key: str, default: float) -> float:
+    try:
+        return max(0.0, float(config_service.get_setting(key, default)))
+    except (TypeError, ValueError):
+        return default
+
+@dataclass
+class PendingFile:
+    path: str
+    event_type: str
+    size: int = -1
+    mtime_ns: int = -1
+    stable_since: float = 0.0
+    interval: float = INITIAL_POLL_SECONDS
+    closed: bool = False
+    preexisting: bool = False  # Scan found it with an old mtime; one unchanged re-poll confirms it
+    generation: int = 0  # Bumped on reschedule so stale heap entries are skipped
+
+class StabilityTracker:
+    """
+    Tracks many pending files from a single thread. Each file is polled
+    (size + mtime) with exponential backoff while it keeps changing and is
+    released once it has been quiescent for STABILITY_QUIET_SECONDS, or
+    shortly after a close-write event on platforms that report one. Nothing
+    is released on its first stat.
+    """
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._pending = {}
+        self._heap = []
+        self._seq = 0
+        self._thread = None
+        self.on_stable = None
+        self.on_dropped = None
+        self.released = 0
+        self.dropped = 0
+
+    def start(self, on_stable, on_dropped=None):
+        """
+        on_stable(path, event_type) is called from the tracker thread for each
+        released file, on_dropped(path) for files that vanished while settling.
+        """
+        with self._cond:
+            self.on_stable = on_stable
+            self.on_dropped = on_dropped
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, daemon=True, name="StabilityTracker")
+            self._thread.start()
+
+    def _schedule(self, pending: PendingFile, when: float):
+        pending.generation += 1
+        self._seq += 1
+        heapq.heappush(self._heap, (when, self._seq, pending.path, pending.generation))
+        self._cond.notify()
+
+    def track(self, path: str, event_type: str):
+        with self._cond:
+            pending = self._pending.get(path)
+            if pending:
+                # Still settling; a later event just restarts the quiet window
+                pending.stable_since = time.monotonic()
+                pending.closed = False
+                pending.preexisting = False
+                return
+            pending = PendingFile(path=path, event_type=event_type)
+            self._pending[path] = pending
+            self._schedule(pending, time.monotonic())
+
+    def mark_closed(self, path: str):
+        """Close-write notification: the writer is done, confirm after a short grace period."""
+        with self._cond:
+            pending = self._pending.get(path)
+            if not pending:
+                return
+            pending.closed = True
+            self._schedule(pending, time.monotonic() + CLOSE_WRITE_GRACE_SECONDS)
+
+    def forget(self, path: str):
+        with self._cond:
+            if self._pending.pop(path, None):
+                self.dropped += 1
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._heap or self._heap[0][0] > time.monotonic():
+                    timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+                    self._cond.wait(timeout)
+                _, _, path, generation = heapq.heappop(self._heap)
+                pending = self._pending.get(path)
+                if not pending or pending.generation != generation:
+                    continue
+
+            try:
+                st = os.stat(path)
+            except OSError:
+                logger.info(f"Pending file disappeared before it settled: {path}")
+                self.forget(path)
+                if self.on_dropped:
+                    self.on_dropped(path)
+                continue
+
+            release = False
+            with self._cond:
+                if self._pending.get(path) is not pending:
+                    continue
+                now = time.monotonic()
+                quiet = _float_setting("STABILITY_QUIET_SECONDS", 5.0)
+                max_interval = _float_setting("STABILITY_MAX_INTERVAL_SECONDS", 30.0)
+
+                if (st.st_size, st.st_mtime_ns) != (pending.size, pending.mtime_ns):
+                    first_check = pending.size < 0
+                    pending.size, pending.mtime_ns = st.st_size, st.st_mtime_ns
+                    if first_check:
+                        # An old mtime proves nothing on its own (cp -p, rsync and
+                        # preallocating downloaders preset it), so even files the
+                        # scan found sitting there need one unchanged re-poll
+                        pending.preexisting = pending.event_type == "scan" and time.time() - st.st_mtime >= quiet
+                    else:
+                        # Written to after the close-write, keep polling with backoff
+                        pending.closed = False
+                        pending.preexisting = False
+                        pending.interval = min(pending.interval * 2, max_interval)
+                    pending.stable_since = now
+                    delay = CLOSE_WRITE_GRACE_SECONDS if pending.closed else pending.interval
+                    self._schedule(pending, now + delay)
+                else:
+                    required = CLOSE_WRITE_GRACE_SECONDS if pending.closed or pending.preexisting else quiet
+                    if now - pending.stable_since >= required:
+                        release = True
+                    else:
+                        self._schedule(pending, pending.stable_since + required)
+
+                if release:
+                    del self._pending[path]
+                    self.released += 1
+                on_stable = self.on_stable
+
+            if release:
+                logger.info(f"File is stable, releasing to pipeline: {path}")
+                try:
+                    on_stable(path, pending.event_type)
+                except Exception as e:
+                    logger.error(f"Failed to release stable file {path}: {e}")
+
+    def get_status(self) -> dict:
+        with self._cond:
+            return {
+                "pending": len(self._pending),
+                "released": self.released,
+                "dropped": self.dropped
+            }
+
+stability_tracker = StabilityTracker()
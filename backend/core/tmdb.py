@@ -1,6 +1,7 @@
 import tmdbsimple as tmdb
 from guessit import guessit
 from backend.core.config_service import config_service
+from backend.core.tmdb_cache import tmdb_cache, make_cache_key, STATUS_HIT, STATUS_MISS, STATUS_ERROR
 import logging
 
 logger = logging.getLogger(__name__)
@@ -24,16 +25,40 @@ def test_tmdb_api(api_key):
         logger.error(f"TMDB validation failed: {e}")
         return False, str(e)
 
+def on_config_change(snapshot, changed_keys):
+    """Config subscriber: cached TMDB errors were most likely caused by the old key."""
+    if "TMDB_API_KEY" in changed_keys:
+        tmdb_cache.purge(status=STATUS_ERROR)
+
+config_service.subscribe(on_config_change)
+
 def get_movie_metadata(filename):
-    tmdb_key = config_service.get_setting("TMDB_API_KEY")
-    if tmdb_key:
-        tmdb.API_KEY = tmdb_key
     guess = guessit(filename)
     title = guess.get('title')
     year = guess.get('year')
     
     if not title:
         return None
+
+    # Fallback to guessit info if TMDB fails or no key
+    fallback = {
+        'title': title,
+        'year': str(year) if year else "Unknown",
+        'tmdb_id': None
+    }
+
+    # Serve repeated releases of the same film (and known misses) from the cache
+    cache_key = make_cache_key(title, year)
+    cached = tmdb_cache.get(cache_key)
+    if cached:
+        status, data = cached
+        if status == STATUS_HIT and data:
+            return data
+        return fallback
+
+    tmdb_key = config_service.get_setting("TMDB_API_KEY")
+    if tmdb_key:
+        tmdb.API_KEY = tmdb_key
         
     try:
         search = tmdb.Search()
@@ -41,7 +66,7 @@ def get_movie_metadata(filename):
         if response['results']:
             # Return first result
             result = response['results'][0]
-            return {
+            metadata = {
                 'title': result['title'],
                 'year': result['release_date'][:4] if result.get('release_date') else year,
                 'tmdb_id': result['id'],
@@ -49,12 +74,11 @@ def get_movie_metadata(filename):
                 'poster_path': result['poster_path'],
                 'original_language': result.get('original_language', 'und')
             }
+            tmdb_cache.put(cache_key, title, year, STATUS_HIT, metadata)
+            return metadata
+        tmdb_cache.put(cache_key, title, year, STATUS_MISS)
     except Exception as e:
         logger.error(f"TMDB lookup failed for {filename}: {e}")
+        tmdb_cache.put(cache_key, title, year, STATUS_ERROR, str(e))
         
-    # Fallback to guessit info if TMDB fails or no key
-    return {
-        'title': title,
-        'year': str(year) if year else "Unknown",
-        'tmdb_id': None
-    }
+    return fallback
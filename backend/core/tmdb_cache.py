@@ -0,0 +1,169 @@
+"""
+TMDB Cache - Stores TMDB search results keyed by normalized (title, year), including negative results
+"""
+from backend.db.database import SessionLocal
+from backend.db.models import TmdbCacheEntry
+from backend.core.config_service import config_service
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert
+import threading
+import json
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+STATUS_HIT = "hit"
+STATUS_MISS = "miss"
+STATUS_ERROR = "error"
+
+def make_cache_key(title: str, year=None) -> str:
+    """Normalizes a guessit title/year pair into a cache key."""
+    normalized = re.sub(r"[^\w]+", " ", str(title).lower()).strip()
+    return f"{normalized}|{year or ''}"
+
+def _int_setting(key: str, default: int) -> int:
+    try:
+        return int(config_service.get_setting(key, default))
+    except (TypeError, ValueError):
+        return default
+
+class TmdbCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _ttl(self, status: str) -> timedelta:
+        if status == STATUS_HIT:
+            return timedelta(hours=_int_setting("TMDB_CACHE_TTL_HOURS", 168))
+        if status == STATUS_MISS:
+            return timedelta(hours=_int_setting("TMDB_CACHE_MISS_TTL_HOURS", 24))
+        return timedelta(minutes=_int_setting("TMDB_CACHE_ERROR_TTL_MINUTES", 15))
+
+    def get(self, key: str):
+        """
+        Returns (status, data) for a live cache entry, or None if absent/expired.
+        data is the metadata dict for hits and None otherwise.
+        """
+        db = SessionLocal()
+        try:
+            entry = db.query(TmdbCacheEntry).filter(
+                TmdbCacheEntry.cache_key == key,
+                TmdbCacheEntry.expires_at > datetime.utcnow()
+            ).first()
+            with self._lock:
+                if entry:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+            if not entry:
+                return None
+            data = json.loads(entry.data) if entry.status == STATUS_HIT and entry.data else None
+            return entry.status, data
+        except Exception as e:
+            logger.error(f"Error reading TMDB cache for {key}: {e}")
+            return None
+        finally:
+            db.close()
+
+    def put(self, key: str, title: str, year, status: str, data=None) -> bool:
+        now = datetime.utcnow()
+        if data is not None and not isinstance(data, str):
+            data = json.dumps(data)
+        values = {
+            "cache_key": key,
+            "title": title,
+            "year": str(year) if year else None,
+            "status": status,
+            "data": data,
+            "created_at": now,
+            "expires_at": now + self._ttl(status)
+        }
+        db = SessionLocal()
+        try:
+            # Upsert: parallel workers may look up the same film at once
+            stmt = insert(TmdbCacheEntry).values(**values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[TmdbCacheEntry.cache_key],
+                set_={k: v for k, v in values.items() if k != "cache_key"}
+            )
+            db.execute(stmt)
+            db.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Error writing TMDB cache for {key}: {e}")
+            db.rollback()
+            return False
+        finally:
+            db.close()
+
+    def list_entries(self, status: str = None, limit: int = 100) -> list:
+        db = SessionLocal()
+        try:
+            query = db.query(TmdbCacheEntry)
+            if status:
+                query = query.filter(TmdbCacheEntry.status == status)
+            entries = query.order_by(TmdbCacheEntry.created_at.desc()).limit(limit).all()
+            now = datetime.utcnow()
+            return [{
+                "key": e.cache_key,
+                "title": e.title,
+                "year": e.year,
+                "status": e.status,
+                "data": json.loads(e.data) if e.status == STATUS_HIT and e.data else e.data,
+                "created_at": e.created_at.isoformat() if e.created_at else None,
+                "expires_at": e.expires_at.isoformat() if e.expires_at else None,
+                "expired": bool(e.expires_at and e.expires_at <= now)
+            } for e in entries]
+        except Exception as e:
+            logger.error(f"Error listing TMDB cache: {e}")
+            return []
+        finally:
+            db.close()
+
+    def purge(self, key: str = None, status: str = None, expired_only: bool = False) -> int:
+        """Deletes matching entries (all entries when no filter is given)."""
+        db = SessionLocal()
+        try:
+            query = db.query(TmdbCacheEntry)
+            if key:
+                query = query.filter(TmdbCacheEntry.cache_key == key)
+            if status:
+                query = query.filter(TmdbCacheEntry.status == status)
+            if expired_only:
+                query = query.filter(TmdbCacheEntry.expires_at <= datetime.utcnow())
+            removed = query.delete(synchronize_session=False)
+            db.commit()
+            logger.info(f"TMDB cache: purged {removed} entries")
+            return removed
+        except Exception as e:
+            logger.error(f"Error purging TMDB cache: {e}")
+            db.rollback()
+            return 0
+        finally:
+            db.close()
+
+    def get_stats(self) -> dict:
+        db = SessionLocal()
+        try:
+            rows = db.query(TmdbCacheEntry.status, func.count(TmdbCacheEntry.cache_key)).group_by(TmdbCacheEntry.status).all()
+            by_status = {status: count for status, count in rows}
+        except Exception as e:
+            logger.error(f"Error counting TMDB cache entries: {e}")
+            by_status = {}
+        finally:
+            db.close()
+
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": sum(by_status.values()),
+                "by_status": by_status,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+tmdb_cache = TmdbCache()
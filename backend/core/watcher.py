@@ -3,7 +3,13 @@ from watchdog.events import FileSystemEventHandler
 from backend.core.processor import process_file
 from backend.core.config_service import config_service
 from backend.core.ignore_service import ignore_service
-from backend.db.database import SessionLocal
+from backend.core.ingest import ingest_engine
+from backend.core.stability import stability_tracker
+from backend.core.coalescer import event_coalescer
+from backend.core.scan_index import scan_index, STATUS_QUEUED, STATUS_IGNORED
+from backend.core.dir_scanner import dir_scanner
+from backend.core.log_sink import log_sink
+from backend.core.event_bus import event_bus
 from backend.db.models import WatcherLog
 from datetime import datetime
 import os
@@ -12,28 +18,62 @@ import threading
 from loguru import logger
 
 def log_watcher_event(event_type: str, file_path: str, action: str, reason: str = None):
-    """Log watcher event to database"""
-    db = SessionLocal()
+    """Log watcher event to database (buffered, written in bulk by the log sink) and push it to live clients"""
+    timestamp = datetime.utcnow()
+    log_sink.write(
+        WatcherLog,
+        timestamp=timestamp,
+        event_type=event_type,
+        file_path=file_path,
+        action=action,
+        reason=reason
+    )
+    event_bus.publish("activity", {
+        "timestamp": timestamp.isoformat(),
+        "event_type": event_type,
+        "file_path": file_path,
+        "action": action,
+        "reason": reason
+    })
+
+def ingest_file(path: str, event_type: str):
+    """Runs the processing pipeline for one file and logs the outcome (ingest worker thread)."""
+    try:
+        st = os.stat(path)
+        size, mtime_ns = st.st_size, st.st_mtime_ns
+    except OSError:
+        size = mtime_ns = None
+
+    status = "failed"
     try:
-        log_entry = WatcherLog(
-            timestamp=datetime.utcnow(),
-            event_type=event_type,
-            file_path=file_path,
-            action=action,
-            reason=reason
-        )
-        db.add(log_entry)
-        db.commit()
+        result = process_file(path)
+        status = result.get("status", "processed") if result else "processed"
+        reason = result.get("reason") if result else None
+        log_watcher_event(event_type, path, status, reason)
     except Exception as e:
-        logger.error(f"Failed to log watcher event: {e}")
-        db.rollback()
+        error_msg = f"Error processing file {path}: {e}"
+        logger.error(error_msg)
+        log_watcher_event(event_type, path, "failed", str(e))
     finally:
-        db.close()
+        # Remember what the file looked like so the periodic scan skips it unless it changes
+        scan_index.record(path, size, mtime_ns, status)
+        event_coalescer.done(path)
+
+def record_ignored(path: str):
+    """Marks an ignored file in the scan index so the periodic scan leaves it alone."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return
+    scan_index.record(path, st.st_size, st.st_mtime_ns, STATUS_IGNORED)
 
 class Handler(FileSystemEventHandler):
     def on_created(self, event):
         logger.info(f"Watcher Event: {event.event_type} - {event.src_path}")
         if not event.is_directory:
+            # Merge with an event already settling, queued or in flight for this path
+            if not event_coalescer.offer(event.src_path, "created"):
+                return
             log_watcher_event("created", event.src_path, "detected")
             
             # Check if file should be ignored
@@ -41,23 +81,26 @@ class Handler(FileSystemEventHandler):
             if should_ignore:
                 logger.info(f"Ignoring: {event.src_path} ({ignore_reason})")
                 log_watcher_event("created", event.src_path, "ignored", ignore_reason)
+                record_ignored(event.src_path)
+                event_coalescer.done(event.src_path)
                 return
             
-            # Add a small delay to ensure file is fully written/moved
-            logger.info(f"File is valid. Waiting 2s for handle to clear: {event.src_path}")
-            time.sleep(2) 
-            try:
-                result = process_file(event.src_path)
-                status = result.get("status", "processed") if result else "processed"
-                reason = result.get("reason") if result else None
-                log_watcher_event("created", event.src_path, status, reason)
-            except Exception as e:
-                error_msg = f"Error processing file {event.src_path}: {e}"
-                logger.error(error_msg)
-                log_watcher_event("created", event.src_path, "failed", str(e))
+            # Hold the file until it stops changing, then hand it to the worker pool
+            logger.info(f"File is valid. Waiting for it to settle: {event.src_path}")
+            stability_tracker.track(event.src_path, "created")
+
+    def on_closed(self, event):
+        # Close-write (inotify only): lets the stability tracker release early
+        if not event.is_directory:
+            stability_tracker.mark_closed(event.src_path)
 
     def on_moved(self, event):
         if not event.is_directory:
+            # The temporary name is gone, stop waiting on it
+            stability_tracker.forget(event.src_path)
+            event_coalescer.discard(event.src_path)
+            if not event_coalescer.offer(event.dest_path, "moved"):
+                return
             logger.info(f"File moved detected: {event.dest_path}")
             log_watcher_event("moved", event.dest_path, "detected")
             
@@ -66,17 +109,11 @@ class Handler(FileSystemEventHandler):
             if should_ignore:
                 logger.info(f"Ignoring moved file {event.dest_path}: {ignore_reason}")
                 log_watcher_event("moved", event.dest_path, "ignored", ignore_reason)
+                record_ignored(event.dest_path)
+                event_coalescer.done(event.dest_path)
                 return
             
-            try:
-                result = process_file(event.dest_path)
-                status = result.get("status", "processed") if result else "processed"
-                reason = result.get("reason") if result else None
-                log_watcher_event("moved", event.dest_path, status, reason)
-            except Exception as e:
-                error_msg = f"Error processing moved file {event.dest_path}: {e}"
-                logger.error(error_msg)
-                log_watcher_event("moved", event.dest_path, "failed", str(e))
+            stability_tracker.track(event.dest_path, "moved")
 
 class WatcherManager:
     def __init__(self):
@@ -95,6 +132,9 @@ class WatcherManager:
             logger.warning(f"Input directory {input_dir} does not exist or not set. Watcher not started.")
             return
 
+        ingest_engine.start(ingest_file)
+        stability_tracker.start(ingest_engine.submit, on_dropped=event_coalescer.done)
+
         self.observer = Observer()
         self.event_handler = Handler()
         self.watched_path = input_dir
@@ -135,66 +175,112 @@ class WatcherManager:
         self.stop()
         self.start()
 
+    def on_config_change(self, snapshot, changed_keys):
+        """Config subscriber: follow INPUT_DIR changes."""
+        if "INPUT_DIR" not in changed_keys:
+            return
+        new_input_dir = config_service.get_setting("INPUT_DIR")
+        if new_input_dir != self.watched_path:
+            logger.info(f"Input directory changed from {self.watched_path} to {new_input_dir}. Restarting watcher.")
+            self.restart()
+
     def get_status(self):
         return {
             "is_running": self.is_running,
-            "watched_path": self.watched_path
+            "watched_path": self.watched_path,
+            "ingest": ingest_engine.get_status(),
+            "stability": stability_tracker.get_status(),
+            "coalescer": event_coalescer.get_status(),
+            "scan": dir_scanner.get_status()
         }
 
     def background_scan_loop(self, directory: str):
         """Background thread loop for initial and periodic scanning"""
         # 1. Initial Scan immediately
         self.initial_scan(directory)
+
+        # Drop cached probe results for files that have since gone away
+        from backend.core.probe_cache import probe_cache
+        probe_cache.evict_missing()
         
-        # 2. Periodic Scan every 5 minutes
+        # 2. Periodic Scan every 5 minutes; only changed directories are re-listed,
+        # except for every SCAN_FULL_EVERY-th pass which walks everything and
+        # also drops probe cache entries for files deleted since the last one
+        full_every = max(1, int(config_service.get_setting("SCAN_FULL_EVERY", 12)))
+        passes = 0
         while self.is_running:
             time.sleep(300) # 5 minutes
             if self.is_running:
-                logger.info(f"Triggering periodic 5-minute scan of {directory}...")
-                self.initial_scan(directory)
+                passes += 1
+                full = passes % full_every == 0
+                logger.info(f"Triggering periodic 5-minute {'full ' if full else ''}scan of {directory}...")
+                self.initial_scan(directory, full=full)
+                if full:
+                    probe_cache.evict_missing()
 
-    def initial_scan(self, directory: str):
-        """Scan directory for existing files that haven't been processed"""
+    def initial_scan(self, directory: str, full: bool = False):
+        """Scan directory for files that are new or changed since they were last handled"""
         logger.info(f"Starting initial scan of {directory}...")
         count = 0
         
-        db = SessionLocal()
         try:
-            for root, dirs, files in os.walk(directory):
-                for file in files:
-                    # Filter for known media extensions
-                    if not file.lower().endswith(('.mkv', '.mp4', '.avi', '.m4v', '.ts')):
+            # One bulk load per scan instead of a lookup per file
+            known = scan_index.load()
+            seen = set()
+            updates = []
+            to_track = []
+
+            # Files in unchanged directories come from the scanner's cache and still count as seen
+            for file_path, size, mtime_ns in dir_scanner.scan(directory, full=full):
+                seen.add(file_path)
+                state = known.get(file_path)
+
+                should_ignore, ignore_reason = ignore_service.should_ignore(file_path)
+                if should_ignore:
+                    if state is None or state.status != STATUS_IGNORED or (state.size, state.mtime_ns) != (size, mtime_ns):
+                        if state is None:
+                            log_watcher_event("scan", file_path, "ignored", ignore_reason)
+                        updates.append((file_path, size, mtime_ns, STATUS_IGNORED))
+                    continue
+
+                # An ignore rule that no longer matches releases the file
+                if state is None or state.status != STATUS_IGNORED:
+                    if not scan_index.needs_processing(state, size, mtime_ns):
+                        if state.size is None:
+                            updates.append((file_path, size, mtime_ns, state.status))
                         continue
-                        
-                    file_path = os.path.join(root, file)
-                    
-                    # Check if already processed (exists in WatcherLog)
-                    exists = db.query(WatcherLog).filter(WatcherLog.file_path == file_path).first()
-                    if not exists:
-                        logger.info(f"Initial scan found new file: {file_path}")
-                        try:
-                            # Log as detected
-                            log_watcher_event("scan", file_path, "detected")
-                            
-                            # Process it
-                            result = process_file(file_path)
-                            status = result.get("status", "processed") if result else "processed"
-                            reason = result.get("reason") if result else None
-                            
-                            # Log result
-                            log_watcher_event("scan", file_path, status, reason)
-                            count += 1
-                        except Exception as e:
-                            logger.error(f"Failed to process {file_path} during initial scan: {e}")
-                            log_watcher_event("scan", file_path, "failed", str(e))
+
+                if event_coalescer.offer(file_path, "scan"):
+                    logger.info(f"Initial scan found new file: {file_path}")
+                    updates.append((file_path, size, mtime_ns, STATUS_QUEUED))
+                    to_track.append(file_path)
+                    count += 1
+
+            # Queued rows go in before any file is released to the workers, so a
+            # worker's final status is never overwritten by this write
+            scan_index.bulk_record(updates)
+            for file_path in to_track:
+                # Log as detected and hand off to the worker pool
+                log_watcher_event("scan", file_path, "detected")
+                stability_tracker.track(file_path, "scan")
+
+            # Forget files that have left the watched tree
+            prefix = os.path.join(directory, "")
+            gone = [p for p in known if p.startswith(prefix) and p not in seen]
+            removed = scan_index.prune(gone)
                             
-            logger.info(f"Initial scan complete. Processed {count} new files.")
+            scan_stats = dir_scanner.last_scan
+            logger.info(f"Initial scan complete. Queued {count} new files, forgot {removed} removed files "
+                        f"({scan_stats.get('dirs_visited', 0)} directories listed, {scan_stats.get('dirs_skipped', 0)} unchanged).")
         except Exception as e:
             logger.error(f"Initial scan failed: {e}")
-        finally:
-            db.close()
 
 watcher_manager = WatcherManager()
+config_service.subscribe(watcher_manager.on_config_change)
+
+# Live clients get watcher/queue status pushed whenever it changes
+# average_utilization is busy time over uptime, so it drifts even when nothing happens
+event_bus.register_poller("status", watcher_manager.get_status, volatile=("ingest.average_utilization",))
 
 def start_watchers():
     """Legacy helper for app startup"""
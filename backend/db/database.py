@@ -1,14 +1,103 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from backend.config.settings import settings
+import threading
+import time
 import logging
 
 logger = logging.getLogger(__name__)
 
-engine = create_engine(
-    settings.DATABASE_URL, connect_args={"check_same_thread": False}
-)
+WRITE_VERBS = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+class DbStats:
+    """
+    Wall-clock duration of write statements plus the number of writes that
+    failed with "database is locked". A duration includes any time spent in
+    the busy handler, but it is not a lock-wait measurement on its own; only
+    locked_errors is a definite sign of writer contention.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.writes = 0
+        self.write_seconds = 0.0
+        self.max_write_seconds = 0.0
+        self.slow_writes = 0  # Writes that took longer than 100 ms
+        self.locked_errors = 0
+
+    def record_write(self, seconds: float):
+        with self._lock:
+            self.writes += 1
+            self.write_seconds += seconds
+            if seconds > self.max_write_seconds:
+                self.max_write_seconds = seconds
+            if seconds > 0.1:
+                self.slow_writes += 1
+
+    def record_locked(self):
+        with self._lock:
+            self.locked_errors += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "write_statements": self.writes,
+                "write_ms": {
+                    "avg": round(self.write_seconds / self.writes * 1000, 2) if self.writes else 0.0,
+                    "max": round(self.max_write_seconds * 1000, 2)
+                },
+                "slow_writes": self.slow_writes,
+                "locked_errors": self.locked_errors,
+                "pool": engine.pool.status()
+            }
+
+db_stats = DbStats()
+
+def _engine_options(url: str) -> dict:
+    options = {"connect_args": {"check_same_thread": False}}
+    if url.startswith("sqlite") and ":memory:" not in url and url.rstrip("/") != "sqlite:":
+        # pysqlite's own busy handler, in seconds; the PRAGMA below sets the same
+        options["connect_args"]["timeout"] = settings.DB_BUSY_TIMEOUT_MS / 1000
+        options["pool_size"] = settings.DB_POOL_SIZE
+        options["max_overflow"] = settings.DB_MAX_OVERFLOW
+        options["pool_timeout"] = 30
+    return options
+
+engine = create_engine(settings.DATABASE_URL, **_engine_options(settings.DATABASE_URL))
+
+@event.listens_for(engine, "connect")
+def _configure_sqlite(dbapi_connection, connection_record):
+    """WAL lets readers run alongside the single writer; busy_timeout makes writers wait instead of failing."""
+    cursor = dbapi_connection.cursor()
+    try:
+        # Only takes effect on a brand-new database; existing ones via POST /api/maintenance/vacuum/convert
+        cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.DB_BUSY_TIMEOUT_MS)}")
+        synchronous = settings.DB_SYNCHRONOUS.upper()
+        if synchronous in ("OFF", "NORMAL", "FULL", "EXTRA"):
+            cursor.execute(f"PRAGMA synchronous={synchronous}")
+    finally:
+        cursor.close()
+
+@event.listens_for(engine, "before_cursor_execute")
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.monotonic())
+
+@event.listens_for(engine, "after_cursor_execute")
+def _stop_timer(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start"].pop()
+    if statement.lstrip()[:7].upper().startswith(WRITE_VERBS):
+        db_stats.record_write(time.monotonic() - started)
+
+@event.listens_for(engine, "handle_error")
+def _count_locked(context):
+    starts = context.connection.info.get("query_start") if context.connection is not None else None
+    if starts:
+        starts.pop()
+    if "database is locked" in str(context.original_exception):
+        db_stats.record_locked()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -21,6 +110,9 @@ def get_db():
         db.close()
 
 def init_db():
+    import backend.db.models  # noqa: F401 - registers every table on Base before create_all
+    from backend.db.migrations import run_migrations
     logger.info("Initializing database...")
     Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
     logger.info("Database initialized.")
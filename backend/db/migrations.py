@@ -0,0 +1,68 @@
+"""
+Schema migrations - Versioned, idempotent upgrades applied at startup after create_all
+"""
+from sqlalchemy import text
+from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+
+def _create_index(conn, name: str, table: str, columns: str):
+    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"))
+
+def _log_and_catalog_indexes(conn):
+    _create_index(conn, "ix_watcher_logs_file_path", "watcher_logs", "file_path")
+    _create_index(conn, "ix_watcher_logs_action_timestamp", "watcher_logs", "action, timestamp")
+    _create_index(conn, "ix_cleanup_logs_status", "cleanup_logs", "status")
+    _create_index(conn, "ix_cleanup_logs_file_path", "cleanup_logs", "file_path")
+    _create_index(conn, "ix_error_logs_source", "error_logs", "source")
+    _create_index(conn, "ix_processed_files_created_at", "processed_files", "created_at")
+    _create_index(conn, "ix_rejected_files_created_at", "rejected_files", "created_at")
+    # Give the query planner statistics for the new indexes
+    conn.execute(text("ANALYZE"))
+
+def _log_filter_indexes(conn):
+    # SQLite appends the rowid (id) to every index, so "= filter AND id < cursor
+    # ORDER BY id DESC" is answered from the index alone on any page
+    _create_index(conn, "ix_error_logs_level", "error_logs", "level")
+    _create_index(conn, "ix_cleanup_logs_operation_type", "cleanup_logs", "operation_type")
+    _create_index(conn, "ix_watcher_logs_event_type", "watcher_logs", "event_type")
+    # ix_watcher_logs_action_timestamp is ordered by timestamp, so paging by id had to sort every match
+    _create_index(conn, "ix_watcher_logs_action", "watcher_logs", "action")
+    conn.execute(text("ANALYZE"))
+
+# (version, description, upgrade(conn)); append only, never renumber.
+# New tables come from create_all; migrations cover what it can't do to
+# existing tables (new columns, new indexes). Each step must be idempotent
+# because a fresh database already has everything the models declare.
+MIGRATIONS = [
+    (1, "Add indexes for log filters and catalog sorting", _log_and_catalog_indexes),
+    (2, "Add indexes for log level, operation, event type and action filters", _log_filter_indexes),
+]
+
+def get_schema_version(conn) -> int:
+    return conn.execute(text("SELECT COALESCE(MAX(version), 0) FROM schema_version")).scalar()
+
+def run_migrations(engine) -> int:
+    """Applies pending migrations in order, one transaction each. Returns the resulting schema version."""
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_version ("
+            "version INTEGER PRIMARY KEY, description VARCHAR, applied_at DATETIME)"
+        ))
+        current = get_schema_version(conn)
+
+    for version, description, upgrade in MIGRATIONS:
+        if version <= current:
+            continue
+        logger.info(f"Applying schema migration {version}: {description}")
+        with engine.begin() as conn:
+            upgrade(conn)
+            conn.execute(
+                text("INSERT INTO schema_version (version, description, applied_at) VALUES (:v, :d, :t)"),
+                {"v": version, "d": description, "t": datetime.utcnow()}
+            )
+        current = version
+
+    logger.info(f"Database schema at version {current}")
+    return current
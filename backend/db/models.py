@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, Text, UniqueConstraint, Index
 from backend.db.database import Base
 from datetime import datetime
 
@@ -14,7 +14,7 @@ class ProcessedFile(Base):
     language = Column(String)
     quality_score = Column(Integer)
     action = Column(String) # move, reject, replace
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
 
 class RejectedFile(Base):
     __tablename__ = "rejected_files"
@@ -22,7 +22,7 @@ class RejectedFile(Base):
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String)
     reason = Column(String)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
 
 class SystemSetting(Base):
     __tablename__ = "system_settings"
@@ -36,8 +36,8 @@ class ErrorLog(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     timestamp = Column(DateTime, default=datetime.utcnow, index=True)
-    level = Column(String)  # ERROR, WARNING, INFO
-    source = Column(String)  # watcher, cleanup, api, processor
+    level = Column(String, index=True)  # ERROR, WARNING, INFO
+    source = Column(String, index=True)  # watcher, cleanup, api, processor
     message = Column(String)
     traceback = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -47,21 +47,22 @@ class CleanupLog(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     timestamp = Column(DateTime, default=datetime.utcnow, index=True)
-    operation_type = Column(String)  # scan, move, delete, dry_run
-    file_path = Column(String)
+    operation_type = Column(String, index=True)  # scan, move, delete, dry_run
+    file_path = Column(String, index=True)
     destination = Column(String, nullable=True)
-    status = Column(String)  # success, failed, skipped
+    status = Column(String, index=True)  # success, failed, skipped
     details = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
 class WatcherLog(Base):
     __tablename__ = "watcher_logs"
+    __table_args__ = (Index("ix_watcher_logs_action_timestamp", "action", "timestamp"),)
     
     id = Column(Integer, primary_key=True, index=True)
     timestamp = Column(DateTime, default=datetime.utcnow, index=True)
-    event_type = Column(String)  # created, moved, modified
-    file_path = Column(String)
-    action = Column(String)  # detected, processed, ignored, failed
+    event_type = Column(String, index=True)  # created, moved, modified
+    file_path = Column(String, index=True)
+    action = Column(String, index=True)  # detected, processed, ignored, failed
     reason = Column(String, nullable=True)  # ignore reason or error message
     created_at = Column(DateTime, default=datetime.utcnow)
 
@@ -73,3 +74,74 @@ class IgnoredFile(Base):
     filename = Column(String)
     reason = Column(String, nullable=True)  # User-provided reason
     ignored_at = Column(DateTime, default=datetime.utcnow)
+
+class ProbeCacheEntry(Base):
+    __tablename__ = "probe_cache"
+    __table_args__ = (UniqueConstraint("device", "inode", "size", "mtime_ns", name="uq_probe_cache_identity"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    device = Column(BigInteger)
+    inode = Column(BigInteger)
+    size = Column(BigInteger)
+    mtime_ns = Column(BigInteger)
+    file_path = Column(String, index=True)  # Last path this identity was seen at
+    data = Column(Text)  # Raw ffprobe JSON (streams + format)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class TmdbCacheEntry(Base):
+    __tablename__ = "tmdb_cache"
+
+    cache_key = Column(String, primary_key=True, index=True)  # normalized "title|year"
+    title = Column(String)
+    year = Column(String, nullable=True)
+    status = Column(String, index=True)  # hit, miss, error
+    data = Column(Text, nullable=True)  # JSON metadata for hits, error message for errors
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, index=True)
+
+class ScanState(Base):
+    __tablename__ = "scan_state"
+
+    file_path = Column(String, primary_key=True)
+    size = Column(BigInteger, nullable=True)  # NULL until first stat (e.g. seeded from watcher_logs)
+    mtime_ns = Column(BigInteger, nullable=True)
+    status = Column(String)  # queued, processed, skipped, rejected, ignored, failed
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class CleanupRun(Base):
+    __tablename__ = "cleanup_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    started_at = Column(DateTime, default=datetime.utcnow, index=True)
+    finished_at = Column(DateTime, nullable=True)
+    origin_dir = Column(String)
+    malayalam_dest = Column(String)
+    english_dest = Column(String)
+    dry_run = Column(Boolean, default=True)
+    workers = Column(Integer, default=1)
+    status = Column(String)  # running, success, cancelled, failed, interrupted
+    summary = Column(Text, nullable=True)  # JSON progress snapshot at the end of the run
+    cursor = Column(Integer, default=0)  # Files done across all sessions of the run (checkpointed)
+    last_file = Column(String, nullable=True)  # Last file recorded at the cursor
+    resumed_count = Column(Integer, default=0)
+
+class CleanupRunFile(Base):
+    __tablename__ = "cleanup_run_files"
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(Integer, index=True)
+    file_index = Column(Integer)  # Position in the (sorted) walk order, offset per session so it never repeats within a run
+    file_path = Column(String)
+    status = Column(String)  # moved, dry_run, skipped, unidentified, failed
+    destination = Column(String, nullable=True)
+    timestamp = Column(DateTime, default=datetime.utcnow)
+
+class DailyStat(Base):
+    __tablename__ = "daily_stats"
+    __table_args__ = (UniqueConstraint("day", "source", "action", name="uq_daily_stats_key"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    day = Column(String, index=True)  # UTC date, YYYY-MM-DD
+    source = Column(String)  # watcher, cleanup, or the component of an error log
+    action = Column(String)  # watcher action, cleanup "operation:status", or error level
+    count = Column(Integer, default=0)
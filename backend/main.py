@@ -38,10 +38,31 @@ app.include_router(settings_router)
 async def startup():
     logger.info("Starting Filearr backend...")
     from backend.db.database import init_db
+    from backend.core.config_service import config_service
+    from backend.core.cleanup import mark_interrupted_runs
+    from backend.core.daily_stats import daily_stats
+    from backend.core.retention import retention_service
     init_db()
+    config_service.reload()
+    daily_stats.backfill()
+    mark_interrupted_runs()
     start_watchers()
+    retention_service.start()
     logger.info("Filearr started successfully.")
 
+@app.on_event("shutdown")
+async def shutdown():
+    from backend.core.log_sink import log_sink
+    from backend.core.retention import retention_service
+    from backend.core.watcher import watcher_manager
+    from backend.core.ingest import ingest_engine
+    watcher_manager.stop()
+    # Files already queued get a bounded chance to finish before the process exits
+    ingest_engine.stop(timeout=10)
+    retention_service.stop()
+    logger.info("Flushing buffered logs...")
+    log_sink.close()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("backend.main:app", host="0.0.0.0", port=8000, reload=True)
@@ -5,6 +5,8 @@ class FolderBrowser {
     constructor() {
         this.currentPath = '/media';
         this.callback = null;
+        this.nextCursor = null;
+        this.filterTimer = null;
         this.createModal();
     }
 
@@ -21,6 +23,7 @@ class FolderBrowser {
                         <div style="margin-bottom: 15px;">
                             <strong>Current Path:</strong> <code id="currentPath">/media</code>
                         </div>
+                        <input type="text" id="folderFilter" placeholder="Filter folders..." oninput="folderBrowser.onFilter()" style="width: 100%; margin-bottom: 10px; padding: 6px; box-sizing: border-box;">
                         <div id="folderList" style="max-height: 400px; overflow-y: auto; border: 1px solid #ddd; padding: 10px; background: #f9f9f9;">
                             <p>Loading...</p>
                         </div>
@@ -51,7 +54,31 @@ class FolderBrowser {
         document.getElementById('folderBrowserModal').style.display = 'none';
     }
 
-    async loadDirectory(path) {
+    onFilter() {
+        clearTimeout(this.filterTimer);
+        this.filterTimer = setTimeout(() => this.loadDirectory(this.currentPath, true), 250);
+    }
+
+    renderDir(dir, path) {
+        const fullPath = `${path}/${dir}`.replace('//', '/');
+        return `
+            <div class="folder-item" onclick="folderBrowser.loadDirectory('${fullPath}')" style="cursor: pointer; padding: 8px; margin: 4px 0; background: #fff; border-radius: 4px; border: 1px solid #e0e0e0;">
+                📁 ${dir}
+            </div>
+        `;
+    }
+
+    async fetchPage(path, cursor) {
+        const params = new URLSearchParams({ path, kind: 'dirs', limit: 500 });
+        const filter = document.getElementById('folderFilter').value.trim();
+        if (filter) params.set('q', filter);
+        if (cursor) params.set('cursor', cursor);
+        const response = await fetch(`/api/browse?${params}`);
+        return response.json();
+    }
+
+    async loadDirectory(path, keepFilter = false) {
+        if (!keepFilter) document.getElementById('folderFilter').value = '';
         this.currentPath = path;
         document.getElementById('currentPath').textContent = path;
 
@@ -59,8 +86,7 @@ class FolderBrowser {
         folderList.innerHTML = '<p>Loading...</p>';
 
         try {
-            const response = await fetch(`/api/browse?path=${encodeURIComponent(path)}`);
-            const data = await response.json();
+            const data = await this.fetchPage(path);
 
             if (data.error) {
                 folderList.innerHTML = `<p style="color: red;">Error: ${data.error}</p>`;
@@ -80,25 +106,39 @@ class FolderBrowser {
 
             // Add directories
             if (data.directories && data.directories.length > 0) {
-                data.directories.forEach(dir => {
-                    const fullPath = `${path}/${dir}`.replace('//', '/');
-                    html += `
-                        <div class="folder-item" onclick="folderBrowser.loadDirectory('${fullPath}')" style="cursor: pointer; padding: 8px; margin: 4px 0; background: #fff; border-radius: 4px; border: 1px solid #e0e0e0;">
-                            📁 ${dir}
-                        </div>
-                    `;
-                });
+                html += '<div id="folderItems">' + data.directories.map(dir => this.renderDir(dir, path)).join('') + '</div>';
             } else {
                 html += '<p style="color: #666;">No subdirectories found.</p>';
             }
+            html += '<button id="folderMore" class="btn btn-secondary" onclick="folderBrowser.loadMore()" style="display: none; width: 100%; margin-top: 6px;">Load more</button>';
 
             folderList.innerHTML = html;
+            this.setCursor(data.next_cursor);
 
         } catch (error) {
             folderList.innerHTML = `<p style="color: red;">Error loading directory: ${error.message}</p>`;
         }
     }
 
+    setCursor(cursor) {
+        this.nextCursor = cursor;
+        document.getElementById('folderMore').style.display = cursor ? 'block' : 'none';
+    }
+
+    async loadMore() {
+        if (!this.nextCursor) return;
+        const path = this.currentPath;
+        try {
+            const data = await this.fetchPage(path, this.nextCursor);
+            if (data.error || path !== this.currentPath) return;
+            document.getElementById('folderItems')
+                .insertAdjacentHTML('beforeend', data.directories.map(dir => this.renderDir(dir, path)).join(''));
+            this.setCursor(data.next_cursor);
+        } catch (error) {
+            console.error('Error loading more folders:', error);
+        }
+    }
+
     selectCurrent() {
         if (this.callback) {
             this.callback(this.currentPath);
@@ -0,0 +1,21 @@
+import os
+import sys
+import tempfile
+
+# Settings are read at import time, so point the app at a scratch database
+# (and synchronous log writes) before anything from backend is imported
+_data_dir = tempfile.mkdtemp(prefix="filearr-tests-")
+os.environ.setdefault("DATA_DIR", _data_dir)
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_data_dir}/filearr.db")
+os.environ.setdefault("LOG_SINK_SYNC", "true")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+@pytest.fixture(scope="session")
+def db_tables():
+    from backend.db.database import Base, engine
+    import backend.db.models  # noqa: F401 - registers the tables on Base
+    Base.metadata.create_all(bind=engine)
+    return engine
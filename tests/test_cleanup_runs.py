@@ -0,0 +1,62 @@
+import os
+
+import pytest
+
+from backend.core import cleanup
+from backend.core.cleanup import cleanup_manager, get_cleanup_run, run_manual_cleanup
+
+FILE_BYTES = 10
+
+@pytest.fixture
+def origin(tmp_path):
+    origin = tmp_path / "downloads"
+    for i in range(6):
+        folder = origin / f"Movie {i}"
+        folder.mkdir(parents=True)
+        (folder / f"movie.{i}.mkv").write_bytes(b"x" * FILE_BYTES)
+    return origin
+
+@pytest.fixture
+def fake_move(tmp_path, monkeypatch):
+    """Stands in for identify + move: deletes the source like a live move does, optionally cancelling after N files."""
+    state = {"moved": 0, "stop_after": None}
+
+    def move(index, file, file_path, malayalam_dest, english_dest, dry_run, claims):
+        try:
+            os.unlink(file_path)
+            state["moved"] += 1
+            if state["stop_after"] and state["moved"] >= state["stop_after"]:
+                cleanup_manager.stop()
+            return {"status": "moved", "destination": str(tmp_path / "movies" / file), "details": "", "bytes": FILE_BYTES, "timings": {}}
+        finally:
+            claims.end_turn(index)
+
+    monkeypatch.setattr(cleanup, "_cleanup_file", move)
+    return state
+
+def test_resumed_run_reports_cumulative_summary(db_tables, origin, tmp_path, fake_move):
+    fake_move["stop_after"] = 2
+    run_manual_cleanup(str(origin), str(tmp_path / "mal"), str(tmp_path / "movies"), dry_run=False, workers=1)
+    run_id = cleanup_manager.progress.run_id
+    first = get_cleanup_run(run_id)
+    assert first["status"] == "cancelled"
+    moved_first = first["summary"]["moved"]
+    assert 2 <= moved_first < 6
+
+    fake_move["stop_after"] = None
+    cleanup.resume_cleanup_run(run_id)
+
+    run = get_cleanup_run(run_id)
+    summary = run["summary"]
+    assert run["status"] == "success"
+    assert run["cursor"] == 6
+    assert summary["moved"] == 6
+    assert summary["completed"] == 6
+    assert summary["total"] == 6
+    assert summary["percent"] == 100.0
+    assert summary["bytes_moved"] == 6 * FILE_BYTES
+    assert summary["sessions"] == 2
+    assert summary["last_session"]["moved"] == 6 - moved_first
+
+    files = cleanup.get_cleanup_run_files(run_id)
+    assert len({f["file_index"] for f in files}) == len(files) == 6
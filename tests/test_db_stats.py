@@ -0,0 +1,16 @@
+from backend.db.database import DbStats
+
+
+def test_snapshot_reports_write_durations_and_locked_errors():
+    stats = DbStats()
+    stats.record_write(0.01)
+    stats.record_write(0.25)
+    stats.record_locked()
+
+    snapshot = stats.snapshot()
+
+    assert snapshot["write_statements"] == 2
+    assert snapshot["write_ms"] == {"avg": 130.0, "max": 250.0}
+    assert snapshot["slow_writes"] == 1
+    assert snapshot["locked_errors"] == 1
+    assert "pool" in snapshot
@@ -0,0 +1,56 @@
+import threading
+import time
+
+from backend.core.cleanup import DestinationClaims
+
+def _claim_in_thread(claims, index, dest, source, results):
+    def run():
+        results[index] = claims.claim(index, dest, source)
+        claims.end_turn(index)
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+def test_first_discovered_file_wins_even_if_it_claims_last():
+    claims = DestinationClaims()
+    results = {}
+    late = _claim_in_thread(claims, 1, "/movies/A (2020)/A.mkv", "/in/second.mkv", results)
+    time.sleep(0.05)
+    assert 1 not in results, "index 1 must wait for index 0's turn"
+
+    early = _claim_in_thread(claims, 0, "/movies/A (2020)/A.mkv", "/in/first.mkv", results)
+    early.join(2)
+    late.join(2)
+
+    assert results[0] is None
+    assert results[1] == "/in/first.mkv"
+
+def test_cancelled_turn_releases_the_files_after_it():
+    claims = DestinationClaims()
+    results = {}
+    waiting = _claim_in_thread(claims, 1, "/movies/B.mkv", "/in/b.mkv", results)
+
+    # Index 0 was cancelled before it ever claimed
+    claims.end_turn(0)
+    waiting.join(2)
+
+    assert not waiting.is_alive()
+    assert results[1] is None
+
+def test_end_turn_is_idempotent_and_out_of_order():
+    claims = DestinationClaims()
+    claims.end_turn(2)
+    claims.end_turn(0)
+    claims.end_turn(0)
+    claims.end_turn(1)
+
+    results = {}
+    thread = _claim_in_thread(claims, 3, "/movies/C.mkv", "/in/c.mkv", results)
+    thread.join(2)
+    assert results[3] is None
+
+def test_same_source_reclaiming_is_not_a_collision():
+    claims = DestinationClaims()
+    claims.seed("/movies/D.mkv", "/in/d.mkv")
+    assert claims.claim(0, "/movies/D.mkv", "/in/d.mkv") is None
+    assert claims.claim(0, "/movies/D.mkv", "/in/other.mkv") == "/in/d.mkv"
@@ -0,0 +1,76 @@
+import os
+
+import pytest
+
+from backend.core import directory_service as directory_module
+from backend.core.directory_service import DirectoryService
+
+@pytest.fixture
+def tree(tmp_path):
+    for i in range(5):
+        (tmp_path / f"dir{i}").mkdir()
+        (tmp_path / f"file{i}.mkv").write_bytes(b"x" * i)
+    # Old enough for the listing cache
+    os.utime(tmp_path, ns=(0, 0))
+    return tmp_path
+
+def _all_pages(service, path, **kwargs):
+    names, cursor = [], None
+    while True:
+        page = service.list_directories(str(path), cursor=cursor, **kwargs)
+        names += page["directories"] + page["files"]
+        cursor = page["next_cursor"]
+        if not cursor:
+            return names, page
+
+def test_name_order_pages_directories_first(tree):
+    names, last = _all_pages(DirectoryService(), tree, limit=3)
+    assert names == [f"dir{i}" for i in range(5)] + [f"file{i}.mkv" for i in range(5)]
+    assert last["total"] == 10
+
+def test_filtered_total_counts_matches_only(tree):
+    page = DirectoryService().list_directories(str(tree), name_filter="3", kind="files")
+    assert page["files"] == ["file3.mkv"]
+    assert page["total"] == 1
+
+def test_stats_come_from_the_page_rows(tree):
+    page = DirectoryService().list_directories(str(tree), kind="files", limit=2, stats=True)
+    assert [(e["name"], e["size"]) for e in page["entries"]] == [("file0.mkv", 0), ("file1.mkv", 1)]
+
+def test_disk_order_stops_reading_once_the_page_is_full(tree, monkeypatch):
+    read = {"count": 0}
+    real_scandir = os.scandir
+
+    class CountingScandir:
+        def __init__(self, path):
+            self._it = real_scandir(path)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            self._it.close()
+
+        def __iter__(self):
+            for entry in self._it:
+                read["count"] += 1
+                yield entry
+
+    monkeypatch.setattr(directory_module.os, "scandir", CountingScandir)
+    page = DirectoryService().list_directories(str(tree), limit=3, order="disk")
+
+    assert len(page["directories"] + page["files"]) == 3
+    assert page["next_cursor"]
+    assert page["total"] is None
+    assert read["count"] == 4  # The page plus one lookahead entry
+
+def test_disk_order_pages_cover_every_entry_once(tree):
+    names, _ = _all_pages(DirectoryService(), tree, limit=3, order="disk")
+    assert sorted(names) == sorted(os.listdir(tree))
+
+def test_disk_cursor_is_rejected_after_the_directory_changes(tree):
+    service = DirectoryService()
+    cursor = service.list_directories(str(tree), limit=3, order="disk")["next_cursor"]
+    (tree / "new.mkv").write_bytes(b"")
+
+    assert "error" in service.list_directories(str(tree), cursor=cursor, order="disk")
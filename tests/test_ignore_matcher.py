@@ -0,0 +1,20 @@
+from backend.core.ignore_service import IgnoreMatcher
+
+def test_reports_the_matching_pattern():
+    matcher = IgnoreMatcher(["*.sample", "*.nfo", "*trailer*"])
+    assert matcher.match("movie.nfo") == "*.nfo"
+    assert matcher.match("Movie.2020.trailer.mkv") == "*trailer*"
+    assert matcher.match("Movie.2020.1080p.mkv") is None
+
+def test_first_pattern_in_list_order_wins():
+    matcher = IgnoreMatcher(["*.mkv", "movie*"])
+    assert matcher.match("movie.mkv") == "*.mkv"
+
+def test_glob_syntax_is_not_treated_as_regex():
+    matcher = IgnoreMatcher(["*-RARBG*", "[abc].mkv"])
+    assert matcher.match("Film-RARBG.mkv") == "*-RARBG*"
+    assert matcher.match("b.mkv") == "[abc].mkv"
+    assert matcher.match("FilmXRARBG.mkv") is None
+
+def test_no_patterns_matches_nothing():
+    assert IgnoreMatcher([]).match("anything.mkv") is None
@@ -0,0 +1,114 @@
+import sqlite3
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from backend.core import log_sink as log_sink_module
+from backend.core.log_sink import LogSink
+from backend.db.database import SessionLocal
+from backend.db.models import ErrorLog, DailyStat
+
+@pytest.fixture
+def sink(db_tables):
+    db = SessionLocal()
+    db.query(ErrorLog).delete()
+    db.query(DailyStat).delete()
+    db.commit()
+    db.close()
+    return LogSink(synchronous=True)
+
+def _messages():
+    db = SessionLocal()
+    try:
+        return [row.message for row in db.query(ErrorLog).order_by(ErrorLog.id)]
+    finally:
+        db.close()
+
+def _failing_sessions(monkeypatch, error, times=1):
+    """Makes the next `times` flushes fail with `error` on their first insert."""
+    remaining = {"count": times}
+
+    class FailingSession:
+        def __init__(self):
+            self._db = SessionLocal()
+
+        def execute(self, *args, **kwargs):
+            if remaining["count"] > 0:
+                remaining["count"] -= 1
+                raise error
+            return self._db.execute(*args, **kwargs)
+
+        def __getattr__(self, name):
+            return getattr(self._db, name)
+
+    monkeypatch.setattr(log_sink_module, "SessionLocal", FailingSession)
+
+def _locked():
+    return OperationalError("INSERT INTO error_logs", {}, sqlite3.OperationalError("database is locked"))
+
+def test_sync_mode_writes_immediately(sink):
+    sink.write(ErrorLog, level="INFO", source="test", message="one")
+    assert _messages() == ["one"]
+    assert sink.get_status()["rows_written"] == 1
+
+def test_locked_database_requeues_the_batch_ahead_of_newer_rows(sink, monkeypatch):
+    _failing_sessions(monkeypatch, _locked())
+
+    sink.write(ErrorLog, level="INFO", source="test", message="first")
+    status = sink.get_status()
+    assert status["pending"] == 1
+    assert status["retries"] == 1
+    assert status["rows_dropped"] == 0
+
+    sink.write(ErrorLog, level="INFO", source="test", message="second")
+    assert _messages() == ["first", "second"]
+    assert sink.get_status()["pending"] == 0
+
+def test_requeue_keeps_at_most_max_pending_rows(sink, monkeypatch):
+    monkeypatch.setattr(log_sink_module, "MAX_PENDING_ROWS", 2)
+    _failing_sessions(monkeypatch, _locked(), times=3)
+
+    for message in ("a", "b", "c"):
+        sink.write(ErrorLog, level="INFO", source="test", message=message)
+
+    assert sink.get_status()["rows_dropped"] == 1
+    sink.flush()
+    assert _messages() == ["b", "c"]
+
+def test_non_retryable_error_drops_the_batch(sink, monkeypatch):
+    _failing_sessions(monkeypatch, ValueError("bad row"))
+
+    sink.write(ErrorLog, level="INFO", source="test", message="lost")
+    status = sink.get_status()
+    assert status["pending"] == 0
+    assert status["rows_dropped"] == 1
+    assert _messages() == []
+
+def test_failing_hook_is_rolled_back_without_losing_rows(sink):
+    def broken_rollup(db, batch):
+        db.add(DailyStat(day="2026-01-01", source="test", action="broken", count=1))
+        db.flush()
+        raise RuntimeError("rollup failed")
+
+    calls = []
+    sink.add_flush_hook(broken_rollup)
+    sink.add_flush_hook(lambda db, batch: calls.append(len(batch)))
+
+    sink.write(ErrorLog, level="ERROR", source="test", message="kept")
+
+    assert _messages() == ["kept"]
+    assert calls == [1]
+    db = SessionLocal()
+    try:
+        assert db.query(DailyStat).filter(DailyStat.action == "broken").count() == 0
+    finally:
+        db.close()
+
+def test_write_versions_bump_on_commit_only(sink, monkeypatch):
+    before = sink.version(ErrorLog)
+    _failing_sessions(monkeypatch, ValueError("bad row"))
+    sink.write(ErrorLog, level="INFO", source="test", message="lost")
+    assert sink.version(ErrorLog) == before
+
+    sink.write(ErrorLog, level="INFO", source="test", message="kept")
+    assert sink.version(ErrorLog) != before
@@ -0,0 +1,61 @@
+import os
+
+from backend.core import log_tail
+
+def _write(path, lines):
+    with open(path, "a") as f:
+        f.writelines(f"{line}\n" for line in lines)
+
+def test_tail_reads_backwards_across_blocks(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_tail, "BLOCK_SIZE", 16)
+    path = str(tmp_path / "filearr.log")
+    _write(path, [f"line {i}" for i in range(100)])
+
+    result = log_tail.tail(5, path=path)
+
+    assert [l.rstrip("\n") for l in result["logs"]] == [f"line {i}" for i in range(95, 100)]
+    assert result["offset"] == os.path.getsize(path)
+
+def test_since_offset_returns_only_new_complete_lines(tmp_path):
+    path = str(tmp_path / "filearr.log")
+    _write(path, ["old 1", "old 2"])
+    offset = log_tail.tail(10, path=path)["offset"]
+
+    _write(path, ["new 1"])
+    with open(path, "a") as f:
+        f.write("half written")
+
+    result = log_tail.tail(10, since_offset=offset, path=path)
+    assert result["logs"] == ["new 1\n"]
+    assert not result["rotated"]
+
+    # The half-written line is picked up once it is complete
+    with open(path, "a") as f:
+        f.write(" now done\n")
+    result = log_tail.tail(10, since_offset=result["offset"], path=path)
+    assert result["logs"] == ["half written now done\n"]
+
+def test_since_offset_after_rotation_drains_the_rotated_file(tmp_path):
+    path = str(tmp_path / "filearr.log")
+    _write(path, ["before 1", "before 2"])
+    offset = log_tail.tail(10, path=path)["offset"]
+    _write(path, ["before rotation"])
+
+    os.rename(path, str(tmp_path / "filearr.2026-01-01_00-00-00.log"))
+    _write(path, ["after"])
+
+    result = log_tail.tail(10, since_offset=offset, path=path)
+    assert result["rotated"]
+    assert result["logs"] == ["before rotation\n", "after\n"]
+    assert result["offset"] == os.path.getsize(path)
+
+def test_tail_continues_into_rotated_files(tmp_path):
+    path = str(tmp_path / "filearr.log")
+    _write(str(tmp_path / "filearr.2026-01-01_00-00-00.log"), ["older 1", "older 2"])
+    _write(path, ["current"])
+
+    result = log_tail.tail(3, path=path)
+    assert result["logs"] == ["older 1\n", "older 2\n", "current\n"]
+
+def test_missing_file(tmp_path):
+    assert log_tail.tail(10, path=str(tmp_path / "nope.log")) == {"error": "Log file not found"}
@@ -0,0 +1,77 @@
+from sqlalchemy import create_engine, inspect, text
+
+from backend.db.migrations import MIGRATIONS, run_migrations
+
+# Log and catalog tables as the first release created them (before any migration)
+BASELINE_SCHEMA = """
+CREATE TABLE processed_files (id INTEGER PRIMARY KEY, filename VARCHAR, original_path VARCHAR,
+    destination_path VARCHAR, movie_name VARCHAR, year VARCHAR, language VARCHAR,
+    quality_score INTEGER, action VARCHAR, created_at DATETIME);
+CREATE TABLE rejected_files (id INTEGER PRIMARY KEY, filename VARCHAR, reason VARCHAR, created_at DATETIME);
+CREATE TABLE error_logs (id INTEGER PRIMARY KEY, timestamp DATETIME, level VARCHAR, source VARCHAR,
+    message VARCHAR, traceback VARCHAR, created_at DATETIME);
+CREATE TABLE cleanup_logs (id INTEGER PRIMARY KEY, timestamp DATETIME, operation_type VARCHAR,
+    file_path VARCHAR, destination VARCHAR, status VARCHAR, details VARCHAR, created_at DATETIME);
+CREATE TABLE watcher_logs (id INTEGER PRIMARY KEY, timestamp DATETIME, event_type VARCHAR,
+    file_path VARCHAR, action VARCHAR, reason VARCHAR, created_at DATETIME);
+"""
+
+def _baseline_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/baseline.db")
+    raw = engine.raw_connection()
+    try:
+        raw.driver_connection.executescript(BASELINE_SCHEMA)
+    finally:
+        raw.close()
+    return engine
+
+def _indexes(engine, table):
+    return {index["name"] for index in inspect(engine).get_indexes(table)}
+
+def test_upgrades_a_baseline_database(tmp_path):
+    engine = _baseline_engine(tmp_path)
+
+    version = run_migrations(engine)
+
+    assert version == MIGRATIONS[-1][0]
+    assert {"ix_watcher_logs_file_path", "ix_watcher_logs_action_timestamp", "ix_watcher_logs_event_type", "ix_watcher_logs_action"} <= _indexes(engine, "watcher_logs")
+    assert {"ix_cleanup_logs_status", "ix_cleanup_logs_file_path", "ix_cleanup_logs_operation_type"} <= _indexes(engine, "cleanup_logs")
+    assert {"ix_error_logs_source", "ix_error_logs_level"} <= _indexes(engine, "error_logs")
+    assert "ix_processed_files_created_at" in _indexes(engine, "processed_files")
+    with engine.connect() as conn:
+        applied = [row[0] for row in conn.execute(text("SELECT version FROM schema_version ORDER BY version"))]
+    assert applied == [version for version, _, _ in MIGRATIONS]
+
+def test_second_run_applies_nothing(tmp_path):
+    engine = _baseline_engine(tmp_path)
+    run_migrations(engine)
+
+    version = run_migrations(engine)
+
+    assert version == MIGRATIONS[-1][0]
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM schema_version")).scalar() == len(MIGRATIONS)
+
+def test_fresh_database_from_models_passes_through(tmp_path):
+    from backend.db.database import Base
+    import backend.db.models  # noqa: F401 - registers the tables on Base
+
+    engine = create_engine(f"sqlite:///{tmp_path}/fresh.db")
+    Base.metadata.create_all(bind=engine)
+
+    assert run_migrations(engine) == MIGRATIONS[-1][0]
+
+def test_keyset_filters_are_served_from_an_index(tmp_path):
+    engine = _baseline_engine(tmp_path)
+    run_migrations(engine)
+    queries = {
+        "ix_error_logs_level": "SELECT * FROM error_logs WHERE level = 'ERROR'",
+        "ix_cleanup_logs_operation_type": "SELECT * FROM cleanup_logs WHERE operation_type = 'move'",
+        "ix_watcher_logs_event_type": "SELECT * FROM watcher_logs WHERE event_type = 'created'",
+        "ix_watcher_logs_action": "SELECT * FROM watcher_logs WHERE action = 'processed'",
+    }
+    with engine.connect() as conn:
+        for index, query in queries.items():
+            plan = " ".join(row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {query} AND id < 100 ORDER BY id DESC LIMIT 50")))
+            assert index in plan
+            assert "TEMP B-TREE" not in plan
@@ -0,0 +1,76 @@
+import gzip
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.core.retention import RetentionPolicy, RetentionService
+from backend.db.database import SessionLocal
+from backend.db.models import CleanupRun, CleanupRunFile
+
+@pytest.fixture
+def service(db_tables, tmp_path, monkeypatch):
+    db = SessionLocal()
+    db.query(CleanupRunFile).delete()
+    db.query(CleanupRun).delete()
+    db.commit()
+    db.close()
+    service = RetentionService()
+    monkeypatch.setattr(RetentionService, "archive_dir", property(lambda self: str(tmp_path / "archive")))
+    return service
+
+def _add_run(db, started_at, status, files):
+    run = CleanupRun(origin_dir="/in", dry_run=False, status=status, started_at=started_at)
+    db.add(run)
+    db.flush()
+    for i in range(files):
+        db.add(CleanupRunFile(run_id=run.id, file_index=i, file_path=f"/in/{run.id}/{i}.mkv", status="moved", timestamp=started_at))
+    db.commit()
+    return run.id
+
+def _runs_policy(days=30, max_rows=0):
+    return RetentionPolicy(
+        CleanupRun, days, max_rows, time_column="started_at",
+        keep_statuses=("running",), children=((CleanupRunFile, "run_id"),)
+    )
+
+def test_old_runs_are_archived_with_their_files(service):
+    db = SessionLocal()
+    old = _add_run(db, datetime.utcnow() - timedelta(days=60), "success", files=3)
+    recent = _add_run(db, datetime.utcnow(), "success", files=2)
+    still_running = _add_run(db, datetime.utcnow() - timedelta(days=60), "running", files=1)
+    db.close()
+
+    result = service._prune_table(_runs_policy())
+
+    assert result["rows_removed"] == 4
+    assert result["child_rows_removed"] == {"cleanup_run_files": 3}
+    db = SessionLocal()
+    try:
+        assert {r.id for r in db.query(CleanupRun)} == {recent, still_running}
+        assert db.query(CleanupRunFile).filter(CleanupRunFile.run_id == old).count() == 0
+        assert db.query(CleanupRunFile).count() == 3
+    finally:
+        db.close()
+
+    archive = os.path.join(service.archive_dir, "cleanup_run_files")
+    archived = []
+    for name in os.listdir(archive):
+        with gzip.open(os.path.join(archive, name), "rt") as f:
+            archived += [json.loads(line) for line in f]
+    assert sorted(row["file_index"] for row in archived) == [0, 1, 2]
+    assert os.listdir(os.path.join(service.archive_dir, "cleanup_runs")) != []
+
+def test_row_cap_keeps_the_newest_runs(service):
+    db = SessionLocal()
+    ids = [_add_run(db, datetime.utcnow() - timedelta(hours=h), "success", files=1) for h in (3, 2, 1)]
+    db.close()
+
+    service._prune_table(_runs_policy(days=0, max_rows=2))
+
+    db = SessionLocal()
+    try:
+        assert {r.id for r in db.query(CleanupRun)} == set(ids[1:])
+    finally:
+        db.close()